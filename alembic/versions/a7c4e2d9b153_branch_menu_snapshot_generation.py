@@ -0,0 +1,34 @@
+"""branch menu snapshot generation
+
+Revision ID: a7c4e2d9b153
+Revises: f3b9e6a1d472
+Create Date: 2026-10-17 18:05:37.214409
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2d9b153'
+down_revision: Union[str, Sequence[str], None] = 'f3b9e6a1d472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Сброс снимка больше не удаляет строку, а очищает payload и увеличивает generation
+    op.add_column('branch_menu_snapshots', sa.Column('generation', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.alter_column('branch_menu_snapshots', 'payload', existing_type=sa.Text(), nullable=True)
+    op.alter_column('branch_menu_snapshots', 'etag', existing_type=sa.String(length=64), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DELETE FROM branch_menu_snapshots WHERE payload IS NULL')
+    op.alter_column('branch_menu_snapshots', 'etag', existing_type=sa.String(length=64), nullable=False)
+    op.alter_column('branch_menu_snapshots', 'payload', existing_type=sa.Text(), nullable=False)
+    op.drop_column('branch_menu_snapshots', 'generation')
@@ -0,0 +1,42 @@
+"""refresh token hash
+
+Revision ID: b7e1f3a9c2d8
+Revises: 9d3f6b2a7e15
+Create Date: 2026-10-17 09:41:12.730215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f3a9c2d8'
+down_revision: Union[str, Sequence[str], None] = '9d3f6b2a7e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    # Существующие токены остаются рабочими: отпечаток считается из сохраненного токена
+    op.execute("UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.drop_constraint(op.f('uq_refresh_tokens_token'), 'refresh_tokens', type_='unique')
+    op.drop_column('refresh_tokens', 'token')
+    op.create_unique_constraint(op.f('uq_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'])
+    op.create_index('ix_refresh_tokens_user_id_is_revoked', 'refresh_tokens', ['user_id', 'is_revoked'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_user_id_is_revoked', table_name='refresh_tokens')
+    op.drop_constraint(op.f('uq_refresh_tokens_token_hash'), 'refresh_tokens', type_='unique')
+    # Исходные токены не восстановить: сохраняем отпечаток, такие токены
+    # перестанут приниматься и пользователям придется войти заново
+    op.alter_column('refresh_tokens', 'token_hash', new_column_name='token', type_=sa.Text())
+    op.create_unique_constraint(op.f('uq_refresh_tokens_token'), 'refresh_tokens', ['token'])
@@ -0,0 +1,33 @@
+"""geocoding reverse point geohash
+
+Revision ID: c5d8e3f1a276
+Revises: a7c4e2d9b153
+Create Date: 2026-10-17 19:42:11.508236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e3f1a276'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e2d9b153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # geohash теперь — полный geohash точки запроса обратного геокодирования,
+    # а query_hash таких строк — ключ языка и типа результата. Старые строки
+    # с другим query_hash в кэш обратного геокодирования не попадают
+    op.drop_index('ix_geocoding_results_geohash_lookup', table_name='geocoding_results')
+    op.create_index('ix_geocoding_results_geohash_lookup', 'geocoding_results', ['geohash', 'query_hash', 'provider'], unique=False, postgresql_ops={'geohash': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_geocoding_results_geohash_lookup', table_name='geocoding_results', postgresql_ops={'geohash': 'varchar_pattern_ops'})
+    op.create_index('ix_geocoding_results_geohash_lookup', 'geocoding_results', ['geohash', 'provider', 'is_successful', 'expires_at'], unique=False)
@@ -0,0 +1,34 @@
+"""geocoding query hash
+
+Revision ID: d58a2f7c1e36
+Revises: b7e1f3a9c2d8
+Create Date: 2026-10-17 14:05:37.418562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58a2f7c1e36'
+down_revision: Union[str, Sequence[str], None] = 'b7e1f3a9c2d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Старые строки остаются без отпечатка: нормализация делается в приложении,
+    # такие записи просто не попадают в кэш и истекают по GEOCODING_CACHE_TTL
+    op.add_column('geocoding_results', sa.Column('query_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_geocoding_results_cache_lookup', 'geocoding_results', ['query_hash', 'provider', 'is_successful', 'expires_at'], unique=False)
+    op.drop_index(op.f('ix_geocoding_results_query'), table_name='geocoding_results')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_geocoding_results_query'), 'geocoding_results', ['query'], unique=False)
+    op.drop_index('ix_geocoding_results_cache_lookup', table_name='geocoding_results')
+    op.drop_column('geocoding_results', 'query_hash')
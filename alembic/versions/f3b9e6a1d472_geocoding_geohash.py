@@ -0,0 +1,32 @@
+"""geocoding geohash
+
+Revision ID: f3b9e6a1d472
+Revises: d58a2f7c1e36
+Create Date: 2026-10-17 16:22:04.961307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9e6a1d472'
+down_revision: Union[str, Sequence[str], None] = 'd58a2f7c1e36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Ячейка считается приложением по GEOCODING_REVERSE_GEOHASH_PRECISION;
+    # старые строки без нее не участвуют в кэше обратного геокодирования
+    op.add_column('geocoding_results', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index('ix_geocoding_results_geohash_lookup', 'geocoding_results', ['geohash', 'provider', 'is_successful', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_geocoding_results_geohash_lookup', table_name='geocoding_results')
+    op.drop_column('geocoding_results', 'geohash')
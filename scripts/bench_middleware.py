@@ -0,0 +1,201 @@
+"""
+Накладные расходы middleware на запрос: BaseHTTPMiddleware (прежняя
+реализация) против ASGI middleware из core/middleware.py.
+
+Запросы подаются в приложение напрямую через ASGI, без сети и сервера,
+логи уходят в NullHandler — измеряется только стоимость самих middleware.
+
+    poetry run python scripts/bench_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+for name, value in {
+    "SQL_HOST": "localhost",
+    "SQL_PORT": "5432",
+    "SQL_DATABASE": "bench",
+    "SQL_USER": "bench",
+    "SQL_PASSWORD": "bench",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi import FastAPI, HTTPException, Request  # noqa: E402
+from fastapi.security import HTTPBearer  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from src.backoffice.apps.account.services.jwt_service import \
+    jwt_service  # noqa: E402
+from src.backoffice.core.config import logging_settings  # noqa: E402
+from src.backoffice.core.context import (request_id_ctx_var,  # noqa: E402
+                                         user_id_ctx_var)
+from src.backoffice.core.middleware import (AuthMiddleware,  # noqa: E402
+                                            RequestContextMiddleware)
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """Прежний AuthMiddleware на BaseHTTPMiddleware"""
+
+    def __init__(self, app, excluded_paths=None):
+        super().__init__(app)
+        self.excluded_paths = excluded_paths or []
+        self.security = HTTPBearer(auto_error=False)
+
+    async def dispatch(self, request: Request, call_next):
+        if any(request.url.path.startswith(path) for path in self.excluded_paths):
+            return await call_next(request)
+        authorization = await self.security(request)
+        if not authorization:
+            raise HTTPException(status_code=401)
+        payload = jwt_service.verify_access_token(authorization.credentials)
+        if not payload:
+            raise HTTPException(status_code=401)
+        request.state.user_id = payload.get("user_id")
+        request.state.user_email = payload.get("email")
+        return await call_next(request)
+
+
+class LegacyRequestContextMiddleware(BaseHTTPMiddleware):
+    """Прежний RequestContextMiddleware: буферизует тело запроса целиком"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.logger = logging.getLogger("bench.http")
+
+    async def dispatch(self, request: Request, call_next):
+        started_at = time.time()
+        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
+        token = request_id_ctx_var.set(request_id)
+        user_token = user_id_ctx_var.set("-")
+
+        if logging_settings.log_requests:
+            body_bytes = await request.body()
+
+            async def receive():
+                return {"type": "http.request", "body": body_bytes, "more_body": False}
+
+            request._receive = receive
+
+        self.logger.info("request", extra={"request_id": request_id})
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_ctx_var.reset(token)
+            user_id_ctx_var.reset(user_token)
+        self.logger.info(
+            "response",
+            extra={
+                "status_code": response.status_code,
+                "process_time_ms": int((time.time() - started_at) * 1000),
+            },
+        )
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def list_items():
+        return {"items": []}
+
+    @app.post("/api/v1/items")
+    async def create_item(request: Request):
+        return {"size": len(await request.body())}
+
+    if stack == "legacy":
+        app.add_middleware(LegacyRequestContextMiddleware)
+        app.add_middleware(LegacyAuthMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+        app.add_middleware(AuthMiddleware, excluded_paths=["/docs"])
+    return app
+
+
+async def call(app: FastAPI, method: str, headers: list, body: bytes) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": "/api/v1/items",
+        "raw_path": b"/api/v1/items",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, method: str, body: bytes, requests: int) -> float:
+    token = jwt_service.create_access_token({"user_id": 1, "email": "bench@example.com"})
+    headers = [
+        (b"authorization", f"Bearer {token}".encode()),
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    for _ in range(min(requests, 500)):
+        await call(app, method, headers, body)
+
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        await call(app, method, headers, body)
+    return (time.perf_counter() - started_at) / requests * 1_000_000
+
+
+async def main(requests: int, rounds: int, body_size: int) -> None:
+    root = logging.getLogger()
+    root.handlers = [logging.NullHandler()]
+    root.setLevel(logging.INFO)
+
+    body = b'{"data": "' + b"x" * body_size + b'"}'
+    cases = [("GET", b""), ("POST", body)]
+    stacks = ["none", "legacy", "asgi"]
+
+    results = {}
+    for method, payload in cases:
+        for stack in stacks:
+            app = build_app(stack)
+            samples = [
+                await measure(app, method, payload, requests) for _ in range(rounds)
+            ]
+            results[(method, stack)] = statistics.median(samples)
+
+    print(f"requests={requests} rounds={rounds} post_body={len(body)}B")
+    print(f"{'case':<8}{'stack':<10}{'us/request':>12}{'overhead us':>14}")
+    for method, _ in cases:
+        baseline = results[(method, "none")]
+        for stack in stacks:
+            value = results[(method, stack)]
+            print(f"{method:<8}{stack:<10}{value:>12.1f}{value - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--body-size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds, args.body_size))
@@ -0,0 +1,100 @@
+"""
+Плановая ротация ключа подписи JWT в связке JWT_KEYRING_FILE.
+
+Создает новый ключ, который начнет подписывать через --activate-in секунд
+(до этого он уже публикуется в JWKS), назначает прежним ключам expires_at =
+активация нового ключа + срок жизни refresh-токена и удаляет истекшие ключи.
+
+    poetry run python scripts/rotate_jwt_key.py --keyring /etc/backoffice/jwt/keyring.json
+"""
+import argparse
+import json
+import secrets
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+
+
+def generate_private_key(algorithm: str) -> bytes:
+    if algorithm in CURVES:
+        key = ec.generate_private_key(CURVES[algorithm]())
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=3072)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def isoformat(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keyring", required=True, type=Path)
+    parser.add_argument(
+        "--algorithm",
+        default="RS256",
+        choices=["RS256", "RS384", "RS512", *CURVES],
+    )
+    parser.add_argument(
+        "--activate-in",
+        type=int,
+        default=3600,
+        help="Секунд до начала подписи новым ключом; не меньше JWKS_MAX_AGE",
+    )
+    parser.add_argument(
+        "--retain-days",
+        type=int,
+        default=7,
+        help="Сколько дней после активации проверять токены прежних ключей "
+        "(REFRESH_TOKEN_EXPIRE_DAYS)",
+    )
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    activate_at = now + timedelta(seconds=args.activate_in)
+    retire_at = activate_at + timedelta(days=args.retain_days)
+
+    keyring = (
+        json.loads(args.keyring.read_text()) if args.keyring.exists() else {"keys": []}
+    )
+
+    kept = []
+    for entry in keyring["keys"]:
+        expires_at = entry.get("expires_at")
+        if expires_at and datetime.fromisoformat(expires_at.replace("Z", "+00:00")) <= now:
+            (args.keyring.parent / entry["private_key_file"]).unlink(missing_ok=True)
+            continue
+        if not expires_at:
+            entry["expires_at"] = isoformat(retire_at)
+        kept.append(entry)
+
+    kid = f"{now:%Y%m%d}-{secrets.token_hex(4)}"
+    key_file = args.keyring.parent / f"{kid}.pem"
+    key_file.write_bytes(generate_private_key(args.algorithm))
+    key_file.chmod(0o600)
+    kept.append(
+        {
+            "kid": kid,
+            "algorithm": args.algorithm,
+            "private_key_file": key_file.name,
+            "not_before": isoformat(activate_at),
+            "expires_at": None,
+        }
+    )
+
+    tmp_file = args.keyring.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps({"keys": kept}, indent=2))
+    tmp_file.replace(args.keyring)
+    print(f"added {kid}, signs from {isoformat(activate_at)}")
+
+
+if __name__ == "__main__":
+    main()
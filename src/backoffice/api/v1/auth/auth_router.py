@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from src.backoffice.apps.account.schemas import (OAuthProvider, OAuthProviders,
                                                  RefreshTokenRequest, Token,
@@ -8,38 +10,16 @@ from src.backoffice.apps.account.schemas import (OAuthProvider, OAuthProviders,
 from src.backoffice.apps.account.services.jwt_service import jwt_service
 from src.backoffice.apps.account.services.oauth_service import (
     google_oauth_service, vk_oauth_service, yandex_oauth_service)
+from src.backoffice.apps.account.services.token_denylist import token_denylist
 from src.backoffice.apps.account.services.user_service import UserService
 from src.backoffice.core.config import auth_settings
-from src.backoffice.core.dependencies import SessionDep, TokenDep
+from src.backoffice.core.dependencies import (SessionDep, TokenClaimsDep,
+                                              get_current_user)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-
-async def get_current_user(token: TokenDep, session: SessionDep) -> UserProfile:
-    """Получить текущего пользователя из токена"""
-    payload = jwt_service.verify_access_token(token.credentials)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
-
-    user_service = UserService(session)
-    user = await user_service.get_user_by_id(user_id)
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
-
-    return UserProfile.model_validate(user)
+# Access токен при выходе необязателен
+optional_security = HTTPBearer(auto_error=False)
 
 
 @router.get("/me", response_model=UserProfile)
@@ -95,13 +75,36 @@ async def refresh_token(refresh_data: RefreshTokenRequest, session: SessionDep):
 
 
 @router.post("/logout")
-async def logout(refresh_data: RefreshTokenRequest, session: SessionDep):
+async def logout(
+    refresh_data: RefreshTokenRequest,
+    session: SessionDep,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
     """Выйти из системы"""
     user_service = UserService(session)
     await user_service.revoke_refresh_token(refresh_data.refresh_token)
+
+    # Текущий access токен перестает действовать сразу, а не по exp
+    if credentials is not None:
+        claims = jwt_service.verify_access_token(credentials.credentials)
+        if claims:
+            await token_denylist.revoke_token(claims)
     return {"message": "Successfully logged out"}
 
 
+@router.post("/logout-all")
+async def logout_all(claims: TokenClaimsDep, session: SessionDep):
+    """Выйти на всех устройствах: отозвать все refresh и access токены"""
+    user_id = claims.get("user_id")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+    revoked = await UserService(session).revoke_all_user_tokens(user_id)
+    await token_denylist.revoke_user(user_id)
+    return {"message": "Successfully logged out", "revoked_tokens": revoked}
+
+
 @router.get("/providers", response_model=OAuthProviders)
 async def get_oauth_providers():
     """Получить список доступных OAuth провайдеров"""
@@ -5,17 +5,17 @@ from src.backoffice.apps.company.schemas import (CompanyMemberCreate,
                                                  CompanyMemberOut,
                                                  CompanyMemberUpdate)
 from src.backoffice.apps.company.services import CompanyMembershipService
-from src.backoffice.core.dependencies import SessionDep, TokenDep, require_company_role
+from src.backoffice.core.dependencies import SessionDep, TokenClaimsDep, require_company_role
 
 router = APIRouter(prefix="/members", tags=["company:members"])
 
 
 async def _require_admin_for_company(
     company_id: int, 
-    token: TokenDep, 
+    claims: TokenClaimsDep, 
     session: SessionDep
 ):
-    return await require_company_role(company_id, CompanyRole.ADMIN, token, session)
+    return await require_company_role(company_id, CompanyRole.ADMIN, claims, session)
 
 
 @router.get("/{company_id}", response_model=list[CompanyMemberOut])
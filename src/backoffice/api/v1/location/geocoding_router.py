@@ -1,14 +1,26 @@
+import math
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from src.backoffice.apps.account.schemas import UserProfile
 from src.backoffice.apps.location.schemas.geocoding import (
+    GeocodingBatchJobResponse, GeocodingBatchRequest, GeocodingBatchResponse,
     GeocodingRequest, GeocodingResultResponse, GeocodingSearchRequest,
     GeocodingSearchResponse, ReverseGeocodingRequest)
 from src.backoffice.apps.location.services.geocoder_service import \
     GeocoderService
+from src.backoffice.apps.location.services.geocoding_batch import \
+    geocoding_batch_jobs
+from src.backoffice.apps.location.services.geocoding_cache import \
+    geocoding_cache
+from src.backoffice.apps.location.services.geocoding_rate_limiter import \
+    geocoding_rate_limiters
+from src.backoffice.apps.location.services.geocoding_routing import \
+    geocoding_provider_router
 from src.backoffice.core.config import geocoding_settings
-from src.backoffice.core.dependencies import SessionDep
+from src.backoffice.core.dependencies import SessionDep, get_current_user
+from src.backoffice.core.services.rate_limiter import RateLimitExceeded
 
 router = APIRouter(prefix="/geocoding", tags=["geocoding"])
 
@@ -18,6 +30,15 @@ async def get_geocoder_service(session: SessionDep) -> GeocoderService:
     return GeocoderService(session)
 
 
+def _rate_limited(error: RateLimitExceeded) -> HTTPException:
+    """429 с Retry-After, когда исчерпан лимит провайдера"""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+
 @router.post("/geocode", response_model=List[GeocodingResultResponse])
 async def geocode_address(
     request: GeocodingRequest,
@@ -32,6 +53,8 @@ async def geocode_address(
     try:
         results = await geocoder_service.geocode(request)
         return results
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -51,6 +74,8 @@ async def search_addresses(
     try:
         results = await geocoder_service.search(request)
         return results
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -70,6 +95,8 @@ async def reverse_geocode(
     try:
         results = await geocoder_service.reverse_geocode(request)
         return results
+    except RateLimitExceeded as e:
+        raise _rate_limited(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -78,6 +105,67 @@ async def reverse_geocode(
         )
 
 
+@router.post("/batch", response_model=GeocodingBatchResponse)
+async def geocode_batch(
+    request: GeocodingBatchRequest,
+    geocoder_service: GeocoderService = Depends(get_geocoder_service),
+    current_user: UserProfile = Depends(get_current_user),
+):
+    """
+    Пакетное геокодирование (требует авторизации)
+
+    Геокодирует до GEOCODING_BATCH_MAX_SIZE адресов за один запрос. Для больших
+    пакетов используйте фоновое задание /batch/jobs.
+    """
+    try:
+        return await geocoder_service.geocode_batch(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Batch geocoding failed: {str(e)}"
+        )
+
+
+@router.post(
+    "/batch/jobs", response_model=GeocodingBatchJobResponse, status_code=202
+)
+async def create_geocoding_batch_job(
+    request: GeocodingBatchRequest,
+    current_user: UserProfile = Depends(get_current_user),
+):
+    """
+    Фоновое пакетное геокодирование (требует авторизации)
+
+    Принимает до GEOCODING_BATCH_JOB_MAX_SIZE адресов и возвращает задание,
+    статус и результат которого доступны автору по /batch/jobs/{job_id}.
+    """
+    try:
+        return await geocoding_batch_jobs.submit(request, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Batch job creation failed: {str(e)}"
+        )
+
+
+@router.get("/batch/jobs/{job_id}", response_model=GeocodingBatchJobResponse)
+async def get_geocoding_batch_job(
+    job_id: str,
+    current_user: UserProfile = Depends(get_current_user),
+):
+    """
+    Статус фонового пакетного геокодирования
+
+    Возвращает прогресс задания, а после завершения — результаты по каждому адресу.
+    """
+    job = await geocoding_batch_jobs.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job '{job_id}' not found")
+    return job
+
+
 @router.get("/providers", response_model=List[str])
 async def get_available_providers():
     """
@@ -110,6 +198,9 @@ async def get_provider_status(provider: str):
         "provider": provider,
         "enabled": config.get("enabled", False),
         "rate_limit": config.get("rate_limit"),
+        "rate_period": config.get("rate_period"),
+        "rate_limit_status": await geocoding_rate_limiters.status(provider),
+        "routing": geocoding_provider_router.status(provider),
         "timeout": config.get("timeout"),
         "has_api_key": bool(config.get("api_key")),
     }
@@ -128,12 +219,16 @@ async def health_check():
         "cache_ttl": geocoding_settings.cache_ttl,
         "rate_limit_requests": geocoding_settings.rate_limit_requests,
         "rate_limit_period": geocoding_settings.rate_limit_period,
+        "strategy": geocoding_settings.strategy,
+        "provider_order": geocoding_settings.provider_order,
+        "cache": geocoding_cache.stats(),
     }
 
     for provider_name, config in geocoding_settings.providers_config.items():
         health_status["providers"][provider_name] = {
             "enabled": config.get("enabled", False),
             "configured": bool(config.get("api_key") or provider_name == "nominatim"),
+            **geocoding_provider_router.status(provider_name),
         }
 
     return health_status
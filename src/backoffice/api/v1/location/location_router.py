@@ -14,11 +14,13 @@ from src.backoffice.apps.location.schemas import (AddressCreate,
                                                   RegionResponse, StreetCreate,
                                                   StreetListResponse,
                                                   StreetResponse)
-from src.backoffice.apps.location.services.location_service import \
-    LocationService
+from src.backoffice.apps.location.services.location_service import (
+    LOCATIONS_CACHE_TAG, LocationService)
+from src.backoffice.core.config import cache_settings
 from src.backoffice.core.dependencies import SessionDep
+from src.backoffice.core.routing import CachedRoute, cache_response
 
-router = APIRouter(prefix="/locations", tags=["locations"])
+router = APIRouter(prefix="/locations", tags=["locations"], route_class=CachedRoute)
 
 
 async def get_location_service(session: SessionDep) -> LocationService:
@@ -45,6 +47,7 @@ async def create_country(
 
 
 @router.get("/countries/{country_id}", response_model=CountryResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_country(
     country_id: int, location_service: LocationService = Depends(get_location_service)
 ):
@@ -56,6 +59,7 @@ async def get_country(
 
 
 @router.get("/countries", response_model=CountryListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_countries(
     page: int = Query(1, ge=1, description="Номер страницы"),
     size: int = Query(20, ge=1, le=100, description="Размер страницы"),
@@ -131,6 +135,7 @@ async def create_region(
 
 
 @router.get("/regions/{region_id}", response_model=RegionResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_region(
     region_id: int, location_service: LocationService = Depends(get_location_service)
 ):
@@ -142,6 +147,7 @@ async def get_region(
 
 
 @router.get("/countries/{country_id}/regions", response_model=RegionListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_regions_by_country(
     country_id: int,
     page: int = Query(1, ge=1, description="Номер страницы"),
@@ -181,6 +187,7 @@ async def create_city(
 
 
 @router.get("/cities/{city_id}", response_model=CityResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_city(
     city_id: int, location_service: LocationService = Depends(get_location_service)
 ):
@@ -192,6 +199,7 @@ async def get_city(
 
 
 @router.get("/countries/{country_id}/cities", response_model=CityListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_cities_by_country(
     country_id: int,
     page: int = Query(1, ge=1, description="Номер страницы"),
@@ -215,6 +223,7 @@ async def get_cities_by_country(
 
 
 @router.get("/regions/{region_id}/cities", response_model=CityListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_cities_by_region(
     region_id: int,
     page: int = Query(1, ge=1, description="Номер страницы"),
@@ -256,6 +265,7 @@ async def create_street(
 
 
 @router.get("/streets/{street_id}", response_model=StreetResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_street(
     street_id: int, location_service: LocationService = Depends(get_location_service)
 ):
@@ -267,6 +277,7 @@ async def get_street(
 
 
 @router.get("/cities/{city_id}/streets", response_model=StreetListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_streets_by_city(
     city_id: int,
     page: int = Query(1, ge=1, description="Номер страницы"),
@@ -304,6 +315,7 @@ async def create_address(
 
 
 @router.get("/addresses/{address_id}", response_model=AddressResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_address(
     address_id: int, location_service: LocationService = Depends(get_location_service)
 ):
@@ -315,6 +327,7 @@ async def get_address(
 
 
 @router.get("/streets/{street_id}/addresses", response_model=AddressListResponse)
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def get_addresses_by_street(
     street_id: int,
     page: int = Query(1, ge=1, description="Номер страницы"),
@@ -343,6 +356,7 @@ async def get_addresses_by_street(
 
 
 @router.get("/search")
+@cache_response(cache_settings.location_ttl, tags=[LOCATIONS_CACHE_TAG])
 async def search_locations(
     query: str = Query(..., description="Поисковый запрос"),
     country_id: Optional[int] = Query(
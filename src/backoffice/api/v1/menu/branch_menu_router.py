@@ -0,0 +1,61 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from src.backoffice.apps.menu.schemas.branch_menu_snapshot import \
+    BranchMenuSnapshotResponse
+from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+    BranchMenuSnapshotService
+from src.backoffice.core.dependencies import SessionDep
+
+router = APIRouter(prefix="/public/branches", tags=["public-menu"])
+
+# Клиент обязан перепроверять снимок, но может делать это условным запросом
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+@router.get(
+    "/{company_branch_id}/menu",
+    response_class=Response,
+    responses={
+        200: {"model": BranchMenuSnapshotResponse},
+        304: {"description": "Снимок не изменился"},
+    },
+)
+async def get_branch_menu(
+    company_branch_id: int,
+    session: SessionDep,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Полное меню филиала для гостевого интерфейса.
+
+    Отдается предсобранный JSON без сериализации на запрос;
+    поддерживает условные запросы через If-None-Match.
+    """
+    service = BranchMenuSnapshotService(session)
+    snapshot = await service.get_snapshot(company_branch_id)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    headers = {"ETag": f'"{snapshot.etag}"', "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=snapshot.content, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+
+from src.backoffice.apps.company.models import CompanyRole
+from src.backoffice.apps.menu.schemas import (BranchMenuBulkUpdateRequest,
+                                              BranchMenuBulkUpdateResponse,
+                                              BranchMenuCompanyUpdateRequest)
+from src.backoffice.apps.menu.services.branch_menu_service import \
+    BranchMenuService
+from src.backoffice.core.dependencies import SessionDep, TokenClaimsDep, require_company_role
+
+router = APIRouter(prefix="/branch-menu", tags=["branch-menu"])
+
+
+async def _require_editor_for_company(
+    company_id: int,
+    claims: TokenClaimsDep,
+    session: SessionDep
+):
+    return await require_company_role(company_id, CompanyRole.EDITOR, claims, session)
+
+
+@router.patch(
+    "/companies/{company_id}/bulk",
+    response_model=BranchMenuBulkUpdateResponse,
+)
+async def bulk_update_branch_menu(
+    company_id: int,
+    request: BranchMenuBulkUpdateRequest,
+    session: SessionDep,
+    _current_user=Depends(_require_editor_for_company),
+):
+    """
+    Пакетно изменить цены и доступность позиций в меню филиалов компании.
+    Непримененные изменения возвращаются в conflicts.
+    """
+    service = BranchMenuService(session)
+    return await service.bulk_update(company_id, request.changes)
+
+
+@router.patch(
+    "/companies/{company_id}/items/{menu_item_id}",
+    response_model=BranchMenuBulkUpdateResponse,
+)
+async def update_branch_menu_item(
+    company_id: int,
+    menu_item_id: int,
+    request: BranchMenuCompanyUpdateRequest,
+    session: SessionDep,
+    _current_user=Depends(_require_editor_for_company),
+):
+    """Изменить цену и/или доступность позиции во всех филиалах компании"""
+    service = BranchMenuService(session)
+    return await service.update_for_company(company_id, menu_item_id, request)
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, status
+
+from src.backoffice.apps.menu.schemas.category import (CategoryCreate,
+                                                       CategoryMove,
+                                                       CategoryResponse)
+from src.backoffice.apps.menu.services.category_service import CategoryService
+from src.backoffice.core.dependencies import SessionDep
+
+router = APIRouter(prefix="/categories", tags=["menu-categories"])
+
+
+@router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+async def create_category(payload: CategoryCreate, session: SessionDep):
+    try:
+        return await CategoryService(session).create(payload.name, payload.parent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{category_id}/move", response_model=CategoryResponse)
+async def move_category(category_id: int, payload: CategoryMove, session: SessionDep):
+    """Перенести категорию вместе с поддеревом под другого родителя"""
+    try:
+        category = await CategoryService(session).move(category_id, payload.parent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if category is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return category
+
+
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_category(category_id: int, session: SessionDep):
+    """Удалить категорию вместе с поддеревом"""
+    try:
+        deleted = await CategoryService(session).delete(category_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return None
@@ -7,10 +7,14 @@ from src.backoffice.apps.menu.schemas.menu_image import (
     MenuImageDeleteResponse, MenuImageListResponse,
     MenuImagePresignedUrlResponse, MenuImageResponse, MenuImageUpdate,
     MenuImageUploadResponse)
+from src.backoffice.apps.menu.services.cache_tags import (
+    MENU_IMAGES_CACHE_TAG, MENU_ITEM_IMAGES_CACHE_TAG)
 from src.backoffice.apps.menu.services.menu_image_service import (
     MenuImageService, get_menu_image_service)
+from src.backoffice.core.config import cache_settings
+from src.backoffice.core.routing import CachedRoute, cache_response
 
-router = APIRouter(prefix="/menu-images", tags=["Menu Images"])
+router = APIRouter(prefix="/menu-images", tags=["Menu Images"], route_class=CachedRoute)
 
 
 @router.post("/upload", response_model=MenuImageUploadResponse)
@@ -50,6 +54,7 @@ async def upload_menu_image(
 
 
 @router.get("/menu-item/{menu_item_id}", response_model=MenuImageListResponse)
+@cache_response(cache_settings.menu_image_ttl, tags=[MENU_ITEM_IMAGES_CACHE_TAG])
 async def get_menu_item_images(
     menu_item_id: int, image_service: MenuImageService = Depends(get_menu_image_service)
 ):
@@ -73,6 +78,7 @@ async def get_menu_item_images(
 
 
 @router.get("/menu-item/{menu_item_id}/primary", response_model=MenuImageResponse)
+@cache_response(cache_settings.menu_image_ttl, tags=[MENU_ITEM_IMAGES_CACHE_TAG])
 async def get_primary_menu_image(
     menu_item_id: int, image_service: MenuImageService = Depends(get_menu_image_service)
 ):
@@ -96,6 +102,7 @@ async def get_primary_menu_image(
 
 
 @router.get("/{image_id}", response_model=MenuImageResponse)
+@cache_response(cache_settings.menu_image_ttl, tags=[MENU_IMAGES_CACHE_TAG])
 async def get_menu_image(
     image_id: int, image_service: MenuImageService = Depends(get_menu_image_service)
 ):
@@ -1,13 +1,25 @@
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import (APIRouter, Depends, File, HTTPException, Query,
+                     UploadFile, status)
+from fastapi.responses import StreamingResponse
 
-from src.backoffice.apps.menu.schemas.menu_item import (MenuItemCreate,
-                                                        MenuItemListResponse,
-                                                        MenuItemResponse,
-                                                        MenuItemUpdate)
+from src.backoffice.apps.account.schemas import UserProfile
+from src.backoffice.apps.menu.schemas.menu_import import (MenuFileFormat,
+                                                          MenuImportResponse)
+from src.backoffice.apps.menu.schemas.menu_item import (
+    MenuItemCreate, MenuItemCursorResponse, MenuItemListResponse,
+    MenuItemPagination, MenuItemResponse, MenuItemSearchResponse,
+    MenuItemTotalMode, MenuItemUpdate)
+from src.backoffice.apps.menu.services.cache_tags import MENU_ITEMS_CACHE_TAG
+from src.backoffice.apps.menu.services.category_service import CategoryService
+from src.backoffice.apps.menu.services.menu_import_service import \
+    MenuImportService
 from src.backoffice.apps.menu.services.menu_item_service import MenuItemService
-from src.backoffice.core.dependencies import SessionDep
+from src.backoffice.core.config import cache_settings
+from src.backoffice.core.dependencies import (AsyncSessionLocal, SessionDep,
+                                              get_current_user)
+from src.backoffice.core.routing import CachedRoute, cache_response
 
-router = APIRouter(prefix="/items", tags=["menu-items"])
+router = APIRouter(prefix="/items", tags=["menu-items"], route_class=CachedRoute)
 
 
 @router.post("/", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
@@ -18,39 +30,186 @@ async def create_menu_item(
     service = MenuItemService(session)
     # Валидация согласованности template/owner делается чек-констрейнтом на уровне БД
     item = await service.create(payload)
+    await CategoryService(session).fill_breadcrumbs([item])
     return item
 
 
-@router.get("/", response_model=MenuItemListResponse)
+@router.get("/", response_model=MenuItemListResponse | MenuItemCursorResponse)
+@cache_response(cache_settings.menu_item_ttl, tags=[MENU_ITEMS_CACHE_TAG])
 async def list_menu_items(
     session: SessionDep,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     category_id: int | None = None,
+    include_descendants: bool = Query(
+        False, description="Включить позиции всех подкатегорий category_id"
+    ),
     is_template: bool | None = None,
     search: str | None = None,
     company_id: int | None = Query(
         None,
         description="Если задан, будут показаны шаблоны и элементы этой компании",
     ),
+    pagination: MenuItemPagination = Query(
+        MenuItemPagination.OFFSET,
+        description="offset — страницы с номерами, cursor — курсорная пагинация",
+    ),
+    cursor: str | None = Query(None, description="Курсор из next_cursor"),
+    sort: str = Query(
+        "id",
+        description="Сортировка в режиме cursor: id, name, created_at, updated_at; "
+        "'-' перед полем — по убыванию",
+    ),
+    total: MenuItemTotalMode = Query(
+        MenuItemTotalMode.NONE,
+        description="Подсчет total в режиме cursor: exact, estimate или none",
+    ),
 ):
     service = MenuItemService(session)
+    if pagination == MenuItemPagination.CURSOR:
+        try:
+            return await service.get_cursor_page(
+                size=size,
+                cursor=cursor,
+                sort=sort,
+                total_mode=total,
+                category_id=category_id,
+                include_descendants=include_descendants,
+                is_template=is_template,
+                search=search,
+                visible_for_company_id=company_id,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     return await service.get_list(
         page=page,
         size=size,
         category_id=category_id,
+        include_descendants=include_descendants,
         is_template=is_template,
         search=search,
         visible_for_company_id=company_id,
     )
 
 
+@router.get("/search", response_model=MenuItemSearchResponse)
+@cache_response(cache_settings.menu_item_ttl, tags=[MENU_ITEMS_CACHE_TAG])
+async def search_menu_items(
+    session: SessionDep,
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    category_id: int | None = None,
+    include_descendants: bool = Query(
+        False, description="Включить позиции всех подкатегорий category_id"
+    ),
+    is_template: bool | None = None,
+    company_id: int | None = Query(
+        None,
+        description="Если задан, будут показаны шаблоны и элементы этой компании",
+    ),
+):
+    """
+    Полнотекстовый поиск по названию и описанию с ранжированием,
+    поиском по префиксу и подсветкой совпадений
+    """
+    service = MenuItemService(session)
+    return await service.search(
+        query=q,
+        page=page,
+        size=size,
+        category_id=category_id,
+        include_descendants=include_descendants,
+        is_template=is_template,
+        visible_for_company_id=company_id,
+    )
+
+
+@router.post("/import", response_model=MenuImportResponse)
+async def import_menu_items(
+    session: SessionDep,
+    file: UploadFile = File(..., description="CSV с заголовком или NDJSON"),
+    file_format: MenuFileFormat | None = Query(
+        None, alias="format", description="Формат файла, по умолчанию по расширению"
+    ),
+    current_user: UserProfile = Depends(get_current_user),
+):
+    """
+    Массовый импорт позиций меню и их цен в филиалах.
+
+    Файл разбирается потоком, строки вставляются пачками; строки с ошибками
+    попадают в отчет и не прерывают импорт. Строки компаний и филиалов, где
+    у пользователя нет роли EDITOR, отклоняются.
+    """
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        if filename.endswith(".csv"):
+            file_format = MenuFileFormat.CSV
+        elif filename.endswith((".ndjson", ".jsonl")):
+            file_format = MenuFileFormat.NDJSON
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown file format, pass format=csv or format=ndjson",
+            )
+
+    service = MenuImportService(session)
+    return await service.import_file(file, file_format, current_user)
+
+
+@router.get("/export")
+async def export_menu_items(
+    file_format: MenuFileFormat = Query(MenuFileFormat.CSV, alias="format"),
+    company_branch_id: int | None = Query(
+        None, description="Экспортировать меню филиала с ценами"
+    ),
+    category_id: int | None = None,
+    include_descendants: bool = Query(
+        False, description="Включить позиции всех подкатегорий category_id"
+    ),
+    is_template: bool | None = None,
+    company_id: int | None = Query(
+        None,
+        description="Если задан, будут показаны шаблоны и элементы этой компании",
+    ),
+):
+    """Потоковый экспорт позиций меню в формате импорта"""
+
+    async def stream():
+        # Отдельная сессия живет, пока отдается ответ
+        async with AsyncSessionLocal() as export_session:
+            service = MenuImportService(export_session)
+            async for chunk in service.iter_export(
+                file_format=file_format,
+                company_branch_id=company_branch_id,
+                category_id=category_id,
+                include_descendants=include_descendants,
+                is_template=is_template,
+                visible_for_company_id=company_id,
+            ):
+                yield chunk
+
+    if file_format == MenuFileFormat.CSV:
+        media_type, filename = "text/csv", "menu_items.csv"
+    else:
+        media_type, filename = "application/x-ndjson", "menu_items.ndjson"
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{slug}", response_model=MenuItemResponse)
+@cache_response(cache_settings.menu_item_ttl, tags=[MENU_ITEMS_CACHE_TAG])
 async def get_menu_item(slug: str, session: SessionDep):
     service = MenuItemService(session)
     item = await service.get_by_slug(slug)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    await CategoryService(session).fill_breadcrumbs([item])
     return item
 
 
@@ -64,6 +223,7 @@ async def update_menu_item(
     item = await service.update_by_slug(slug, payload)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    await CategoryService(session).fill_breadcrumbs([item])
     return item
 
 
@@ -5,10 +5,17 @@ from src.backoffice.api.v1.auth import auth_router
 from src.backoffice.api.v1.company.members_router import \
     router as company_members_router
 from src.backoffice.api.v1.location import geocoding_router, location_router
+from src.backoffice.api.v1.menu.branch_menu_router import \
+    router as branch_menu_router
+from src.backoffice.api.v1.menu.branch_price_router import \
+    router as branch_price_router
+from src.backoffice.api.v1.menu.category_router import \
+    router as category_router
 from src.backoffice.api.v1.menu.menu_image_router import \
     router as menu_image_router
 from src.backoffice.api.v1.menu.menu_item_router import \
     router as menu_item_router
+from src.backoffice.api.v1.search import search_router
 
 api_router = APIRouter()
 
@@ -22,6 +29,12 @@ api_router.include_router(location_router, prefix="/location")
 # Menu routes
 api_router.include_router(menu_image_router, prefix="/menu")
 api_router.include_router(menu_item_router, prefix="/menu")
+api_router.include_router(branch_menu_router, prefix="/menu")
+api_router.include_router(branch_price_router, prefix="/menu")
+api_router.include_router(category_router, prefix="/menu")
+
+# Search routes
+api_router.include_router(search_router)
 
 # Company routes
 api_router.include_router(company_members_router, prefix="/company")
@@ -0,0 +1,66 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.backoffice.apps.account.schemas import UserProfile
+from src.backoffice.apps.search.schemas import (ReindexResponse, SearchEntity,
+                                                SearchResponse)
+from src.backoffice.apps.search.services import (SearchIndexer,
+                                                 SearchUnavailableError,
+                                                 search_backend)
+from src.backoffice.core.dependencies import SessionDep, get_current_superuser
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/autocomplete", response_model=SearchResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    entities: Optional[List[SearchEntity]] = Query(
+        None, description="Типы сущностей, по умолчанию все"
+    ),
+    company_id: Optional[int] = Query(
+        None, description="Ограничить позиции меню шаблонами и позициями компании"
+    ),
+    city_id: Optional[int] = Query(None, description="Ограничить улицы городом"),
+    country_id: Optional[int] = Query(None, description="Ограничить города страной"),
+    limit: int = Query(10, ge=1, le=50, description="Максимальное количество результатов"),
+):
+    """
+    Автодополнение по названиям позиций меню, категорий, компаний,
+    городов и улиц из поискового индекса
+    """
+    filters = {}
+    if company_id is not None:
+        filters["company_id"] = company_id
+    if city_id is not None:
+        filters["city_id"] = city_id
+    if country_id is not None:
+        filters["country_id"] = country_id
+
+    try:
+        hits = await search_backend.search(
+            query=q,
+            entities=entities or list(SearchEntity),
+            filters=filters,
+            limit=limit,
+        )
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Search unavailable: {str(e)}")
+    return SearchResponse(query=q, hits=hits)
+
+
+@router.post("/reindex", response_model=ReindexResponse)
+async def reindex(
+    session: SessionDep,
+    entities: Optional[List[SearchEntity]] = Query(
+        None, description="Типы сущностей, по умолчанию все"
+    ),
+    current_user: UserProfile = Depends(get_current_superuser),
+):
+    """Полная переиндексация выбранных сущностей (только для администраторов)"""
+    try:
+        indexed = await SearchIndexer(session).reindex(entities)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Reindex failed: {str(e)}")
+    return ReindexResponse(indexed=indexed)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from src.backoffice.apps.account.services.key_ring import key_ring
+from src.backoffice.core.config import auth_settings
+
+router = APIRouter(prefix="/.well-known", tags=["auth"])
+
+
+@router.get("/jwks.json")
+async def jwks(response: Response):
+    """Публичные ключи для локальной проверки access-токенов внешними сервисами"""
+    response.headers["Cache-Control"] = f"public, max-age={auth_settings.jwks_max_age}"
+    return key_ring.public_jwks()
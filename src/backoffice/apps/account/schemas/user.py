@@ -61,6 +61,7 @@ class UserProfile(BaseModel):
     avatar_url: Optional[str] = None
     is_active: bool
     is_verified: bool
+    is_superuser: bool = False
     created_at: datetime
     last_login: Optional[datetime] = None
 
@@ -1,21 +1,32 @@
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from src.backoffice.apps.account.services.key_ring import KeyRing, key_ring
 from src.backoffice.core.config import auth_settings
 
 
 class JWTService:
     """Сервис для работы с JWT токенами"""
 
-    def __init__(self):
+    def __init__(self, keys: KeyRing = key_ring):
+        self.key_ring = keys
         self.secret_key = auth_settings.secret_key
         self.algorithm = auth_settings.algorithm
         self.access_token_expire_minutes = auth_settings.access_token_expire_minutes
         self.refresh_token_expire_days = auth_settings.refresh_token_expire_days
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # Проверенные токены: sha256(токен) -> (exp, payload)
+        self._verified: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+        self._verified_max_size = auth_settings.verified_token_cache_size
+        # Удаленный из связки ключ не должен продолжать действовать через кэш
+        self.key_ring.on_reload(self.clear_verified_cache)
 
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -29,9 +40,16 @@ class JWTService:
                 minutes=self.access_token_expire_minutes
             )
 
-        to_encode.update({"exp": expire, "type": "access"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        # jti и iat нужны для отзыва токена до истечения (TokenDenylist)
+        to_encode.update(
+            {
+                "exp": expire,
+                "iat": datetime.now(timezone.utc),
+                "jti": uuid.uuid4().hex,
+                "type": "access",
+            }
+        )
+        return self._encode(to_encode)
 
     def create_refresh_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -44,19 +62,70 @@ class JWTService:
             expire = datetime.now(timezone.utc) + timedelta(days=self.refresh_token_expire_days)
 
         to_encode.update({"exp": expire, "type": "refresh"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        return self._encode(to_encode)
 
     def verify_token(self, token: str, token_type: str = "access") -> Optional[dict]:
         """Проверить токен"""
+        payload = self._decode(token)
+        if payload is None or payload.get("type") != token_type:
+            return None
+        return payload
+
+    def _encode(self, claims: dict) -> str:
+        """Подписать текущим ключом связки (с kid) или SECRET_KEY"""
+        if not self.key_ring.enabled:
+            return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+        key = self.key_ring.signing_key()
+        if key is None:
+            raise RuntimeError("JWT key ring has no active signing key")
+        return jwt.encode(
+            claims, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid}
+        )
+
+    def clear_verified_cache(self) -> None:
+        """Забыть проверенные токены (например, после смены ключа)"""
+        self._verified.clear()
+
+    def _decode(self, token: str) -> Optional[dict]:
+        """
+        Проверить подпись и срок действия токена.
+
+        Успешно проверенные токены кэшируются до их exp, поэтому серия запросов
+        с одним токеном стоит одной проверки подписи.
+        """
+        cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = self._verified.get(cache_key)
+        if cached is not None:
+            expires_at, payload = cached
+            if expires_at > time.time():
+                self._verified.move_to_end(cache_key)
+                return payload
+            del self._verified[cache_key]
+
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            if payload.get("type") != token_type:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid is not None:
+                key = self.key_ring.verification_key(kid)
+                if key is None:
+                    return None
+                payload = jwt.decode(
+                    token, key.public_key.to_dict(), algorithms=[key.algorithm]
+                )
+            elif not self.key_ring.enabled or auth_settings.allow_symmetric_tokens:
+                payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            else:
                 return None
-            return payload
         except JWTError:
             return None
 
+        expires_at = payload.get("exp")
+        if self._verified_max_size > 0 and isinstance(expires_at, (int, float)):
+            self._verified[cache_key] = (float(expires_at), payload)
+            if len(self._verified) > self._verified_max_size:
+                self._verified.popitem(last=False)
+        return payload
+
     def verify_access_token(self, token: str) -> Optional[dict]:
         """Проверить access токен"""
         return self.verify_token(token, "access")
@@ -0,0 +1,155 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from src.backoffice.core.config import auth_settings
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("auth.key_ring")
+
+# Поддерживаемые асимметричные алгоритмы подписи
+SUPPORTED_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Ключ из связки: подписывает с not_before, проверяет до expires_at"""
+
+    kid: str
+    algorithm: str
+    private_key: Key
+    public_key: Key
+    not_before: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    def can_sign(self, now: datetime) -> bool:
+        return (self.not_before is None or self.not_before <= now) and not self.is_expired(
+            now
+        )
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
+    def public_jwk(self) -> dict:
+        return {**self.public_key.to_dict(), "kid": self.kid, "use": "sig"}
+
+
+class KeyRing:
+    """
+    Связка ключей подписи JWT из JSON-файла JWT_KEYRING_FILE:
+
+        {"keys": [{"kid": "...", "algorithm": "RS256",
+                   "private_key_file": "2026-10-17.pem",
+                   "not_before": "2026-10-17T00:00:00Z", "expires_at": null}]}
+
+    Подписывает ключ с самым поздним наступившим not_before. Проверяются и
+    публикуются в JWKS все неистекшие ключи, в том числе будущие — так
+    внешние сервисы получают новый ключ до того, как им начнут подписывать.
+    Файл перечитывается при изменении, не чаще JWT_KEYRING_RELOAD_INTERVAL.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path) if path else None
+        self._keys: Dict[str, SigningKey] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._on_reload: List[Callable[[], None]] = []
+        if self.path is not None:
+            self.reload()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def on_reload(self, callback: Callable[[], None]) -> None:
+        """Вызвать callback после перечитывания связки"""
+        self._on_reload.append(callback)
+
+    def reload(self) -> None:
+        """Перечитать файл связки"""
+        if self.path is None:
+            return
+        data = json.loads(self.path.read_text())
+        keys: Dict[str, SigningKey] = {}
+        for entry in data.get("keys", []):
+            algorithm = entry.get("algorithm", "RS256")
+            if algorithm not in SUPPORTED_ALGORITHMS:
+                raise ValueError(f"Unsupported JWT algorithm for key {entry['kid']}: {algorithm}")
+            key_file = self.path.parent / entry["private_key_file"]
+            private_key = jwk.construct(key_file.read_text(), algorithm=algorithm)
+            keys[entry["kid"]] = SigningKey(
+                kid=entry["kid"],
+                algorithm=algorithm,
+                private_key=private_key,
+                public_key=private_key.public_key(),
+                not_before=_parse_datetime(entry.get("not_before")),
+                expires_at=_parse_datetime(entry.get("expires_at")),
+            )
+
+        self._keys = keys
+        self._mtime = os.stat(self.path).st_mtime
+        self._checked_at = time.monotonic()
+        logger.info("jwt_key_ring_loaded", extra={"kids": sorted(keys)})
+        for callback in self._on_reload:
+            callback()
+
+    def signing_key(self) -> Optional[SigningKey]:
+        """Текущий ключ подписи; None, если подходящего ключа нет"""
+        self._maybe_reload()
+        now = datetime.now(timezone.utc)
+        candidates = [key for key in self._keys.values() if key.can_sign(now)]
+        if not candidates:
+            return None
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        return max(candidates, key=lambda key: key.not_before or epoch)
+
+    def verification_key(self, kid: str) -> Optional[SigningKey]:
+        """Неистекший ключ для проверки подписи по kid"""
+        self._maybe_reload()
+        key = self._keys.get(kid)
+        if key is None or key.is_expired(datetime.now(timezone.utc)):
+            return None
+        return key
+
+    def public_jwks(self) -> dict:
+        """Публичные ключи в формате JWKS"""
+        self._maybe_reload()
+        now = datetime.now(timezone.utc)
+        return {
+            "keys": [
+                key.public_jwk() for key in self._keys.values() if not key.is_expired(now)
+            ]
+        }
+
+    def _maybe_reload(self) -> None:
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < auth_settings.keyring_reload_interval:
+            return
+        self._checked_at = now
+        try:
+            if os.stat(self.path).st_mtime != self._mtime:
+                self.reload()
+        except (OSError, ValueError, KeyError) as e:
+            # Оставляем последнюю успешно загруженную связку
+            logger.error("jwt_key_ring_reload_failed", extra={"error": str(e)})
+
+
+key_ring = KeyRing(auth_settings.keyring_file)
@@ -1,217 +1,186 @@
 from typing import Dict, Optional
 
 import httpx
-from authlib.integrations.httpx_client import AsyncOAuth2Client
+from authlib.common.security import generate_token
+from authlib.oauth2.rfc6749.parameters import prepare_grant_uri
 
 from src.backoffice.core.config import auth_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.http_client import http_client_pool
 
+logger = get_logger("auth.oauth")
 
-class OAuthService:
-    """Базовый сервис для OAuth авторизации"""
 
-    def __init__(self):
-        self.auth_settings = auth_settings
-
-    async def get_user_info(self, access_token: str) -> Optional[Dict]:
-        """Получить информацию о пользователе (должен быть переопределен в наследниках)"""
-        raise NotImplementedError
+class OAuthService:
+    """Базовый сервис для OAuth авторизации
 
+    Запросы к провайдеру идут через общий http_client_pool: соединения
+    переиспользуются между входами пользователей.
+    """
 
-class GoogleOAuthService(OAuthService):
-    """Сервис для Google OAuth"""
+    provider: str = ""
+    scope: str = ""
+    authorize_url: str = ""
+    token_url: str = ""
+    user_info_url: str = ""
 
     def __init__(self):
-        super().__init__()
-        self.client_id = self.auth_settings.google_client_id
-        self.client_secret = self.auth_settings.google_client_secret
-        self.redirect_uri = self.auth_settings.google_redirect_uri
-        self.scope = "openid email profile"
-        self.authorize_url = "https://accounts.google.com/o/oauth2/v2/auth"
-        self.token_url = "https://oauth2.googleapis.com/token"
-        self.user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
+        self.auth_settings = auth_settings
+        self.client_id: Optional[str] = None
+        self.client_secret: Optional[str] = None
+        self.redirect_uri: Optional[str] = None
 
     def get_authorization_url(self, state: Optional[str] = None) -> str:
         """Получить URL для авторизации"""
         if not self.client_id or not self.client_secret:
-            raise ValueError("Google OAuth credentials not configured")
+            raise ValueError(f"{self.provider.capitalize()} OAuth credentials not configured")
 
-        client = AsyncOAuth2Client(
+        return prepare_grant_uri(
+            self.authorize_url,
             client_id=self.client_id,
-            client_secret=self.client_secret,
+            response_type="code",
             redirect_uri=self.redirect_uri,
             scope=self.scope,
+            state=state or generate_token(48),
         )
 
-        authorization_url, _ = client.create_authorization_url(
-            self.authorize_url, state=state
-        )
-        return authorization_url
-
     async def get_access_token(self, code: str) -> Optional[Dict]:
         """Получить access токен"""
-        async with AsyncOAuth2Client(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-        ) as client:
-            try:
-                token = await client.fetch_token(
-                    self.token_url, 
-                    code=code,
-                    grant_type="authorization_code"
-                )
-                return token
-            except Exception:
-                return None
+        try:
+            # Код одноразовый: повторяем, только если запрос не ушел провайдеру
+            response = await http_client_pool.request(
+                "POST",
+                self.token_url,
+                operation=f"oauth.{self.provider}.token",
+                idempotent=False,
+                data={
+                    "grant_type": "authorization_code",
+                    "code": code,
+                    "redirect_uri": self.redirect_uri,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                },
+                headers={"Accept": "application/json"},
+            )
+            response.raise_for_status()
+            token = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(
+                "oauth_token_exchange_failed",
+                extra={"provider": self.provider, "error": str(e)},
+            )
+            return None
+        if "access_token" not in token:
+            logger.warning(
+                "oauth_token_exchange_failed",
+                extra={"provider": self.provider, "error": token.get("error")},
+            )
+            return None
+        return token
 
     async def get_user_info(self, access_token: str) -> Optional[Dict]:
         """Получить информацию о пользователе"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.user_info_url,
-                    headers={"Authorization": f"Bearer {access_token}"},
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception:
-                return None
+        try:
+            response = await self._request_user_info(access_token)
+            response.raise_for_status()
+            return self._parse_user_info(response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(
+                "oauth_user_info_failed",
+                extra={"provider": self.provider, "error": str(e)},
+            )
+            return None
+
+    async def _request_user_info(self, access_token: str) -> httpx.Response:
+        return await http_client_pool.request(
+            "GET",
+            self.user_info_url,
+            operation=f"oauth.{self.provider}.user_info",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+    def _parse_user_info(self, data: Dict) -> Optional[Dict]:
+        return data
+
+
+class GoogleOAuthService(OAuthService):
+    """Сервис для Google OAuth"""
+
+    provider = "google"
+    scope = "openid email profile"
+    authorize_url = "https://accounts.google.com/o/oauth2/v2/auth"
+    token_url = "https://oauth2.googleapis.com/token"
+    user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
+
+    def __init__(self):
+        super().__init__()
+        self.client_id = self.auth_settings.google_client_id
+        self.client_secret = self.auth_settings.google_client_secret
+        self.redirect_uri = self.auth_settings.google_redirect_uri
 
 
 class YandexOAuthService(OAuthService):
     """Сервис для Yandex OAuth"""
 
+    provider = "yandex"
+    scope = "login:email login:info"
+    authorize_url = "https://oauth.yandex.ru/authorize"
+    token_url = "https://oauth.yandex.ru/token"
+    user_info_url = "https://login.yandex.ru/info"
+
     def __init__(self):
         super().__init__()
         self.client_id = self.auth_settings.yandex_client_id
         self.client_secret = self.auth_settings.yandex_client_secret
         self.redirect_uri = self.auth_settings.yandex_redirect_uri
-        self.scope = "login:email login:info"
-        self.authorize_url = "https://oauth.yandex.ru/authorize"
-        self.token_url = "https://oauth.yandex.ru/token"
-        self.user_info_url = "https://login.yandex.ru/info"
 
-    def get_authorization_url(self, state: Optional[str] = None) -> str:
-        """Получить URL для авторизации"""
-        if not self.client_id or not self.client_secret:
-            raise ValueError("Yandex OAuth credentials not configured")
-
-        client = AsyncOAuth2Client(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=self.scope,
-        )
-
-        authorization_url, _ = client.create_authorization_url(
-            self.authorize_url, state=state
+    async def _request_user_info(self, access_token: str) -> httpx.Response:
+        return await http_client_pool.request(
+            "GET",
+            self.user_info_url,
+            operation=f"oauth.{self.provider}.user_info",
+            headers={"Authorization": f"OAuth {access_token}"},
         )
-        return authorization_url
-
-    async def get_access_token(self, code: str) -> Optional[Dict]:
-        """Получить access токен"""
-        async with AsyncOAuth2Client(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-        ) as client:
-            try:
-                token = await client.fetch_token(
-                    self.token_url, 
-                    code=code,
-                    grant_type="authorization_code"
-                )
-                return token
-            except Exception:
-                return None
-
-    async def get_user_info(self, access_token: str) -> Optional[Dict]:
-        """Получить информацию о пользователе"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.user_info_url,
-                    headers={"Authorization": f"OAuth {access_token}"},
-                )
-                response.raise_for_status()
-                return response.json()
-            except Exception:
-                return None
 
 
 class VKOAuthService(OAuthService):
     """Сервис для VK OAuth"""
 
+    provider = "vk"
+    scope = "email"
+    authorize_url = "https://oauth.vk.com/authorize"
+    token_url = "https://oauth.vk.com/access_token"
+    user_info_url = "https://api.vk.com/method/users.get"
+
     def __init__(self):
         super().__init__()
         self.client_id = self.auth_settings.vk_client_id
         self.client_secret = self.auth_settings.vk_client_secret
         self.redirect_uri = self.auth_settings.vk_redirect_uri
-        self.scope = "email"
-        self.authorize_url = "https://oauth.vk.com/authorize"
-        self.token_url = "https://oauth.vk.com/access_token"
-        self.user_info_url = "https://api.vk.com/method/users.get"
 
-    def get_authorization_url(self, state: Optional[str] = None) -> str:
-        """Получить URL для авторизации"""
-        if not self.client_id or not self.client_secret:
-            raise ValueError("VK OAuth credentials not configured")
-
-        client = AsyncOAuth2Client(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=self.scope,
-        )
-
-        authorization_url, _ = client.create_authorization_url(
-            self.authorize_url, state=state
+    async def _request_user_info(self, access_token: str) -> httpx.Response:
+        return await http_client_pool.request(
+            "GET",
+            self.user_info_url,
+            operation=f"oauth.{self.provider}.user_info",
+            params={
+                "access_token": access_token,
+                "fields": "id,first_name,last_name,email,photo_200",
+                "v": "5.131",
+            },
         )
-        return authorization_url
-
-    async def get_access_token(self, code: str) -> Optional[Dict]:
-        """Получить access токен"""
-        async with AsyncOAuth2Client(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-        ) as client:
-            try:
-                token = await client.fetch_token(
-                    self.token_url, 
-                    code=code,
-                    grant_type="authorization_code"
-                )
-                return token
-            except Exception:
-                return None
 
-    async def get_user_info(self, access_token: str) -> Optional[Dict]:
-        """Получить информацию о пользователе"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.user_info_url,
-                    params={
-                        "access_token": access_token,
-                        "fields": "id,first_name,last_name,email,photo_200",
-                        "v": "5.131",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                if "response" in data and data["response"]:
-                    user_data = data["response"][0]
-                    return {
-                        "id": str(user_data.get("id")),
-                        "first_name": user_data.get("first_name"),
-                        "last_name": user_data.get("last_name"),
-                        "email": data.get("email"),  # Email приходит отдельно
-                        "avatar_url": user_data.get("photo_200"),
-                    }
-                return None
-            except Exception:
-                return None
+    def _parse_user_info(self, data: Dict) -> Optional[Dict]:
+        if "response" in data and data["response"]:
+            user_data = data["response"][0]
+            return {
+                "id": str(user_data.get("id")),
+                "first_name": user_data.get("first_name"),
+                "last_name": user_data.get("last_name"),
+                "email": data.get("email"),  # Email приходит отдельно
+                "avatar_url": user_data.get("photo_200"),
+            }
+        return None
 
 
 # Создаем экземпляры сервисов
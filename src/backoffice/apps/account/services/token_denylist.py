@@ -0,0 +1,202 @@
+import asyncio
+import contextlib
+import time
+from typing import Optional
+
+from src.backoffice.core.config import auth_settings, token_denylist_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.bloom_filter import BloomFilter
+from src.backoffice.core.services.redis_client import redis_client
+
+logger = get_logger("auth.denylist")
+
+
+class TokenDenylist:
+    """
+    Список отозванных access токенов до их exp.
+
+    Источник истины — Redis:
+      {prefix}entries   — ZSET записей "jti:<jti>" и "user:<id>" со временем
+                          истечения записи в score;
+      {prefix}user:<id> — время, до которого выданы отозванные токены
+                          пользователя (выход на всех устройствах);
+      {prefix}events    — канал, по которому воркеры узнают о новых записях.
+
+    Каждый воркер держит Bloom-фильтр записей, поэтому проверка токена,
+    которого нет в списке, обходится без сетевых запросов. В Redis идет
+    только проверка срабатываний фильтра; если Redis при этом недоступен,
+    токен считается отозванным.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = token_denylist_settings.enabled
+        self.prefix = token_denylist_settings.key_prefix
+        self._bloom = self._new_bloom()
+        # Фильтр, который собирается при синхронизации: новые события
+        # пишутся и в него, чтобы не потеряться при подмене
+        self._next_bloom: Optional[BloomFilter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def _entries_key(self) -> str:
+        return f"{self.prefix}entries"
+
+    @property
+    def _channel(self) -> str:
+        return f"{self.prefix}events"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    @staticmethod
+    def _new_bloom() -> BloomFilter:
+        return BloomFilter(
+            token_denylist_settings.capacity, token_denylist_settings.error_rate
+        )
+
+    def _remember(self, entry: str) -> None:
+        self._bloom.add(entry)
+        if self._next_bloom is not None:
+            self._next_bloom.add(entry)
+
+    async def revoke_token(self, claims: dict) -> None:
+        """
+        Отозвать access токен по его claims до истечения exp.
+        Ошибки Redis логируются: выход не должен падать из-за списка отзыва.
+        """
+        jti = claims.get("jti")
+        expires_at = claims.get("exp")
+        if not self.enabled or not jti or not isinstance(expires_at, (int, float)):
+            return
+        if expires_at <= time.time():
+            return
+        try:
+            await self._add(f"jti:{jti}", float(expires_at))
+        except Exception as e:
+            logger.error(
+                "token_denylist_revoke_failed", extra={"jti": jti, "error": str(e)}
+            )
+
+    async def revoke_user(self, user_id: int) -> None:
+        """
+        Отозвать все выданные пользователю access токены.
+        Ошибки Redis логируются: выход не должен падать из-за списка отзыва.
+        """
+        if not self.enabled:
+            return
+        # iat в JWT — целые секунды, поэтому и граница хранится в секундах
+        now = int(time.time())
+        ttl = auth_settings.access_token_expire_minutes * 60
+        try:
+            await redis_client.client.set(self._user_key(user_id), now, ex=ttl)
+            await self._add(f"user:{user_id}", now + ttl)
+        except Exception as e:
+            logger.error(
+                "token_denylist_revoke_failed",
+                extra={"user_id": user_id, "error": str(e)},
+            )
+
+    async def _add(self, entry: str, expires_at: float) -> None:
+        self._remember(entry)
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(self._entries_key, {entry: expires_at})
+            pipe.publish(self._channel, entry)
+            await pipe.execute()
+        logger.info("token_denylist_added", extra={"entry": entry})
+
+    async def is_revoked(self, claims: dict) -> bool:
+        """Отозван ли токен; без сети, если записи нет в Bloom-фильтре"""
+        if not self.enabled:
+            return False
+        jti = claims.get("jti")
+        user_id = claims.get("user_id")
+        check_jti = bool(jti) and f"jti:{jti}" in self._bloom
+        check_user = user_id is not None and f"user:{user_id}" in self._bloom
+        if not check_jti and not check_user:
+            return False
+
+        try:
+            if check_jti:
+                expires_at = await redis_client.client.zscore(
+                    self._entries_key, f"jti:{jti}"
+                )
+                if expires_at is not None and expires_at > time.time():
+                    return True
+            if check_user:
+                revoked_before = await redis_client.client.get(self._user_key(user_id))
+                # Токен, выданный в ту же секунду, что и отзыв, считается новым:
+                # повторный вход сразу после выхода на всех устройствах работает
+                if revoked_before is not None and claims.get("iat", 0) < int(
+                    float(revoked_before)
+                ):
+                    return True
+        except Exception as e:
+            logger.error("token_denylist_check_failed", extra={"error": str(e)})
+            return True
+        return False
+
+    async def sync(self) -> None:
+        """Пересобрать Bloom-фильтр из Redis, удалив истекшие записи"""
+        self._next_bloom = bloom = self._new_bloom()
+        try:
+            client = redis_client.client
+            await client.zremrangebyscore(self._entries_key, "-inf", time.time())
+            entries = await client.zrange(self._entries_key, 0, -1)
+            for entry in entries:
+                bloom.add(entry.decode() if isinstance(entry, bytes) else entry)
+            self._bloom = bloom
+        finally:
+            self._next_bloom = None
+        if bloom.count > bloom.capacity:
+            logger.warning(
+                "token_denylist_over_capacity",
+                extra={"entries": bloom.count, "capacity": bloom.capacity},
+            )
+
+    async def start(self) -> None:
+        """Загрузить список и подписаться на новые записи"""
+        if not self.enabled or self._task is not None:
+            return
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.error("token_denylist_sync_failed", extra={"error": str(e)})
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        interval = token_denylist_settings.sync_interval
+        while True:
+            pubsub = redis_client.client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # События до подписки могли быть пропущены
+                await self.sync()
+                synced_at = time.monotonic()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None and message["type"] == "message":
+                        data = message["data"]
+                        self._remember(data.decode() if isinstance(data, bytes) else data)
+                    if time.monotonic() - synced_at >= interval:
+                        await self.sync()
+                        synced_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("token_denylist_listener_failed", extra={"error": str(e)})
+                await asyncio.sleep(min(interval, 5))
+            finally:
+                await pubsub.aclose()
+
+
+token_denylist = TokenDenylist()
@@ -0,0 +1,59 @@
+import asyncio
+import contextlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.backoffice.apps.account.services.user_service import UserService
+from src.backoffice.core.config import auth_settings
+from src.backoffice.core.dependencies import AsyncSessionLocal
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("auth.token_purge")
+
+
+class RefreshTokenPurger:
+    """
+    Периодически удаляет из refresh_tokens истекшие и отозванные токены,
+    чтобы таблица не росла бесконечно. Запускается в каждом воркере;
+    повторное удаление безопасно, а случайный сдвиг разводит воркеры по времени.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None and auth_settings.refresh_token_purge_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def purge(self) -> int:
+        """Один проход очистки; возвращает число удаленных токенов"""
+        older_than = datetime.now(timezone.utc) - timedelta(
+            days=auth_settings.refresh_token_purge_grace_days
+        )
+        async with AsyncSessionLocal() as session:
+            return await UserService(session).purge_refresh_tokens(
+                older_than, auth_settings.refresh_token_purge_batch_size
+            )
+
+    async def _run(self) -> None:
+        interval = auth_settings.refresh_token_purge_interval
+        await asyncio.sleep(random.uniform(0, interval))
+        while True:
+            try:
+                deleted = await self.purge()
+                logger.info("refresh_tokens_purged", extra={"deleted": deleted})
+            except Exception as e:
+                logger.error("refresh_tokens_purge_failed", extra={"error": str(e)})
+            await asyncio.sleep(interval)
+
+
+refresh_token_purger = RefreshTokenPurger()
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from src.backoffice.apps.account.schemas import UserProfile
+from src.backoffice.core.services.tiered_cache import create_auth_cache
+
+
+class UserProfileCache:
+    """Кэш профилей пользователей для get_current_user"""
+
+    def __init__(self) -> None:
+        self._cache = create_auth_cache("users")
+
+    async def get(self, user_id: int) -> Optional[UserProfile]:
+        if self._cache is None:
+            return None
+        value = await self._cache.get(str(user_id))
+        if value is None:
+            return None
+        return UserProfile.model_validate_json(value)
+
+    async def set(self, profile: UserProfile) -> None:
+        if self._cache is not None:
+            await self._cache.set(str(profile.id), profile.model_dump_json().encode())
+
+    async def invalidate(self, user_id: int) -> None:
+        if self._cache is not None:
+            await self._cache.delete(str(user_id))
+
+
+user_profile_cache = UserProfileCache()
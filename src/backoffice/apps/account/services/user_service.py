@@ -1,12 +1,19 @@
+import hashlib
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import and_, delete, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.backoffice.apps.account.models import OAuthAccount, RefreshToken, User
 from src.backoffice.apps.account.schemas import UserCreate, UserUpdate
+from src.backoffice.apps.account.services.user_cache import user_profile_cache
+
+
+def hash_token(token: str) -> str:
+    """Отпечаток refresh токена для хранения и поиска в БД"""
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 class UserService:
@@ -56,6 +63,7 @@ class UserService:
 
         user.updated_at = datetime.now(timezone.utc)
         await self.session.commit()
+        await user_profile_cache.invalidate(user_id)
         await self.session.refresh(user)
         return user
 
@@ -88,6 +96,7 @@ class UserService:
             oauth_account.updated_at = datetime.now(timezone.utc)
 
             await self.session.commit()
+            await user_profile_cache.invalidate(user.id)
             return user, False
 
         # Ищем пользователя по email
@@ -108,6 +117,7 @@ class UserService:
                 self.session.add(oauth_account)
                 user.last_login = datetime.now(timezone.utc)
                 await self.session.commit()
+                await user_profile_cache.invalidate(user.id)
                 return user, False
 
         # Создаем нового пользователя
@@ -143,7 +153,7 @@ class UserService:
     ) -> RefreshToken:
         """Создать refresh токен"""
         refresh_token = RefreshToken(
-            user_id=user_id, token=token, expires_at=expires_at
+            user_id=user_id, token_hash=hash_token(token), expires_at=expires_at
         )
         self.session.add(refresh_token)
         await self.session.commit()
@@ -154,7 +164,7 @@ class UserService:
         """Получить refresh токен"""
         result = await self.session.execute(
             select(RefreshToken).where(
-                RefreshToken.token == token,
+                RefreshToken.token_hash == hash_token(token),
                 RefreshToken.is_revoked == False,
                 RefreshToken.expires_at > datetime.now(timezone.utc),
             )
@@ -163,27 +173,62 @@ class UserService:
 
     async def revoke_refresh_token(self, token: str) -> bool:
         """Отозвать refresh токен"""
-        refresh_token = await self.get_refresh_token(token)
-        if refresh_token:
-            refresh_token.is_revoked = True
-            await self.session.commit()
-            return True
-        return False
-
-    async def revoke_all_user_tokens(self, user_id: int) -> int:
-        """Отозвать все токены пользователя"""
         result = await self.session.execute(
-            select(RefreshToken).where(
-                RefreshToken.user_id == user_id, RefreshToken.is_revoked == False
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == hash_token(token),
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > datetime.now(timezone.utc),
             )
+            .values(is_revoked=True)
+            .returning(RefreshToken.id)
         )
-        tokens = result.scalars().all()
-
-        for token in tokens:
-            token.is_revoked = True
+        revoked = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return revoked
 
+    async def revoke_all_user_tokens(self, user_id: int) -> int:
+        """Отозвать все токены пользователя одним UPDATE"""
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked == False)
+            .values(is_revoked=True)
+            .returning(RefreshToken.id)
+        )
+        revoked = len(result.scalars().all())
         await self.session.commit()
-        return len(tokens)
+        return revoked
+
+    async def purge_refresh_tokens(self, older_than: datetime, batch_size: int) -> int:
+        """
+        Удалить истекшие и отозванные токены, не менявшиеся с older_than.
+        Удаляет пачками по batch_size, чтобы не держать долгих блокировок.
+        """
+        # expires_at хранится без часового пояса (UTC)
+        expired_before = older_than.astimezone(timezone.utc).replace(tzinfo=None)
+        stale = (
+            select(RefreshToken.id)
+            .where(
+                or_(
+                    RefreshToken.expires_at < expired_before,
+                    and_(
+                        RefreshToken.is_revoked == True,
+                        RefreshToken.updated_at < older_than,
+                    ),
+                )
+            )
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        deleted = 0
+        while True:
+            result = await self.session.execute(
+                delete(RefreshToken).where(RefreshToken.id.in_(stale))
+            )
+            await self.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
 
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Аутентификация пользователя по email и паролю"""
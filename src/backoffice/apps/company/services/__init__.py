@@ -4,6 +4,7 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.company.models import CompanyMember, CompanyRole
+from src.backoffice.apps.company.services.role_cache import company_role_cache
 
 
 class CompanyMembershipService:
@@ -28,10 +29,27 @@ class CompanyMembershipService:
     ) -> CompanyMember:
         member = CompanyMember(company_id=company_id, user_id=user_id, role=role)
         self.session.add(member)
-        await self.session.flush()
+        await self.session.commit()
+        # Кэш сбрасывается после commit, иначе параллельный get_role может
+        # снова закэшировать роль из незафиксированного состояния
+        await company_role_cache.invalidate(company_id, user_id)
         await self.session.refresh(member)
         return member
 
+    async def get_role(self, company_id: int, user_id: int) -> CompanyRole | None:
+        """Роль пользователя в компании с учетом кэша; None — не участник"""
+        found, role = await company_role_cache.get(company_id, user_id)
+        if found:
+            return role
+        role = await self.session.scalar(
+            select(CompanyMember.role).where(
+                CompanyMember.company_id == company_id,
+                CompanyMember.user_id == user_id,
+            )
+        )
+        await company_role_cache.set(company_id, user_id, role)
+        return role
+
     async def update_role(
         self, company_id: int, user_id: int, role: CompanyRole
     ) -> CompanyMember | None:
@@ -39,7 +57,8 @@ class CompanyMembershipService:
         if not member:
             return None
         member.role = role
-        await self.session.flush()
+        await self.session.commit()
+        await company_role_cache.invalidate(company_id, user_id)
         await self.session.refresh(member)
         return member
 
@@ -53,6 +72,8 @@ class CompanyMembershipService:
         )
         result = await self.session.execute(stmt)
         deleted_ids = result.scalars().all()
+        await self.session.commit()
+        await company_role_cache.invalidate(company_id, user_id)
         return len(deleted_ids)
 
     @staticmethod
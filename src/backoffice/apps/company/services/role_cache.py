@@ -0,0 +1,47 @@
+from typing import Optional, Tuple
+
+from src.backoffice.apps.company.models import CompanyRole
+from src.backoffice.core.services.tiered_cache import create_auth_cache
+
+# Значение для пользователя, который не состоит в компании
+NOT_A_MEMBER = b"-"
+
+
+class CompanyRoleCache:
+    """Кэш ролей (company_id, user_id) -> CompanyRole для require_company_role"""
+
+    def __init__(self) -> None:
+        self._cache = create_auth_cache("company_roles")
+
+    @staticmethod
+    def _key(company_id: int, user_id: int) -> str:
+        return f"{company_id}:{user_id}"
+
+    async def get(
+        self, company_id: int, user_id: int
+    ) -> Tuple[bool, Optional[CompanyRole]]:
+        """Вернуть (найдено в кэше, роль или None для не-участника)"""
+        if self._cache is None:
+            return False, None
+        value = await self._cache.get(self._key(company_id, user_id))
+        if value is None:
+            return False, None
+        if value == NOT_A_MEMBER:
+            return True, None
+        return True, CompanyRole(value.decode())
+
+    async def set(
+        self, company_id: int, user_id: int, role: Optional[CompanyRole]
+    ) -> None:
+        if self._cache is not None:
+            await self._cache.set(
+                self._key(company_id, user_id),
+                role.value.encode() if role is not None else NOT_A_MEMBER,
+            )
+
+    async def invalidate(self, company_id: int, user_id: int) -> None:
+        if self._cache is not None:
+            await self._cache.delete(self._key(company_id, user_id))
+
+
+company_role_cache = CompanyRoleCache()
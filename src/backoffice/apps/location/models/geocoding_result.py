@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Импорты будут добавлены в __init__.py для избежания циклических импортов
@@ -13,13 +13,34 @@ class GeocodingResult(Base, IdMixin):
     __tablename__ = "geocoding_results"
     __repr_fields__ = ("provider", "query")
     __repr_maxlen__ = 60
+    __table_args__ = (
+        Index(
+            "ix_geocoding_results_cache_lookup",
+            "query_hash",
+            "provider",
+            "is_successful",
+            "expires_at",
+        ),
+        # varchar_pattern_ops позволяет использовать индекс для LIKE 'cell%'
+        Index(
+            "ix_geocoding_results_geohash_lookup",
+            "geohash",
+            "query_hash",
+            "provider",
+            postgresql_ops={"geohash": "varchar_pattern_ops"},
+        ),
+    )
 
     # Исходный запрос
-    query: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    # sha256 нормализованного запроса и его параметров в hex — ключ поиска в кэше
+    query_hash: Mapped[str] = mapped_column(String(64), nullable=True)
 
     # Результат геокодирования
     latitude: Mapped[float] = mapped_column(Float, nullable=True, index=True)
     longitude: Mapped[float] = mapped_column(Float, nullable=True, index=True)
+    # Полный geohash точки запроса обратного геокодирования (ячейка — префикс)
+    geohash: Mapped[str] = mapped_column(String(12), nullable=True)
 
     # Форматированный адрес
     formatted_address: Mapped[str] = mapped_column(Text, nullable=True)
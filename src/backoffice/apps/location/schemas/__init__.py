@@ -4,11 +4,14 @@ from .city import (CityBase, CityCreate, CityListResponse, CityResponse,
                    CityUpdate)
 from .country import (CountryBase, CountryCreate, CountryListResponse,
                       CountryResponse, CountryUpdate)
-from .geocoding import (GeocodingAccuracy, GeocodingListResponse,
-                        GeocodingProvider, GeocodingRequest,
-                        GeocodingResultBase, GeocodingResultCreate,
-                        GeocodingResultResponse, GeocodingSearchRequest,
-                        GeocodingSearchResponse, ReverseGeocodingRequest)
+from .geocoding import (GeocodingAccuracy, GeocodingBatchItem,
+                        GeocodingBatchJobResponse, GeocodingBatchJobStatus,
+                        GeocodingBatchRequest, GeocodingBatchResponse,
+                        GeocodingListResponse, GeocodingProvider,
+                        GeocodingRequest, GeocodingResultBase,
+                        GeocodingResultCreate, GeocodingResultResponse,
+                        GeocodingSearchRequest, GeocodingSearchResponse,
+                        ReverseGeocodingRequest)
 from .region import (RegionBase, RegionCreate, RegionListResponse,
                      RegionResponse, RegionUpdate)
 from .street import (StreetBase, StreetCreate, StreetListResponse,
@@ -56,4 +59,9 @@ __all__ = [
     "GeocodingListResponse",
     "GeocodingAccuracy",
     "GeocodingProvider",
+    "GeocodingBatchRequest",
+    "GeocodingBatchItem",
+    "GeocodingBatchResponse",
+    "GeocodingBatchJobStatus",
+    "GeocodingBatchJobResponse",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -80,7 +80,9 @@ class GeocodingResultCreate(GeocodingResultBase):
 class GeocodingResultResponse(GeocodingResultBase):
     """Схема ответа для результата геокодирования"""
 
-    id: int
+    id: Optional[int] = Field(
+        None, description="ID записи; пустой, пока результат ждет отложенной записи"
+    )
     created_at: datetime
     expires_at: Optional[datetime]
 
@@ -139,3 +141,64 @@ class GeocodingListResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+class GeocodingBatchRequest(BaseModel):
+    """Запрос на пакетное геокодирование"""
+
+    queries: List[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(
+        ..., description="Адреса для геокодирования", min_length=1
+    )
+    provider: Optional[GeocodingProvider] = Field(
+        GeocodingProvider.GOOGLE, description="Провайдер геокодирования"
+    )
+    language: Optional[str] = Field("ru", description="Язык ответа", max_length=10)
+    region: Optional[str] = Field(
+        None, description="Регион для ограничения поиска", max_length=100
+    )
+    bounds: Optional[str] = Field(
+        None, description="Границы поиска (lat1,lng1,lat2,lng2)"
+    )
+    components: Optional[str] = Field(
+        None, description="Компоненты адреса для фильтрации"
+    )
+
+
+class GeocodingBatchItem(BaseModel):
+    """Результат геокодирования одного адреса из пакета"""
+
+    query: str
+    results: List[GeocodingResultResponse]
+    cached: bool = Field(False, description="Результат взят из кэша")
+    error: Optional[str] = Field(None, description="Ошибка геокодирования")
+
+
+class GeocodingBatchResponse(BaseModel):
+    """Ответ на пакетное геокодирование"""
+
+    items: List[GeocodingBatchItem]
+    total: int
+    cached: int
+    failed: int
+
+
+class GeocodingBatchJobStatus(str, Enum):
+    """Статус фонового задания пакетного геокодирования"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class GeocodingBatchJobResponse(BaseModel):
+    """Состояние фонового задания пакетного геокодирования"""
+
+    job_id: str
+    status: GeocodingBatchJobStatus
+    total: int
+    processed: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[GeocodingBatchResponse] = None
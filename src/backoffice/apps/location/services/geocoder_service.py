@@ -1,23 +1,42 @@
+import asyncio
+import hashlib
 import json
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
-import aiohttp
-from sqlalchemy import and_, select
+from sqlalchemy import and_, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.location.models import GeocodingResult
 from src.backoffice.apps.location.schemas.geocoding import (
-    GeocodingRequest, GeocodingResultResponse, GeocodingSearchRequest,
-    GeocodingSearchResponse, ReverseGeocodingRequest)
+    GeocodingBatchItem, GeocodingBatchRequest, GeocodingBatchResponse,
+    GeocodingProvider, GeocodingRequest, GeocodingResultResponse,
+    GeocodingSearchRequest, GeocodingSearchResponse, ReverseGeocodingRequest)
+from src.backoffice.apps.location.services.geocoding_cache import \
+    geocoding_cache
+from src.backoffice.apps.location.services.geocoding_query import (
+    normalize_query, query_hash)
+from src.backoffice.apps.location.services.geocoding_routing import \
+    geocoding_provider_router
+from src.backoffice.apps.location.services.geocoding_transport import (
+    GeocodingTransport, geocoding_transports)
+from src.backoffice.apps.location.services.geocoding_writer import \
+    geocoding_result_writer
 from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.services import geohash
+from src.backoffice.core.services.rate_limiter import RateLimitExceeded
+from src.backoffice.core.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
+class GeocodingProviderError(Exception):
+    """Провайдер не смог выполнить запрос (ошибка HTTP, исчерпана квота и т.п.)"""
+
+
 class GeocodingProviderInterface(ABC):
     """Интерфейс для провайдеров геокодирования"""
 
@@ -42,10 +61,10 @@ class GeocodingProviderInterface(ABC):
 class GoogleGeocodingProvider(GeocodingProviderInterface):
     """Google Maps Geocoding API провайдер"""
 
-    def __init__(self, api_key: str, base_url: str, timeout: int = 10):
+    def __init__(self, api_key: str, base_url: str, transport: GeocodingTransport):
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = timeout
+        self.transport = transport
 
     async def geocode(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """Геокодирование через Google Maps API"""
@@ -63,16 +82,10 @@ class GoogleGeocodingProvider(GeocodingProviderInterface):
 
         url = f"{self.base_url}?{urlencode(params)}"
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_response(data)
-                else:
-                    logger.error(f"Google Geocoding API error: {response.status}")
-                    return []
+        status, data = await self.transport.get_json(url)
+        if status != 200:
+            raise GeocodingProviderError(f"Google Geocoding API error: {status}")
+        return self.parse_response(data)
 
     async def reverse_geocode(
         self, latitude: float, longitude: float, **kwargs
@@ -88,26 +101,21 @@ class GoogleGeocodingProvider(GeocodingProviderInterface):
         params = {k: v for k, v in params.items() if v is not None}
         url = f"{self.base_url}?{urlencode(params)}"
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_response(data)
-                else:
-                    logger.error(
-                        f"Google Reverse Geocoding API error: {response.status}"
-                    )
-                    return []
+        status, data = await self.transport.get_json(url)
+        if status != 200:
+            raise GeocodingProviderError(f"Google Reverse Geocoding API error: {status}")
+        return self.parse_response(data)
 
     def parse_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Парсинг ответа Google Maps API"""
         results = []
 
-        if response.get("status") != "OK":
-            logger.warning(f"Google Geocoding API status: {response.get('status')}")
+        status = response.get("status")
+        if status == "ZERO_RESULTS":
             return results
+        if status != "OK":
+            # OVER_QUERY_LIMIT, REQUEST_DENIED и т.п. — отказ провайдера, а не пустой ответ
+            raise GeocodingProviderError(f"Google Geocoding API status: {status}")
 
         for item in response.get("results", []):
             geometry = item.get("geometry", {})
@@ -152,10 +160,10 @@ class GoogleGeocodingProvider(GeocodingProviderInterface):
 class YandexGeocodingProvider(GeocodingProviderInterface):
     """Yandex Maps Geocoding API провайдер"""
 
-    def __init__(self, api_key: str, base_url: str, timeout: int = 10):
+    def __init__(self, api_key: str, base_url: str, transport: GeocodingTransport):
         self.api_key = api_key
         self.base_url = base_url
-        self.timeout = timeout
+        self.transport = transport
 
     async def geocode(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """Геокодирование через Yandex Maps API"""
@@ -169,16 +177,10 @@ class YandexGeocodingProvider(GeocodingProviderInterface):
 
         url = f"{self.base_url}?{urlencode(params)}"
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_response(data)
-                else:
-                    logger.error(f"Yandex Geocoding API error: {response.status}")
-                    return []
+        status, data = await self.transport.get_json(url)
+        if status != 200:
+            raise GeocodingProviderError(f"Yandex Geocoding API error: {status}")
+        return self.parse_response(data)
 
     async def reverse_geocode(
         self, latitude: float, longitude: float, **kwargs
@@ -249,10 +251,10 @@ class YandexGeocodingProvider(GeocodingProviderInterface):
 class NominatimGeocodingProvider(GeocodingProviderInterface):
     """OpenStreetMap Nominatim провайдер"""
 
-    def __init__(self, base_url: str, user_agent: str, timeout: int = 10):
+    def __init__(self, base_url: str, user_agent: str, transport: GeocodingTransport):
         self.base_url = base_url
         self.user_agent = user_agent
-        self.timeout = timeout
+        self.transport = transport
 
     async def geocode(self, query: str, **kwargs) -> List[Dict[str, Any]]:
         """Геокодирование через Nominatim"""
@@ -267,16 +269,10 @@ class NominatimGeocodingProvider(GeocodingProviderInterface):
         url = f"{self.base_url}/search?{urlencode(params)}"
         headers = {"User-Agent": self.user_agent}
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_response(data)
-                else:
-                    logger.error(f"Nominatim API error: {response.status}")
-                    return []
+        status, data = await self.transport.get_json(url, headers=headers)
+        if status != 200:
+            raise GeocodingProviderError(f"Nominatim API error: {status}")
+        return self.parse_response(data)
 
     async def reverse_geocode(
         self, latitude: float, longitude: float, **kwargs
@@ -293,18 +289,10 @@ class NominatimGeocodingProvider(GeocodingProviderInterface):
         url = f"{self.base_url}/reverse?{urlencode(params)}"
         headers = {"User-Agent": self.user_agent}
 
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        ) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self.parse_response(
-                        [data] if isinstance(data, dict) else data
-                    )
-                else:
-                    logger.error(f"Nominatim Reverse API error: {response.status}")
-                    return []
+        status, data = await self.transport.get_json(url, headers=headers)
+        if status != 200:
+            raise GeocodingProviderError(f"Nominatim Reverse API error: {status}")
+        return self.parse_response([data] if isinstance(data, dict) else data)
 
     def parse_response(self, response: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Парсинг ответа Nominatim"""
@@ -339,6 +327,135 @@ class NominatimGeocodingProvider(GeocodingProviderInterface):
         return results
 
 
+def _requested_provider(
+    request: Union[GeocodingRequest, ReverseGeocodingRequest, GeocodingBatchRequest],
+) -> Optional[str]:
+    """Провайдер, явно указанный в запросе; None — выбор по общему порядку"""
+    if "provider" in request.model_fields_set and request.provider:
+        return GeocodingProvider(request.provider).value
+    return None
+
+
+# Поля GeocodingResult, которые берутся из ответа провайдера
+_RESULT_FIELDS = (
+    "latitude",
+    "longitude",
+    "formatted_address",
+    "country",
+    "region",
+    "city",
+    "street",
+    "house_number",
+    "postal_code",
+    "place_id",
+    "place_type",
+    "accuracy",
+    "confidence",
+    "external_id",
+    "raw_response",
+)
+
+
+# Длина geohash точки запроса в geocoding_results (размер колонки)
+_GEOHASH_LENGTH = 12
+
+
+def _reverse_key(language: Optional[str], result_type: Optional[str]) -> str:
+    """query_hash строк обратного геокодирования: язык и тип результата"""
+    raw = f"reverse\x1f{language or ''}\x1f{result_type or ''}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _reverse_point(request: ReverseGeocodingRequest) -> str:
+    """Полный geohash точки обратного запроса"""
+    return geohash.encode(request.latitude, request.longitude, _GEOHASH_LENGTH)
+
+
+def _reverse_cache_cell(point: str) -> str:
+    """
+    Ячейка, на которую ответ кэшируется в памяти и Redis: самая крупная, чья
+    диагональ не больше GEOCODING_REVERSE_CACHE_DISTANCE, чтобы ответ не
+    отдавался для точки дальше допуска
+    """
+    for precision in range(geocoding_settings.reverse_geohash_precision, len(point)):
+        min_lat, min_lon, max_lat, max_lon = geohash.bounds(point[:precision])
+        if (
+            geohash.distance_m(min_lat, min_lon, max_lat, max_lon)
+            <= geocoding_settings.reverse_cache_distance
+        ):
+            return point[:precision]
+    return point
+
+
+def _geocode_key(
+    query: str, request: Union[GeocodingRequest, GeocodingBatchRequest]
+) -> str:
+    """query_hash адреса вместе с параметрами запроса, влияющими на ответ"""
+    return query_hash(
+        query, request.language, request.region, request.bounds, request.components
+    )
+
+
+def _result_row(
+    query: str,
+    provider: str,
+    raw_result: Dict[str, Any],
+    key: str,
+    point: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Значения строки geocoding_results для успешного результата. key —
+    _geocode_key() или _reverse_key(), point — geohash точки обратного запроса.
+    """
+    row = {field: raw_result.get(field) for field in _RESULT_FIELDS}
+    row.update(
+        query=query,
+        query_hash=key,
+        geohash=point,
+        provider=provider,
+        is_successful=True,
+        error_message=None,
+        created_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc)
+        + timedelta(seconds=geocoding_settings.cache_ttl),
+    )
+    return row
+
+
+def _error_row(
+    query: str,
+    provider: str,
+    error_message: str,
+    key: str,
+    point: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Значения строки geocoding_results для ошибки (те же ключи, что у результата)"""
+    row = dict.fromkeys(_RESULT_FIELDS)
+    row.update(
+        query=query,
+        query_hash=key,
+        geohash=point,
+        provider=provider,
+        is_successful=False,
+        error_message=error_message,
+        created_at=datetime.now(timezone.utc),
+        expires_at=None,
+    )
+    return row
+
+
+def _pending_results(key: str, providers: List[str]) -> List[GeocodingResultResponse]:
+    """Результаты, сохраненные через отложенную запись, но еще не записанные"""
+    return [
+        GeocodingResultResponse.model_validate(row)
+        for row in geocoding_result_writer.pending(key, providers)
+    ]
+
+
+# Выполняющиеся запросы к провайдерам, общие для всех экземпляров сервиса
+_geocoding_flights: SingleFlight[List[GeocodingResultResponse]] = SingleFlight()
+
+
 class GeocoderService:
     """Сервис геокодирования с поддержкой множественных провайдеров"""
 
@@ -357,7 +474,7 @@ class GeocoderService:
             providers["google"] = GoogleGeocodingProvider(
                 api_key=config["api_key"],
                 base_url=config["base_url"],
-                timeout=config["timeout"],
+                transport=geocoding_transports.get("google"),
             )
 
         # Yandex Maps
@@ -366,7 +483,7 @@ class GeocoderService:
             providers["yandex"] = YandexGeocodingProvider(
                 api_key=config["api_key"],
                 base_url=config["base_url"],
-                timeout=config["timeout"],
+                transport=geocoding_transports.get("yandex"),
             )
 
         # Nominatim
@@ -375,62 +492,211 @@ class GeocoderService:
             providers["nominatim"] = NominatimGeocodingProvider(
                 base_url=config["base_url"],
                 user_agent=config["user_agent"],
-                timeout=config["timeout"],
+                transport=geocoding_transports.get("nominatim"),
             )
 
         return providers
 
     async def geocode(self, request: GeocodingRequest) -> List[GeocodingResultResponse]:
-        """Геокодирование адреса"""
-        # Проверяем кэш
-        cached_results = await self._get_cached_results(request.query, request.provider)
+        """
+        Геокодирование адреса.
+
+        Одновременные одинаковые запросы в процессе объединяются: к провайдеру
+        уходит один запрос, результаты сохраняются один раз.
+        """
+        key = (
+            "geocode",
+            normalize_query(request.query),
+            _requested_provider(request),
+            request.language,
+            request.region,
+            request.bounds,
+            request.components,
+        )
+        return await _geocoding_flights.do(key, lambda: self._geocode(request))
+
+    async def _geocode(self, request: GeocodingRequest) -> List[GeocodingResultResponse]:
+        providers = self._provider_order(request)
+        key = _geocode_key(request.query, request)
+        variant = geocoding_cache.variant(
+            request.language, request.region, request.bounds, request.components
+        )
+
+        # Проверяем кэш: память воркера и Redis, затем таблица geocoding_results
+        cached_results = await geocoding_cache.get(key, providers, variant)
+        if cached_results is not None:
+            return cached_results
+        cached_results = await self._get_cached_results(key, providers)
+        geocoding_cache.record_db(cached_results is not None)
         if cached_results:
+            await geocoding_cache.set(key, providers, variant, cached_results)
             return cached_results
 
-        # Выполняем геокодирование
-        provider = self.providers.get(request.provider)
-        if not provider:
-            raise ValueError(f"Provider {request.provider} is not available")
-
+        # Выполняем геокодирование: провайдеры по порядку с failover/hedging,
+        # лимитами и circuit breaker'ами (GeocodingProviderRouter)
         try:
-            raw_results = await provider.geocode(
-                request.query,
-                language=request.language,
-                region=request.region,
-                bounds=request.bounds,
-                components=request.components,
+            raw_results = await geocoding_provider_router.execute(
+                providers,
+                lambda name: self.providers[name].geocode(
+                    request.query,
+                    language=request.language,
+                    region=request.region,
+                    bounds=request.bounds,
+                    components=request.components,
+                ),
             )
 
-            # Сохраняем результаты в БД
-            results = []
-            for raw_result in raw_results:
-                result = await self._save_geocoding_result(
-                    query=request.query,
-                    provider=request.provider,
-                    raw_result=raw_result,
-                )
-                results.append(GeocodingResultResponse.model_validate(result))
-
+            # Сохраняем результаты в БД одним INSERT
+            results = await self._persist_results(
+                [
+                    _result_row(request.query, raw_result["provider"], raw_result, key)
+                    for raw_result in raw_results
+                ]
+            )
+            await geocoding_cache.set(key, providers, variant, results)
             return results
 
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"Geocoding error: {e}")
             # Сохраняем ошибку в БД
-            await self._save_error_result(request.query, request.provider, str(e))
+            await self._persist_results(
+                [_error_row(request.query, providers[0], str(e), key)]
+            )
+            await geocoding_cache.set_error(key, providers, variant)
             return []
 
+    def _provider_order(
+        self,
+        request: Union[GeocodingRequest, ReverseGeocodingRequest, GeocodingBatchRequest],
+    ) -> List[str]:
+        """
+        Провайдеры для запроса: явно указанный в запросе — первым, затем
+        остальные по GEOCODING_PROVIDER_ORDER
+        """
+        preferred = _requested_provider(request)
+        if preferred is not None and preferred not in self.providers:
+            raise ValueError(f"Provider {preferred} is not available")
+        providers = geocoding_provider_router.provider_order(
+            list(self.providers), preferred
+        )
+        if not providers:
+            raise ValueError("No geocoding providers available")
+        return providers
+
+    async def geocode_batch(
+        self, request: GeocodingBatchRequest
+    ) -> GeocodingBatchResponse:
+        """
+        Пакетное геокодирование.
+
+        Кэш проверяется одним запросом по всем адресам, промахи уходят к
+        провайдерам не более чем по GEOCODING_BATCH_CONCURRENCY одновременно
+        (с учетом лимитов провайдеров), новые результаты сохраняются одним
+        INSERT (или через отложенную запись).
+        """
+        if len(request.queries) > geocoding_settings.batch_max_size:
+            raise ValueError(
+                f"Batch size exceeds {geocoding_settings.batch_max_size} queries"
+            )
+        providers = self._provider_order(request)
+        keys = {query: _geocode_key(query, request) for query in request.queries}
+        # Адреса, совпадающие после нормализации, геокодируются один раз
+        unique: Dict[str, str] = {}
+        for query, key in keys.items():
+            unique.setdefault(key, query)
+
+        cached = await self._get_cached_batch(list(unique), providers)
+        misses = [(key, query) for key, query in unique.items() if key not in cached]
+
+        semaphore = asyncio.Semaphore(geocoding_settings.batch_concurrency)
+        outcomes = await asyncio.gather(
+            *(
+                self._geocode_batch_query(query, request, providers, semaphore)
+                for _, query in misses
+            ),
+            return_exceptions=True,
+        )
+
+        rows: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+        for (key, query), outcome in zip(misses, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Batch geocoding error for {query!r}: {outcome}")
+                errors[key] = str(outcome)
+                rows.append(_error_row(query, providers[0], str(outcome), key))
+            else:
+                rows.extend(
+                    _result_row(query, raw_result["provider"], raw_result, key)
+                    for raw_result in outcome
+                )
+
+        fresh: Dict[str, List[GeocodingResultResponse]] = {}
+        for row, result in zip(rows, await self._persist_results(rows)):
+            if result.is_successful:
+                fresh.setdefault(row["query_hash"], []).append(result)
+
+        items = [
+            GeocodingBatchItem(
+                query=query,
+                results=cached.get(keys[query]) or fresh.get(keys[query], []),
+                cached=keys[query] in cached,
+                error=errors.get(keys[query]),
+            )
+            for query in request.queries
+        ]
+        return GeocodingBatchResponse(
+            items=items,
+            total=len(items),
+            cached=sum(item.cached for item in items),
+            failed=sum(item.error is not None for item in items),
+        )
+
+    async def _geocode_batch_query(
+        self,
+        query: str,
+        request: GeocodingBatchRequest,
+        providers: List[str],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        """
+        Запрос одного адреса пакета к провайдерам. Если лимиты провайдеров
+        исчерпаны, ждет retry_after и повторяет до
+        GEOCODING_BATCH_RATE_LIMIT_RETRIES раз.
+        """
+        async with semaphore:
+            retries = geocoding_settings.batch_rate_limit_retries
+            for attempt in range(retries + 1):
+                try:
+                    return await geocoding_provider_router.execute(
+                        providers,
+                        lambda name: self.providers[name].geocode(
+                            query,
+                            language=request.language,
+                            region=request.region,
+                            bounds=request.bounds,
+                            components=request.components,
+                        ),
+                    )
+                except RateLimitExceeded as e:
+                    if attempt == retries:
+                        raise
+                    await asyncio.sleep(e.retry_after)
+
     async def search(self, request: GeocodingSearchRequest) -> GeocodingSearchResponse:
         """Поиск адресов"""
-        results = await self.geocode(
-            GeocodingRequest(
-                query=request.query,
-                provider=request.provider,
-                language=request.language,
-                region=request.region,
-                bounds=request.bounds,
-                components=request.components,
-            )
+        geocoding_request = GeocodingRequest(
+            query=request.query,
+            language=request.language,
+            region=request.region,
+            bounds=request.bounds,
+            components=request.components,
         )
+        # Провайдер, выбранный явно, идет первым; иначе — общий порядок
+        if "provider" in request.model_fields_set:
+            geocoding_request.provider = request.provider
+        results = await self.geocode(geocoding_request)
 
         # Ограничиваем количество результатов
         limited_results = results[: request.limit]
@@ -445,103 +711,237 @@ class GeocoderService:
     async def reverse_geocode(
         self, request: ReverseGeocodingRequest
     ) -> List[GeocodingResultResponse]:
-        """Обратное геокодирование"""
-        provider = self.providers.get(request.provider)
-        if not provider:
-            raise ValueError(f"Provider {request.provider} is not available")
+        """
+        Обратное геокодирование. Одновременные запросы к одной ячейке кэша
+        (или к одной точке, если кэш выключен) объединяются.
+        """
+        key = (
+            "reverse",
+            (
+                _reverse_cache_cell(_reverse_point(request))
+                if geocoding_settings.reverse_cache_enabled
+                else (request.latitude, request.longitude)
+            ),
+            _requested_provider(request),
+            request.language,
+            request.result_type,
+        )
+        return await _geocoding_flights.do(key, lambda: self._reverse_geocode(request))
 
-        try:
-            raw_results = await provider.reverse_geocode(
-                request.latitude,
-                request.longitude,
-                language=request.language,
-                result_type=request.result_type,
+    async def _reverse_geocode(
+        self, request: ReverseGeocodingRequest
+    ) -> List[GeocodingResultResponse]:
+        providers = self._provider_order(request)
+        key = _reverse_key(request.language, request.result_type)
+        point = _reverse_point(request)
+        cache_key = f"reverse:{_reverse_cache_cell(point)}"
+        variant = geocoding_cache.variant(request.language, request.result_type)
+        use_cache = geocoding_settings.reverse_cache_enabled
+
+        # Ответ для точки рядом: память воркера и Redis, затем таблица
+        # geocoding_results
+        if use_cache:
+            cached_results = await geocoding_cache.get(cache_key, providers, variant)
+            if cached_results is not None:
+                return cached_results
+            cached_results = await self._get_nearby_results(
+                key, request.latitude, request.longitude, providers
             )
+            geocoding_cache.record_db(cached_results is not None)
+            if cached_results:
+                await geocoding_cache.set(cache_key, providers, variant, cached_results)
+                return cached_results
 
-            # Сохраняем результаты в БД
-            results = []
-            for raw_result in raw_results:
-                result = await self._save_geocoding_result(
-                    query=f"{request.latitude},{request.longitude}",
-                    provider=request.provider,
-                    raw_result=raw_result,
-                )
-                results.append(GeocodingResultResponse.model_validate(result))
+        query = f"{request.latitude},{request.longitude}"
+        try:
+            raw_results = await geocoding_provider_router.execute(
+                providers,
+                lambda name: self.providers[name].reverse_geocode(
+                    request.latitude,
+                    request.longitude,
+                    language=request.language,
+                    result_type=request.result_type,
+                ),
+            )
 
+            # Сохраняем результаты в БД одним INSERT
+            results = await self._persist_results(
+                [
+                    _result_row(query, raw_result["provider"], raw_result, key, point)
+                    for raw_result in raw_results
+                ]
+            )
+            if use_cache:
+                await geocoding_cache.set(cache_key, providers, variant, results)
             return results
 
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"Reverse geocoding error: {e}")
-            await self._save_error_result(
-                f"{request.latitude},{request.longitude}", request.provider, str(e)
+            await self._persist_results(
+                [_error_row(query, providers[0], str(e), key, point)]
             )
+            if use_cache:
+                await geocoding_cache.set_error(cache_key, providers, variant)
             return []
 
     async def _get_cached_results(
-        self, query: str, provider: str
+        self, key: str, providers: List[str]
     ) -> Optional[List[GeocodingResultResponse]]:
-        """Получение кэшированных результатов"""
-        stmt = select(GeocodingResult).where(
-            and_(
-                GeocodingResult.query == query,
-                GeocodingResult.provider == provider,
-                GeocodingResult.is_successful == True,
-                GeocodingResult.expires_at > datetime.now(timezone.utc),
+        """
+        Кэшированные в БД результаты (по query_hash) первого по порядку
+        провайдера, у которого они есть. Результаты, которые еще ждут
+        отложенной записи, тоже считаются.
+        """
+        cached_results = _pending_results(key, providers)
+        if not cached_results:
+            stmt = select(GeocodingResult).where(
+                and_(
+                    GeocodingResult.query_hash == key,
+                    GeocodingResult.provider.in_(providers),
+                    GeocodingResult.is_successful == True,
+                    GeocodingResult.expires_at > datetime.now(timezone.utc),
+                )
             )
-        )
 
-        result = await self.db_session.execute(stmt)
-        cached_results = result.scalars().all()
+            result = await self.db_session.execute(stmt)
+            cached_results = [
+                GeocodingResultResponse.model_validate(r)
+                for r in result.scalars().all()
+            ]
 
-        if cached_results:
-            return [GeocodingResultResponse.model_validate(r) for r in cached_results]
+        for provider in providers:
+            provider_results = [r for r in cached_results if r.provider == provider]
+            if provider_results:
+                return provider_results
 
         return None
 
-    async def _save_geocoding_result(
-        self, query: str, provider: str, raw_result: Dict[str, Any]
-    ) -> GeocodingResult:
-        """Сохранение результата геокодирования в БД"""
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=geocoding_settings.cache_ttl)
-
-        result = GeocodingResult(
-            query=query,
-            latitude=raw_result.get("latitude"),
-            longitude=raw_result.get("longitude"),
-            formatted_address=raw_result.get("formatted_address"),
-            country=raw_result.get("country"),
-            region=raw_result.get("region"),
-            city=raw_result.get("city"),
-            street=raw_result.get("street"),
-            house_number=raw_result.get("house_number"),
-            postal_code=raw_result.get("postal_code"),
-            place_id=raw_result.get("place_id"),
-            place_type=raw_result.get("place_type"),
-            accuracy=raw_result.get("accuracy"),
-            confidence=raw_result.get("confidence"),
-            provider=provider,
-            external_id=raw_result.get("external_id"),
-            raw_response=raw_result.get("raw_response"),
-            is_successful=True,
-            expires_at=expires_at,
+    async def _get_nearby_results(
+        self, key: str, latitude: float, longitude: float, providers: List[str]
+    ) -> Optional[List[GeocodingResultResponse]]:
+        """
+        Сохраненный ответ обратного геокодирования с тем же языком и типом
+        результата (key) для ближайшей точки не дальше
+        GEOCODING_REVERSE_CACHE_DISTANCE метров — первого по порядку
+        провайдера, у которого он есть. Кандидаты ищутся по префиксу полного
+        geohash точки в ее ячейке и соседних, чтобы не терять точки у границы.
+        """
+        cells = geohash.neighbors(
+            geohash.encode(
+                latitude, longitude, geocoding_settings.reverse_geohash_precision
+            )
         )
-
-        self.db_session.add(result)
-        await self.db_session.commit()
-        await self.db_session.refresh(result)
-
-        return result
-
-    async def _save_error_result(
-        self, query: str, provider: str, error_message: str
-    ) -> None:
-        """Сохранение ошибки геокодирования в БД"""
-        result = GeocodingResult(
-            query=query,
-            provider=provider,
-            is_successful=False,
-            error_message=error_message,
+        stmt = (
+            select(GeocodingResult)
+            .where(
+                and_(
+                    GeocodingResult.query_hash == key,
+                    or_(*(GeocodingResult.geohash.like(f"{cell}%") for cell in cells)),
+                    GeocodingResult.provider.in_(providers),
+                    GeocodingResult.is_successful == True,
+                    GeocodingResult.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            .order_by(GeocodingResult.id)
         )
+        result = await self.db_session.execute(stmt)
+        rows = result.scalars().all()
+
+        distances: Dict[str, float] = {}
+        for row in rows:
+            if row.geohash not in distances:
+                distances[row.geohash] = geohash.distance_m(
+                    latitude, longitude, *geohash.decode(row.geohash)
+                )
+
+        for provider in providers:
+            points = {
+                row.geohash
+                for row in rows
+                if row.provider == provider
+                and distances[row.geohash] <= geocoding_settings.reverse_cache_distance
+            }
+            if not points:
+                continue
+            # Ответ ближайшей точки целиком, в исходном порядке результатов
+            nearest = min(points, key=distances.__getitem__)
+            return [
+                GeocodingResultResponse.model_validate(row)
+                for row in rows
+                if row.provider == provider and row.geohash == nearest
+            ]
+
+        return None
 
-        self.db_session.add(result)
+    async def _get_cached_batch(
+        self, keys: List[str], providers: List[str]
+    ) -> Dict[str, List[GeocodingResultResponse]]:
+        """
+        Кэшированные результаты для нескольких адресов (по query_hash) одним
+        запросом; для каждого адреса — первого по порядку провайдера, у
+        которого они есть
+        """
+        by_key: Dict[str, Dict[str, List[GeocodingResultResponse]]] = {}
+
+        def add(key: str, result: GeocodingResultResponse) -> None:
+            by_key.setdefault(key, {}).setdefault(result.provider, []).append(result)
+
+        lookup = []
+        for key in keys:
+            pending = _pending_results(key, providers)
+            for result in pending:
+                add(key, result)
+            if not pending:
+                lookup.append(key)
+
+        if lookup:
+            stmt = select(GeocodingResult).where(
+                and_(
+                    GeocodingResult.query_hash.in_(lookup),
+                    GeocodingResult.provider.in_(providers),
+                    GeocodingResult.is_successful == True,
+                    GeocodingResult.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            result = await self.db_session.execute(stmt)
+            for row in result.scalars().all():
+                add(row.query_hash, GeocodingResultResponse.model_validate(row))
+
+        cached = {}
+        for key, by_provider in by_key.items():
+            provider = next(p for p in providers if p in by_provider)
+            cached[key] = by_provider[provider]
+        return cached
+
+    async def _persist_results(
+        self, rows: List[Dict[str, Any]]
+    ) -> List[GeocodingResultResponse]:
+        """
+        Сохранить строки geocoding_results одним INSERT. При
+        GEOCODING_DEFERRED_WRITES строки уходят в фоновую запись, и ответ
+        строится сразу, без id.
+        """
+        if geocoding_result_writer.submit(rows):
+            return [GeocodingResultResponse.model_validate(row) for row in rows]
+        return [
+            GeocodingResultResponse.model_validate(result)
+            for result in await self._insert_results(rows)
+        ]
+
+    async def _insert_results(
+        self, rows: List[Dict[str, Any]]
+    ) -> List[GeocodingResult]:
+        """Сохранение нескольких строк geocoding_results одним INSERT ... RETURNING"""
+        if not rows:
+            return []
+        result = await self.db_session.scalars(
+            insert(GeocodingResult).returning(
+                GeocodingResult, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        saved = list(result.all())
         await self.db_session.commit()
+        return saved
@@ -0,0 +1,140 @@
+import asyncio
+import contextlib
+from datetime import datetime, timezone
+from typing import List, Optional, Set
+from uuid import uuid4
+
+from src.backoffice.apps.location.schemas.geocoding import (
+    GeocodingBatchItem, GeocodingBatchJobResponse, GeocodingBatchJobStatus,
+    GeocodingBatchRequest, GeocodingBatchResponse)
+from src.backoffice.apps.location.services.geocoder_service import \
+    GeocoderService
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.dependencies import AsyncSessionLocal
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.redis_client import redis_client
+
+logger = get_logger("geocoding.batch")
+
+
+class GeocodingBatchJobs:
+    """
+    Фоновые задания пакетного геокодирования для больших пакетов.
+
+    Задание выполняется в воркере, который его принял, порциями по
+    GEOCODING_BATCH_JOB_CHUNK_SIZE адресов, каждая — в своей сессии БД.
+    Состояние и результат хранятся в Redis, поэтому статус можно запросить
+    у любого воркера. Задание доступно только создавшему его пользователю.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _key(self, user_id: int, job_id: str) -> str:
+        return f"{geocoding_settings.batch_job_key_prefix}{user_id}:{job_id}"
+
+    async def submit(
+        self, request: GeocodingBatchRequest, user_id: int
+    ) -> GeocodingBatchJobResponse:
+        """Создать задание пользователя и запустить его в фоне"""
+        if len(request.queries) > geocoding_settings.batch_job_max_size:
+            raise ValueError(
+                f"Batch job size exceeds {geocoding_settings.batch_job_max_size} queries"
+            )
+        job = GeocodingBatchJobResponse(
+            job_id=uuid4().hex,
+            status=GeocodingBatchJobStatus.PENDING,
+            total=len(request.queries),
+            created_at=datetime.now(timezone.utc),
+        )
+        await self._save(user_id, job)
+
+        task = asyncio.create_task(self._run(user_id, job, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(
+            "geocoding_batch_job_submitted",
+            extra={"job_id": job.job_id, "user_id": user_id, "total": job.total},
+        )
+        return job
+
+    async def get(
+        self, job_id: str, user_id: int
+    ) -> Optional[GeocodingBatchJobResponse]:
+        """Задание пользователя; None — не найдено или принадлежит другому"""
+        data = await redis_client.client.get(self._key(user_id, job_id))
+        if data is None:
+            return None
+        return GeocodingBatchJobResponse.model_validate_json(data)
+
+    async def stop(self) -> None:
+        """Отменить выполняющиеся задания (при остановке приложения)"""
+        for task in list(self._tasks):
+            task.cancel()
+        for task in list(self._tasks):
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _save(self, user_id: int, job: GeocodingBatchJobResponse) -> None:
+        await redis_client.client.set(
+            self._key(user_id, job.job_id),
+            job.model_dump_json(),
+            ex=geocoding_settings.batch_job_ttl,
+        )
+
+    async def _run(
+        self,
+        user_id: int,
+        job: GeocodingBatchJobResponse,
+        request: GeocodingBatchRequest,
+    ) -> None:
+        chunk_size = min(
+            geocoding_settings.batch_job_chunk_size, geocoding_settings.batch_max_size
+        )
+        items: List[GeocodingBatchItem] = []
+        try:
+            job.status = GeocodingBatchJobStatus.RUNNING
+            await self._save(user_id, job)
+            for start in range(0, len(request.queries), chunk_size):
+                chunk = request.model_copy(
+                    update={"queries": request.queries[start : start + chunk_size]}
+                )
+                async with AsyncSessionLocal() as session:
+                    response = await GeocoderService(session).geocode_batch(chunk)
+                items.extend(response.items)
+                job.processed = len(items)
+                await self._save(user_id, job)
+
+            job.result = GeocodingBatchResponse(
+                items=items,
+                total=len(items),
+                cached=sum(item.cached for item in items),
+                failed=sum(item.error is not None for item in items),
+            )
+            job.status = GeocodingBatchJobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.status = GeocodingBatchJobStatus.FAILED
+            job.error = "Job was cancelled"
+            raise
+        except Exception as e:
+            logger.error(
+                "geocoding_batch_job_failed",
+                extra={"job_id": job.job_id, "error": str(e)},
+            )
+            job.status = GeocodingBatchJobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            with contextlib.suppress(Exception):
+                await self._save(user_id, job)
+            logger.info(
+                "geocoding_batch_job_finished",
+                extra={
+                    "job_id": job.job_id,
+                    "status": job.status.value,
+                    "processed": job.processed,
+                },
+            )
+
+
+geocoding_batch_jobs = GeocodingBatchJobs()
@@ -0,0 +1,124 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+from pydantic import TypeAdapter
+
+from src.backoffice.apps.location.schemas.geocoding import \
+    GeocodingResultResponse
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.services.tiered_cache import TieredCache
+
+_results_adapter = TypeAdapter(List[GeocodingResultResponse])
+
+
+def _ttl_until(results: List[GeocodingResultResponse]) -> Optional[int]:
+    """Секунды до самого раннего expires_at; None — срок не задан"""
+    # Колонка expires_at без часового пояса: значения из БД — naive UTC
+    expires = [
+        result.expires_at.replace(tzinfo=result.expires_at.tzinfo or timezone.utc)
+        for result in results
+        if result.expires_at is not None
+    ]
+    if not expires:
+        return None
+    return int((min(expires) - datetime.now(timezone.utc)).total_seconds())
+
+
+class GeocodingCache:
+    """
+    Кэш ответов геокодирования перед таблицей geocoding_results: LRU в памяти
+    воркера, затем Redis. Ключ — query_hash, порядок провайдеров и параметры
+    запроса, влияющие на ответ провайдера (язык, регион, границы, компоненты).
+
+    Пустые ответы хранятся GEOCODING_RESPONSE_CACHE_NEGATIVE_TTL секунд,
+    ошибки провайдеров — GEOCODING_RESPONSE_CACHE_ERROR_TTL, чтобы повторные
+    запросы (например, автодополнение) не доходили ни до БД, ни до провайдера.
+    """
+
+    def __init__(self) -> None:
+        self._cache = (
+            TieredCache(
+                "results",
+                local_ttl=geocoding_settings.response_cache_local_ttl,
+                local_max_size=geocoding_settings.response_cache_local_max_size,
+                redis_ttl=(
+                    geocoding_settings.response_cache_redis_ttl
+                    if geocoding_settings.response_cache_redis
+                    else None
+                ),
+                redis_prefix=geocoding_settings.response_cache_key_prefix,
+            )
+            if geocoding_settings.response_cache_enabled
+            else None
+        )
+        self._db_stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def variant(*options: Optional[str]) -> str:
+        """Короткий хэш параметров запроса для ключа кэша"""
+        raw = "\x1f".join("" if option is None else option for option in options)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _key(key: str, providers: Sequence[str], variant: str) -> str:
+        return f"{key}:{','.join(providers)}:{variant}"
+
+    async def get(
+        self, key: str, providers: Sequence[str], variant: str
+    ) -> Optional[List[GeocodingResultResponse]]:
+        """Результаты из кэша; [] — отрицательная запись, None — промах"""
+        if self._cache is None:
+            return None
+        value = await self._cache.get(self._key(key, providers, variant))
+        if value is None:
+            return None
+        return _results_adapter.validate_json(value)
+
+    async def set(
+        self,
+        key: str,
+        providers: Sequence[str],
+        variant: str,
+        results: List[GeocodingResultResponse],
+    ) -> None:
+        """
+        Сохранить результаты. Запись живет не дольше самого раннего
+        expires_at результатов, чтобы кэш не пережил строки geocoding_results.
+        """
+        if self._cache is None:
+            return
+        if not results:
+            ttl = geocoding_settings.response_cache_negative_ttl
+        else:
+            ttl = _ttl_until(results)
+            if ttl is not None and ttl <= 0:
+                return
+        await self._cache.set(
+            self._key(key, providers, variant),
+            _results_adapter.dump_json(results),
+            ttl,
+        )
+
+    async def set_error(self, key: str, providers: Sequence[str], variant: str) -> None:
+        """Запомнить ошибку провайдеров как пустой ответ на короткое время"""
+        if self._cache is None:
+            return
+        await self._cache.set(
+            self._key(key, providers, variant),
+            _results_adapter.dump_json([]),
+            geocoding_settings.response_cache_error_ttl,
+        )
+
+    def record_db(self, hit: bool) -> None:
+        """Учесть обращение к таблице geocoding_results после промаха кэша"""
+        self._db_stats["hits" if hit else "misses"] += 1
+
+    def stats(self) -> dict:
+        """Попадания и промахи по уровням: память, Redis, Postgres"""
+        stats = self._cache.stats() if self._cache is not None else {}
+        stats["postgres"] = dict(self._db_stats)
+        return {"enabled": self._cache is not None, "tiers": stats}
+
+
+geocoding_cache = GeocodingCache()
@@ -0,0 +1,62 @@
+import hashlib
+import re
+import unicodedata
+from typing import Optional
+
+# Слова адреса: десятичные числа (координаты) или слова, в том числе через дефис
+_TOKEN_RE = re.compile(r"\d+(?:\.\d+)+|\w+(?:-\w+)*")
+
+# Распространенные сокращения приводятся к одной форме
+_ABBREVIATIONS = {
+    "улица": "ул",
+    "проспект": "пр-т",
+    "просп": "пр-т",
+    "пр-кт": "пр-т",
+    "пр": "пр-т",
+    "переулок": "пер",
+    "площадь": "пл",
+    "шоссе": "ш",
+    "набережная": "наб",
+    "бульвар": "б-р",
+    "бул": "б-р",
+    "проезд": "пр-д",
+    "дом": "д",
+    "корпус": "к",
+    "корп": "к",
+    "строение": "стр",
+    "город": "г",
+    "область": "обл",
+    "район": "р-н",
+    "street": "st",
+    "avenue": "ave",
+    "road": "rd",
+    "boulevard": "blvd",
+}
+
+
+def normalize_query(query: str) -> str:
+    """
+    Нормализованный адрес для ключей кэша: регистр, ё/е, пунктуация,
+    пробелы и сокращения не влияют на результат.
+
+    "ул. Ленина, 1" и "Улица  Ленина 1" дают "ул ленина 1".
+    """
+    text = unicodedata.normalize("NFKC", query).casefold().replace("ё", "е")
+    return " ".join(
+        _ABBREVIATIONS.get(token, token) for token in _TOKEN_RE.findall(text)
+    )
+
+
+def query_hash(query: str, *options: Optional[str]) -> str:
+    """
+    sha256 нормализованного адреса и параметров запроса, влияющих на ответ
+    провайдера (язык, регион, границы, компоненты), в hex — ключ кэша
+    geocoding_results
+    """
+    raw = "\x1f".join(
+        [
+            normalize_query(query),
+            *("" if option is None else option for option in options),
+        ]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,89 @@
+from typing import Dict, Optional
+
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.services.rate_limiter import (InMemoryTokenBucket,
+                                                       RateLimitExceeded,
+                                                       RedisTokenBucket,
+                                                       TokenBucket)
+
+# Общий лимит GEOCODING_RATE_LIMIT / GEOCODING_RATE_PERIOD на все провайдеры
+ALL_PROVIDERS = "all"
+
+
+def _create_bucket(name: str, requests: int, period: int, burst: int) -> TokenBucket:
+    rate = requests / period
+    if geocoding_settings.rate_limit_backend == "redis":
+        return RedisTokenBucket(
+            name, rate, burst, key=f"{geocoding_settings.rate_limit_key_prefix}{name}"
+        )
+    return InMemoryTokenBucket(name, rate, burst)
+
+
+class GeocodingRateLimiters:
+    """
+    Лимиты запросов к провайдерам геокодирования по rate_limit/rate_period
+    из настроек провайдера плюс общий лимит GEOCODING_RATE_LIMIT.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, provider: str) -> Optional[TokenBucket]:
+        bucket = self._buckets.get(provider)
+        if bucket is not None:
+            return bucket
+
+        if provider == ALL_PROVIDERS:
+            requests = geocoding_settings.rate_limit_requests
+            bucket = _create_bucket(
+                provider, requests, geocoding_settings.rate_limit_period, requests
+            )
+        else:
+            config = geocoding_settings.get_provider_config(provider)
+            if not config or not config.get("rate_limit"):
+                return None
+            bucket = _create_bucket(
+                provider,
+                config["rate_limit"],
+                config.get("rate_period", 1),
+                config.get("burst", 1),
+            )
+        self._buckets[provider] = bucket
+        return bucket
+
+    async def acquire(self, provider: str) -> None:
+        """
+        Дождаться разрешения на запрос к провайдеру; RateLimitExceeded, если
+        ждать пришлось бы дольше GEOCODING_RATE_LIMIT_MAX_WAIT.
+
+        Сначала проверяется общий лимит: отказ по нему не тратит лимит
+        провайдера. Если отказал лимит провайдера, токен общего лимита
+        возвращается.
+        """
+        max_wait = geocoding_settings.rate_limit_max_wait
+        total = self._bucket(ALL_PROVIDERS)
+        await total.acquire(max_wait)
+
+        bucket = self._bucket(provider)
+        if bucket is None:
+            return
+        try:
+            await bucket.acquire(max_wait)
+        except RateLimitExceeded:
+            await total.release()
+            raise
+
+    async def status(self, provider: str) -> Optional[dict]:
+        """Параметры лимита провайдера и оставшийся запас запросов"""
+        bucket = self._bucket(provider)
+        if bucket is None:
+            return None
+        return {
+            "backend": geocoding_settings.rate_limit_backend,
+            "requests_per_second": bucket.rate,
+            "burst": bucket.capacity,
+            "remaining": max(0.0, await bucket.remaining()),
+        }
+
+
+geocoding_rate_limiters = GeocodingRateLimiters()
@@ -0,0 +1,246 @@
+import asyncio
+import time
+from collections import deque
+from typing import (Any, Awaitable, Callable, Deque, Dict, List, Optional,
+                    Sequence)
+
+from src.backoffice.apps.location.services.geocoding_rate_limiter import \
+    geocoding_rate_limiters
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.circuit_breaker import CircuitBreaker
+from src.backoffice.core.services.geohash import distance_m
+from src.backoffice.core.services.rate_limiter import RateLimitExceeded
+
+logger = get_logger("geocoding.routing")
+
+# Вызов провайдера по имени; возвращает сырые результаты провайдера
+ProviderCall = Callable[[str], Awaitable[List[Dict[str, Any]]]]
+
+
+class GeocodingUnavailable(Exception):
+    """Ни один провайдер не ответил"""
+
+    def __init__(self, errors: Dict[str, str]) -> None:
+        super().__init__(
+            "; ".join(f"{provider}: {error}" for provider, error in errors.items())
+            or "No geocoding providers available"
+        )
+        self.errors = errors
+
+
+class LatencyWindow:
+    """Задержки последних ответов провайдера для оценки квантиля"""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self._samples) < 20:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _distance_m(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    return distance_m(a["latitude"], a["longitude"], b["latitude"], b["longitude"])
+
+
+def merge_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Убрать дубликаты: из результатов ближе GEOCODING_MERGE_DISTANCE метров
+    друг к другу остается самый уверенный.
+    """
+    ranked = sorted(results, key=lambda item: item.get("confidence") or 0, reverse=True)
+    merged: List[Dict[str, Any]] = []
+    for item in ranked:
+        if item.get("latitude") is None or item.get("longitude") is None:
+            continue
+        distance = geocoding_settings.merge_distance
+        if all(_distance_m(item, kept) > distance for kept in merged):
+            merged.append(item)
+    return merged
+
+
+class GeocodingProviderRouter:
+    """
+    Выбор провайдеров для запроса: перебор по порядку при отказах, hedged-
+    запросы к следующему провайдеру при медленном ответе, circuit breaker на
+    каждый провайдер и объединение ответов нескольких провайдеров.
+
+    Состояние (breaker'ы, задержки) общее для всех запросов процесса.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyWindow] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                f"geocoding.{provider}",
+                geocoding_settings.breaker_failures,
+                geocoding_settings.breaker_reset_timeout,
+            )
+            self._breakers[provider] = breaker
+        return breaker
+
+    def provider_order(
+        self, available: Sequence[str], preferred: Optional[str] = None
+    ) -> List[str]:
+        """Провайдеры в порядке GEOCODING_PROVIDER_ORDER, preferred — первым"""
+        order = [preferred] if preferred else []
+        order += [p for p in geocoding_settings.provider_order if p not in order]
+        order += [p for p in available if p not in order]
+        return [p for p in order if p in available]
+
+    async def execute(
+        self, providers: Sequence[str], call: ProviderCall
+    ) -> List[Dict[str, Any]]:
+        """
+        Выполнить запрос по стратегии GEOCODING_STRATEGY. Каждый результат
+        помечается ключом "provider". Если ни один провайдер не ответил —
+        RateLimitExceeded (все уперлись в лимит) или GeocodingUnavailable.
+        """
+        errors: Dict[str, BaseException] = {}
+        if geocoding_settings.strategy == "merge":
+            results = await self._merge(providers, call, errors)
+        else:
+            results = None
+            pending = list(providers)
+            while pending and results is None:
+                results = await self._failover_step(pending, call, errors)
+        if results is not None:
+            return results
+
+        if errors and all(isinstance(e, RateLimitExceeded) for e in errors.values()):
+            raise min(errors.values(), key=lambda e: e.retry_after)
+        raise GeocodingUnavailable(
+            {provider: str(error) for provider, error in errors.items()}
+        )
+
+    async def _merge(
+        self,
+        providers: Sequence[str],
+        call: ProviderCall,
+        errors: Dict[str, BaseException],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Спросить всех провайдеров сразу и объединить ответы"""
+        outcomes = await asyncio.gather(
+            *(self._call(provider, call) for provider in providers),
+            return_exceptions=True,
+        )
+        results: List[Dict[str, Any]] = []
+        answered = False
+        for provider, outcome in zip(providers, outcomes):
+            if isinstance(outcome, Exception):
+                errors[provider] = outcome
+            else:
+                answered = True
+                results.extend(outcome)
+        return merge_results(results) if answered else None
+
+    async def _failover_step(
+        self,
+        pending: List[str],
+        call: ProviderCall,
+        errors: Dict[str, BaseException],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Спросить первого провайдера из pending, а при hedging и медленном
+        ответе — еще и следующего. Вернуть первый успешный ответ или None,
+        если опрошенные провайдеры отказали.
+        """
+        primary = pending.pop(0)
+        tasks = {asyncio.create_task(self._call(primary, call)): primary}
+
+        delay = self._hedge_delay(primary)
+        if delay is not None and pending:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                secondary = pending.pop(0)
+                logger.info(
+                    "geocoding_hedge_started",
+                    extra={"provider": primary, "hedge": secondary, "delay": delay},
+                )
+                tasks[asyncio.create_task(self._call(secondary, call))] = secondary
+
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    errors[provider] = error
+        finally:
+            for task in tasks:
+                if task.done():
+                    # Ошибка проигравшего запроса уже не нужна
+                    task.cancelled() or task.exception()
+                else:
+                    task.cancel()
+        return None
+
+    def _hedge_delay(self, provider: str) -> Optional[float]:
+        if not geocoding_settings.hedge_enabled:
+            return None
+        latency = self._latency.get(provider)
+        quantile = (
+            latency.quantile(geocoding_settings.hedge_quantile) if latency else None
+        )
+        if quantile is None:
+            return geocoding_settings.hedge_max_delay
+        return min(
+            geocoding_settings.hedge_max_delay,
+            max(geocoding_settings.hedge_min_delay, quantile),
+        )
+
+    async def _call(self, provider: str, call: ProviderCall) -> List[Dict[str, Any]]:
+        breaker = self.breaker(provider)
+        if not breaker.allow():
+            raise GeocodingUnavailable({provider: "circuit open"})
+        try:
+            await geocoding_rate_limiters.acquire(provider)
+        except BaseException:
+            breaker.release()
+            raise
+
+        started_at = time.perf_counter()
+        try:
+            results = await call(provider)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            logger.warning(
+                "geocoding_provider_failed",
+                extra={"provider": provider, "error": str(e)},
+            )
+            raise
+        breaker.record_success()
+        self._latency.setdefault(provider, LatencyWindow()).add(
+            time.perf_counter() - started_at
+        )
+        for result in results:
+            result["provider"] = provider
+        return results
+
+    def status(self, provider: str) -> dict:
+        breaker = self.breaker(provider)
+        latency = self._latency.get(provider)
+        p95 = latency.quantile(0.95) if latency else None
+        return {
+            "circuit": breaker.state.value,
+            "consecutive_failures": breaker.failures,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+geocoding_provider_router = GeocodingProviderRouter()
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("geocoding.transport")
+
+
+class GeocodingTransport:
+    """
+    HTTP-транспорт провайдера геокодирования: одна aiohttp-сессия с пулом
+    keep-alive соединений и кэшем DNS на все время жизни приложения.
+
+    Число одновременных запросов к провайдеру ограничено max_connections:
+    остальные ждут свободного соединения в очереди коннектора.
+    """
+
+    def __init__(self, provider: str, timeout: float, max_connections: int) -> None:
+        self.provider = provider
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Сессия привязана к event loop, поэтому создается при первом запросе
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                ttl_dns_cache=geocoding_settings.dns_cache_ttl,
+                keepalive_timeout=geocoding_settings.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            logger.info(
+                "geocoding_session_created",
+                extra={
+                    "provider": self.provider,
+                    "max_connections": self.max_connections,
+                },
+            )
+        return self._session
+
+    async def get_json(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Any]:
+        """GET-запрос; возвращает статус и JSON (None, если статус не 200)"""
+        async with self.session.get(url, headers=headers) as response:
+            if response.status != 200:
+                # Дочитываем тело, чтобы соединение вернулось в пул
+                await response.read()
+                return response.status, None
+            return response.status, await response.json(content_type=None)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class GeocodingTransports:
+    """Транспорты провайдеров геокодирования, по одному на провайдера"""
+
+    def __init__(self) -> None:
+        self._transports: Dict[str, GeocodingTransport] = {}
+
+    def get(self, provider: str) -> GeocodingTransport:
+        transport = self._transports.get(provider)
+        if transport is None:
+            config = geocoding_settings.get_provider_config(provider) or {}
+            transport = GeocodingTransport(
+                provider,
+                timeout=config.get("timeout", geocoding_settings.timeout),
+                max_connections=config.get(
+                    "max_connections", geocoding_settings.max_connections
+                ),
+            )
+            self._transports[provider] = transport
+        return transport
+
+    async def close(self) -> None:
+        transports, self._transports = self._transports, {}
+        await asyncio.gather(*(transport.close() for transport in transports.values()))
+        if transports:
+            logger.info(
+                "geocoding_sessions_closed", extra={"providers": sorted(transports)}
+            )
+
+
+geocoding_transports = GeocodingTransports()
@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import insert
+
+from src.backoffice.apps.location.models import GeocodingResult
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.dependencies import AsyncSessionLocal
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("geocoding.writer")
+
+Row = Dict[str, Any]
+
+
+class GeocodingResultWriter:
+    """
+    Отложенная запись результатов геокодирования (GEOCODING_DEFERRED_WRITES).
+
+    Сервис ставит строки geocoding_results в очередь и сразу отвечает
+    клиенту; фоновая задача собирает строки нескольких запросов и пишет их
+    одним INSERT раз в GEOCODING_WRITE_FLUSH_INTERVAL секунд, не больше
+    GEOCODING_WRITE_BATCH_SIZE строк за раз.
+
+    Пока строки не записаны, они доступны через pending(), чтобы повторный
+    запрос не промахнулся мимо кэша из-за задержки записи.
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, List[Row]] = {}
+
+    def start(self) -> None:
+        if self._task is None and geocoding_settings.deferred_writes:
+            self._queue = asyncio.Queue(maxsize=geocoding_settings.write_queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить запись, дописав все, что осталось в очереди"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        # None в очереди — сигнал остановки после записи предыдущих строк
+        await self._queue.put(None)
+        await task
+        self._queue = None
+
+    def submit(self, rows: List[Row]) -> bool:
+        """
+        Поставить строки в очередь записи. False — запись выключена или
+        очередь переполнена, и вызывающий должен записать строки сам.
+        """
+        if self._task is None or self._queue.full():
+            return False
+        self._queue.put_nowait(rows)
+        for row in rows:
+            if row["is_successful"]:
+                self._pending.setdefault(row["query_hash"], []).append(row)
+        return True
+
+    def pending(self, key: str, providers: Sequence[str]) -> List[Row]:
+        """Успешные строки по query_hash, которые еще ждут записи"""
+        return [
+            row for row in self._pending.get(key, ()) if row["provider"] in providers
+        ]
+
+    async def _run(self) -> None:
+        batch_size = geocoding_settings.write_batch_size
+        stopping = False
+        while not stopping:
+            rows = await self._queue.get()
+            if rows is None:
+                return
+            rows = list(rows)
+            # Ждем, пока накопятся строки других запросов
+            await asyncio.sleep(geocoding_settings.write_flush_interval)
+            while len(rows) < batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                rows.extend(item)
+            await self._flush(rows)
+
+    async def _flush(self, rows: List[Row]) -> None:
+        if not rows:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(GeocodingResult), rows)
+                await session.commit()
+            logger.debug("geocoding_results_written", extra={"rows": len(rows)})
+        except Exception as e:
+            # Это только кэш: потерянные строки будут получены у провайдера заново
+            logger.error(
+                "geocoding_results_write_failed",
+                extra={"rows": len(rows), "error": str(e)},
+            )
+        finally:
+            for row in rows:
+                pending = self._pending.get(row["query_hash"])
+                if pending is None:
+                    continue
+                with contextlib.suppress(ValueError):
+                    pending.remove(row)
+                if not pending:
+                    del self._pending[row["query_hash"]]
+
+
+geocoding_result_writer = GeocodingResultWriter()
@@ -21,9 +21,15 @@ from src.backoffice.apps.location.schemas import (AddressCreate,
                                                   StreetResponse)
 from src.backoffice.apps.location.services.geocoder_service import \
     GeocoderService
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services import SearchIndexer
+from src.backoffice.core.services.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
+# Тег кэша ответов всех GET-эндпоинтов локаций
+LOCATIONS_CACHE_TAG = "locations"
+
 
 class LocationService:
     """Сервис для работы с географическими данными"""
@@ -39,6 +45,7 @@ class LocationService:
         country = Country(**country_data.model_dump())
         self.db_session.add(country)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(country)
         return CountryResponse.model_validate(country)
 
@@ -119,6 +126,7 @@ class LocationService:
             setattr(country, field, value)
 
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(country)
         return CountryResponse.model_validate(country)
 
@@ -133,6 +141,7 @@ class LocationService:
 
         await self.db_session.delete(country)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         return True
 
     # ==================== REGIONS ====================
@@ -142,6 +151,7 @@ class LocationService:
         region = Region(**region_data.model_dump())
         self.db_session.add(region)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(region)
         return RegionResponse.model_validate(region)
 
@@ -209,7 +219,9 @@ class LocationService:
         city = City(**city_data.model_dump())
         self.db_session.add(city)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(city)
+        await SearchIndexer(self.db_session).index(SearchEntity.CITY, [city])
         return CityResponse.model_validate(city)
 
     async def get_city(self, city_id: int) -> Optional[CityResponse]:
@@ -317,7 +329,9 @@ class LocationService:
         street = Street(**street_data.model_dump())
         self.db_session.add(street)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(street)
+        await SearchIndexer(self.db_session).index(SearchEntity.STREET, [street])
         return StreetResponse.model_validate(street)
 
     async def get_street(self, street_id: int) -> Optional[StreetResponse]:
@@ -384,6 +398,7 @@ class LocationService:
         address = Address(**address_data.model_dump())
         self.db_session.add(address)
         await self.db_session.commit()
+        await response_cache.invalidate_tags(LOCATIONS_CACHE_TAG)
         await self.db_session.refresh(address)
         return AddressResponse.model_validate(address)
 
@@ -1,9 +1,11 @@
+from .branch_menu_snapshot import BranchMenuSnapshot
 from .category import Category
 from .company_branch_menu import CompanyBranchMenu
 from .menu_image import MenuImage
 from .menu_item import MenuItem
 
 __all__ = (
+    "BranchMenuSnapshot",
     "Category",
     "CompanyBranchMenu",
     "MenuImage",
@@ -0,0 +1,27 @@
+from sqlalchemy import ForeignKey, Integer, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.backoffice.models import Base, CreatedUpdatedMixin, IdMixin
+
+
+class BranchMenuSnapshot(Base, IdMixin, CreatedUpdatedMixin):
+    """Предсобранное меню филиала в виде готового JSON"""
+
+    __tablename__ = "branch_menu_snapshots"
+    __repr_fields__ = ("company_branch_id", "etag")
+
+    company_branch_id: Mapped[int] = mapped_column(
+        ForeignKey("company_branches.id", ondelete="CASCADE"),
+        unique=True,
+        index=True,
+        nullable=False,
+    )
+    # Сериализованный BranchMenuSnapshotResponse; NULL — снимок сброшен
+    payload: Mapped[str] = mapped_column(Text, nullable=True)
+    # sha256 от payload без built_at, отдается клиенту как ETag
+    etag: Mapped[str] = mapped_column(String(64), nullable=True)
+    # Растет при каждом сбросе; пересборка сохраняется, только если поколение
+    # не изменилось с начала сборки
+    generation: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backoffice.models import Base, IdMixin
@@ -23,6 +23,19 @@ class Category(IdMixin, Base):
         back_populates="parent", cascade="all, delete-orphan", single_parent=True
     )
 
-    __table_args__ = (Index("ix_categories_parent_id_slug", "parent_id", "slug"),)
+    # Материализованный путь от корня в формате "1.5.12." (включая свой id),
+    # поддерживается CategoryService при создании, переносе и удалении
+    path: Mapped[str] = mapped_column(String(1024), nullable=False, default="")
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_categories_parent_id_slug", "parent_id", "slug"),
+        # varchar_pattern_ops позволяет использовать индекс для LIKE 'prefix%'
+        Index(
+            "ix_categories_path",
+            "path",
+            postgresql_ops={"path": "varchar_pattern_ops"},
+        ),
+    )
 
     
@@ -1,6 +1,6 @@
 from decimal import Decimal
 
-from sqlalchemy import Boolean, ForeignKey, Numeric
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, Numeric, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backoffice.models import Base, IdMixin
@@ -27,6 +27,13 @@ class CompanyBranchMenu(Base, IdMixin):
         default=True,
         nullable=False,
     )
+    # Версия строки для оптимистичной блокировки, растет при каждом изменении
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default=text("1"),
+        nullable=False,
+    )
 
     company_branch: Mapped["CompanyBranch"] = relationship(
         back_populates="branch_menus",
@@ -34,3 +41,9 @@ class CompanyBranchMenu(Base, IdMixin):
     menu_item: Mapped["MenuItem"] = relationship(  # type: ignore
         back_populates="branch_menus",
     )
+
+    __table_args__ = (
+        Index(
+            "ix_company_branches_menu_branch_item", "company_branch_id", "menu_item_id"
+        ),
+    )
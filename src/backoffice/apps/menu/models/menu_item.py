@@ -1,7 +1,8 @@
 from typing import Dict, List, Optional
 
-from sqlalchemy import (Boolean, CheckConstraint, ForeignKey, Index, Integer,
-                        String, Text)
+from sqlalchemy import (Boolean, CheckConstraint, Computed, ForeignKey, Index,
+                        Integer, String, Text)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backoffice.apps.company.models import Company
@@ -36,6 +37,21 @@ class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
     carbohydrated: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     is_template: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
+    # Поисковый вектор поддерживается самой БД: название с весом A,
+    # описание с весом B, в русской и английской конфигурациях
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
+
     # Если элемент принадлежит конкретной компании (не шаблон), указываем владельца
     owner_company_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("companies.id", ondelete="CASCADE"),
@@ -69,6 +85,13 @@ class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
             name="ck_menu_item_carbohydrated_pos",
         ),
         Index("ck_menu_item_category_slug", "category_id", "slug"),
+        # Индексы под курсорную пагинацию по (sort_key, id)
+        Index("ix_menu_items_name_id", "name", "id"),
+        Index("ix_menu_items_created_at_id", "created_at", "id"),
+        Index("ix_menu_items_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_menu_items_search_vector", "search_vector", postgresql_using="gin"
+        ),
         # Ровно одно из условий истинно: либо шаблон без владельца, либо не шаблон с владельцем
         CheckConstraint(
             "(is_template = TRUE AND owner_company_id IS NULL) OR (is_template = FALSE AND owner_company_id IS NOT NULL)",
@@ -78,11 +101,21 @@ class MenuItem(Base, IdMixin, CreatedUpdatedMixin):
 
     @property
     def breadcrumbs(self) -> List[Dict[str, str]]:
-        crumbs: List[Dict[str, str]] = []
+        # Заполняется пачкой через CategoryService.fill_breadcrumbs,
+        # обход по ленивым связям оставлен как запасной вариант
+        crumbs: Optional[List[Dict[str, str]]] = self.__dict__.get("_breadcrumbs")
+        if crumbs is not None:
+            return crumbs
+
+        crumbs = []
         node = self.category
         while node is not None:
             crumbs.insert(0, {"name": str(node.name), "slug": str(node.slug)})
             node = node.parent
         return crumbs
 
+    @breadcrumbs.setter
+    def breadcrumbs(self, value: List[Dict[str, str]]) -> None:
+        self.__dict__["_breadcrumbs"] = value
+
     
@@ -1,10 +1,25 @@
+from .branch_menu import (BranchMenuBulkUpdateRequest,
+                          BranchMenuBulkUpdateResponse, BranchMenuChange,
+                          BranchMenuCompanyUpdateRequest, BranchMenuConflict,
+                          BranchMenuConflictReason, BranchMenuRow)
+from .branch_menu_snapshot import (BranchMenuSnapshotCategory,
+                                   BranchMenuSnapshotImage,
+                                   BranchMenuSnapshotItem,
+                                   BranchMenuSnapshotResponse)
+from .category import CategoryCreate, CategoryMove, CategoryResponse
 from .menu_image import (MenuImageBase, MenuImageCreate,
                          MenuImageDeleteResponse, MenuImageListResponse,
                          MenuImagePresignedUrlResponse, MenuImageResponse,
                          MenuImageUpdate, MenuImageUploadResponse,
                          ThumbnailInfo)
-from .menu_item import (MenuItemBase, MenuItemCreate, MenuItemListResponse,
-                        MenuItemResponse, MenuItemUpdate)
+from .menu_import import (MENU_FILE_COLUMNS, MenuFileFormat,
+                          MenuImportResponse, MenuImportRow,
+                          MenuImportRowError)
+from .menu_item import (MenuItemBase, MenuItemCreate, MenuItemCursorResponse,
+                        MenuItemListResponse, MenuItemPagination,
+                        MenuItemResponse, MenuItemSearchResponse,
+                        MenuItemSearchResult, MenuItemTotalMode,
+                        MenuItemUpdate)
 
 __all__ = [
     "MenuItemBase",
@@ -12,6 +27,11 @@ __all__ = [
     "MenuItemUpdate",
     "MenuItemResponse",
     "MenuItemListResponse",
+    "MenuItemCursorResponse",
+    "MenuItemPagination",
+    "MenuItemTotalMode",
+    "MenuItemSearchResult",
+    "MenuItemSearchResponse",
     "MenuImageBase",
     "MenuImageCreate",
     "MenuImageUpdate",
@@ -21,4 +41,23 @@ __all__ = [
     "MenuImageDeleteResponse",
     "MenuImagePresignedUrlResponse",
     "ThumbnailInfo",
+    "MenuFileFormat",
+    "MenuImportRow",
+    "MenuImportRowError",
+    "MenuImportResponse",
+    "MENU_FILE_COLUMNS",
+    "BranchMenuChange",
+    "BranchMenuBulkUpdateRequest",
+    "BranchMenuCompanyUpdateRequest",
+    "BranchMenuRow",
+    "BranchMenuConflict",
+    "BranchMenuConflictReason",
+    "BranchMenuBulkUpdateResponse",
+    "BranchMenuSnapshotResponse",
+    "BranchMenuSnapshotCategory",
+    "BranchMenuSnapshotItem",
+    "BranchMenuSnapshotImage",
+    "CategoryCreate",
+    "CategoryMove",
+    "CategoryResponse",
 ]
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class BranchMenuChangeBase(BaseModel):
+    """Изменение цены и/или доступности позиции в меню филиала"""
+
+    price: Optional[Decimal] = Field(
+        None, ge=0, max_digits=10, decimal_places=2, description="Новая цена"
+    )
+    available: Optional[bool] = Field(None, description="Доступна ли позиция")
+
+    @model_validator(mode="after")
+    def check_has_changes(self):
+        if self.price is None and self.available is None:
+            raise ValueError("price or available must be set")
+        return self
+
+
+class BranchMenuChange(BranchMenuChangeBase):
+    """Изменение одной пары (филиал, позиция)"""
+
+    company_branch_id: int = Field(..., description="ID филиала")
+    menu_item_id: int = Field(..., description="ID позиции меню")
+    expected_version: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Ожидаемая версия строки; при несовпадении изменение не применяется",
+    )
+
+
+class BranchMenuBulkUpdateRequest(BaseModel):
+    """Пакет изменений меню филиалов"""
+
+    changes: List[BranchMenuChange] = Field(..., min_length=1, max_length=5000)
+
+
+class BranchMenuCompanyUpdateRequest(BranchMenuChangeBase):
+    """Изменение позиции во всех (или выбранных) филиалах компании"""
+
+    company_branch_ids: Optional[List[int]] = Field(
+        None, description="Ограничить изменение этими филиалами"
+    )
+
+
+class BranchMenuRow(BaseModel):
+    """Строка меню филиала после изменения"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    company_branch_id: int
+    menu_item_id: int
+    price: Decimal
+    available: bool
+    version: int
+
+
+class BranchMenuConflictReason(str, Enum):
+    NOT_FOUND = "not_found"
+    VERSION_MISMATCH = "version_mismatch"
+
+
+class BranchMenuConflict(BaseModel):
+    """Изменение, которое не было применено"""
+
+    company_branch_id: int
+    menu_item_id: int
+    reason: BranchMenuConflictReason
+    current_version: Optional[int] = Field(
+        None, description="Текущая версия строки при конфликте версий"
+    )
+
+
+class BranchMenuBulkUpdateResponse(BaseModel):
+    """Результат пакетного изменения меню филиалов"""
+
+    updated: List[BranchMenuRow]
+    conflicts: List[BranchMenuConflict]
+    affected_branch_ids: List[int]
@@ -0,0 +1,53 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BranchMenuSnapshotImage(BaseModel):
+    """Основное изображение позиции в снимке меню"""
+
+    url: str = Field(..., description="URL изображения")
+    alt_text: Optional[str] = Field(None, description="Альтернативный текст")
+    width: Optional[int] = Field(None, description="Ширина изображения")
+    height: Optional[int] = Field(None, description="Высота изображения")
+
+
+class BranchMenuSnapshotItem(BaseModel):
+    """Позиция меню филиала с ценой и доступностью"""
+
+    id: int
+    slug: str
+    name: str
+    description: str
+    grams: int
+    kilocalories: Optional[int] = None
+    proteins: Optional[int] = None
+    fats: Optional[int] = None
+    carbohydrated: Optional[int] = None
+    price: Decimal = Field(..., description="Цена в филиале")
+    available: bool = Field(..., description="Доступна ли позиция в филиале")
+    image: Optional[BranchMenuSnapshotImage] = Field(
+        None, description="Основное изображение"
+    )
+
+
+class BranchMenuSnapshotCategory(BaseModel):
+    """Узел дерева категорий снимка меню"""
+
+    id: int
+    name: str
+    slug: str
+    items: List[BranchMenuSnapshotItem] = Field(default_factory=list)
+    children: List["BranchMenuSnapshotCategory"] = Field(default_factory=list)
+
+
+class BranchMenuSnapshotResponse(BaseModel):
+    """Полное меню филиала для гостевого интерфейса"""
+
+    company_branch_id: int = Field(..., description="ID филиала")
+    built_at: datetime = Field(..., description="Время сборки снимка")
+    categories: List[BranchMenuSnapshotCategory] = Field(
+        default_factory=list, description="Корневые категории меню"
+    )
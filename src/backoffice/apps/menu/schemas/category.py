@@ -0,0 +1,33 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CategoryCreate(BaseModel):
+    """Схема для создания Category."""
+
+    name: str = Field(..., min_length=1, max_length=255, description="Название категории")
+    parent_id: Optional[int] = Field(
+        None, description="ID родительской категории, None — корневая"
+    )
+
+
+class CategoryMove(BaseModel):
+    """Перенос Category вместе с поддеревом."""
+
+    parent_id: Optional[int] = Field(
+        None, description="ID новой родительской категории, None — сделать корневой"
+    )
+
+
+class CategoryResponse(BaseModel):
+    """Схема для ответа с Category."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    slug: str
+    parent_id: Optional[int] = None
+    path: str = Field(..., description="Материализованный путь от корня")
+    depth: int = Field(..., description="Глубина, 0 — корневая категория")
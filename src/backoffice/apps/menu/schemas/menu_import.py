@@ -0,0 +1,69 @@
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from .menu_item import MenuItemBase
+
+
+class MenuFileFormat(str, Enum):
+    """Формат файла импорта/экспорта меню."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"  # один JSON-объект на строку
+
+
+class MenuImportRow(MenuItemBase):
+    """Строка импорта: позиция меню и, опционально, ее цена в филиале."""
+
+    company_branch_id: Optional[int] = Field(
+        None, description="ID филиала, в меню которого добавить позицию"
+    )
+    price: Optional[Decimal] = Field(
+        None, ge=0, max_digits=10, decimal_places=2, description="Цена в филиале"
+    )
+    available: bool = Field(True, description="Доступна ли позиция в филиале")
+
+    @model_validator(mode="after")
+    def check_branch_price(self) -> "MenuImportRow":
+        if self.company_branch_id is not None and self.price is None:
+            raise ValueError("price is required when company_branch_id is set")
+        return self
+
+
+class MenuImportRowError(BaseModel):
+    """Ошибка в строке файла импорта."""
+
+    row: int = Field(..., description="Номер строки данных (с 1)")
+    errors: List[str] = Field(..., description="Описание ошибок")
+
+
+class MenuImportResponse(BaseModel):
+    """Итог массового импорта меню."""
+
+    total_rows: int = Field(..., description="Обработано строк")
+    created_items: int = Field(..., description="Создано позиций меню")
+    created_branch_menus: int = Field(..., description="Добавлено позиций в меню филиалов")
+    failed_rows: int = Field(..., description="Строк с ошибками")
+    errors: List[MenuImportRowError] = Field(
+        default_factory=list, description="Ошибки по строкам (с ограничением)"
+    )
+
+
+# Колонки CSV экспорта; импорт принимает тот же набор
+MENU_FILE_COLUMNS = [
+    "name",
+    "description",
+    "category_id",
+    "grams",
+    "kilocalories",
+    "proteins",
+    "fats",
+    "carbohydrated",
+    "is_template",
+    "owner_company_id",
+    "company_branch_id",
+    "price",
+    "available",
+]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -63,3 +64,54 @@ class MenuItemListResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+class MenuItemPagination(str, Enum):
+    """Режим пагинации списка MenuItem."""
+
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class MenuItemTotalMode(str, Enum):
+    """Способ подсчета общего количества MenuItem."""
+
+    EXACT = "exact"  # count(*)
+    ESTIMATE = "estimate"  # оценка планировщика PostgreSQL
+    NONE = "none"  # не считать
+
+
+class MenuItemCursorResponse(BaseModel):
+    """Схема для списка MenuItem с курсорной пагинацией."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: List[MenuItemResponse]
+    size: int
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы, None если страниц больше нет"
+    )
+    total: Optional[int] = Field(None, description="Общее количество (если запрошено)")
+    total_is_estimate: bool = Field(
+        False, description="total является оценкой планировщика"
+    )
+
+
+class MenuItemSearchResult(MenuItemResponse):
+    """Найденный MenuItem с релевантностью и подсветкой."""
+
+    rank: float = Field(..., description="Релевантность (ts_rank_cd)")
+    name_highlight: str = Field(..., description="Название с подсветкой совпадений")
+    description_highlight: str = Field(
+        ..., description="Фрагменты описания с подсветкой совпадений"
+    )
+
+
+class MenuItemSearchResponse(BaseModel):
+    """Схема для результатов полнотекстового поиска MenuItem."""
+
+    query: str
+    items: List[MenuItemSearchResult]
+    total: int
+    page: int
+    size: int
@@ -1,3 +1,4 @@
+from .category_service import CategoryService
 from .menu_item_service import MenuItemService
 
-__all__ = ["MenuItemService"]
+__all__ = ["CategoryService", "MenuItemService"]
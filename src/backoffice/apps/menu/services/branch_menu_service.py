@@ -0,0 +1,261 @@
+import json
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Set, Tuple
+
+from sqlalchemy import (Boolean, Integer, Numeric, cast, column, func, or_,
+                        select, tuple_, update, values)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.company.models import CompanyBranch
+from src.backoffice.apps.menu.models import CompanyBranchMenu
+from src.backoffice.apps.menu.schemas.branch_menu import (
+    BranchMenuBulkUpdateResponse, BranchMenuChange,
+    BranchMenuCompanyUpdateRequest, BranchMenuConflict,
+    BranchMenuConflictReason, BranchMenuRow)
+from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+    BranchMenuSnapshotService
+from src.backoffice.core.config import kafka_settings
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("menu.branch_menu")
+
+# Топик событий об изменении меню филиала, ключ сообщения — ID филиала
+BRANCH_MENU_CHANGED_TOPIC = "menu.branch_menu_changed"
+
+
+class BranchMenuService:
+    """Пакетное изменение цен и доступности позиций в меню филиалов"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def bulk_update(
+        self, company_id: int, changes: Sequence[BranchMenuChange]
+    ) -> BranchMenuBulkUpdateResponse:
+        """
+        Применить изменения одним UPDATE ... FROM (VALUES ...).
+
+        Изменение с expected_version применяется, только если версия строки
+        совпадает; каждое примененное изменение увеличивает версию.
+
+        Args:
+            company_id: Компания, филиалами которой ограничено изменение
+            changes: Изменения по парам (филиал, позиция)
+
+        Returns:
+            BranchMenuBulkUpdateResponse: Измененные строки и конфликты
+        """
+        # Для повторяющейся пары применяется последнее изменение
+        unique_changes: Dict[Tuple[int, int], BranchMenuChange] = {
+            (change.company_branch_id, change.menu_item_id): change
+            for change in changes
+        }
+
+        changes_table = values(
+            column("company_branch_id", Integer),
+            column("menu_item_id", Integer),
+            column("price", Numeric(10, 2)),
+            column("available", Boolean),
+            column("expected_version", Integer),
+            name="changes",
+        ).data(
+            [
+                (
+                    change.company_branch_id,
+                    change.menu_item_id,
+                    change.price,
+                    change.available,
+                    change.expected_version,
+                )
+                for change in unique_changes.values()
+            ]
+        )
+        # Явные приведения: колонка VALUES из одних NULL иначе получит тип text
+        price = cast(changes_table.c.price, Numeric(10, 2))
+        available = cast(changes_table.c.available, Boolean)
+        expected_version = cast(changes_table.c.expected_version, Integer)
+
+        stmt = (
+            update(CompanyBranchMenu)
+            .where(
+                CompanyBranchMenu.company_branch_id
+                == changes_table.c.company_branch_id,
+                CompanyBranchMenu.menu_item_id == changes_table.c.menu_item_id,
+                CompanyBranchMenu.company_branch_id.in_(
+                    select(CompanyBranch.id).where(
+                        CompanyBranch.company_id == company_id
+                    )
+                ),
+                or_(
+                    expected_version.is_(None),
+                    CompanyBranchMenu.version == expected_version,
+                ),
+            )
+            .values(
+                price=func.coalesce(price, CompanyBranchMenu.price),
+                available=func.coalesce(available, CompanyBranchMenu.available),
+                version=CompanyBranchMenu.version + 1,
+            )
+            .returning(
+                CompanyBranchMenu.company_branch_id,
+                CompanyBranchMenu.menu_item_id,
+                CompanyBranchMenu.price,
+                CompanyBranchMenu.available,
+                CompanyBranchMenu.version,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        updated = [BranchMenuRow.model_validate(row) for row in result.all()]
+
+        updated_pairs = {(row.company_branch_id, row.menu_item_id) for row in updated}
+        missing = [pair for pair in unique_changes if pair not in updated_pairs]
+        conflicts = await self._get_conflicts(company_id, missing)
+
+        affected = await self._apply(updated)
+        return BranchMenuBulkUpdateResponse(
+            updated=updated, conflicts=conflicts, affected_branch_ids=affected
+        )
+
+    async def update_for_company(
+        self,
+        company_id: int,
+        menu_item_id: int,
+        change: BranchMenuCompanyUpdateRequest,
+    ) -> BranchMenuBulkUpdateResponse:
+        """
+        Изменить цену и/или доступность позиции во всех филиалах компании
+        (или только в указанных) одним UPDATE.
+
+        Args:
+            company_id: ID компании
+            menu_item_id: ID позиции меню
+            change: Новые значения и, опционально, список филиалов
+
+        Returns:
+            BranchMenuBulkUpdateResponse: Измененные строки
+        """
+        values_to_set = {"version": CompanyBranchMenu.version + 1}
+        if change.price is not None:
+            values_to_set["price"] = change.price
+        if change.available is not None:
+            values_to_set["available"] = change.available
+
+        branch_filter = select(CompanyBranch.id).where(
+            CompanyBranch.company_id == company_id
+        )
+        if change.company_branch_ids:
+            branch_filter = branch_filter.where(
+                CompanyBranch.id.in_(change.company_branch_ids)
+            )
+
+        stmt = (
+            update(CompanyBranchMenu)
+            .where(
+                CompanyBranchMenu.menu_item_id == menu_item_id,
+                CompanyBranchMenu.company_branch_id.in_(branch_filter),
+            )
+            .values(**values_to_set)
+            .returning(
+                CompanyBranchMenu.company_branch_id,
+                CompanyBranchMenu.menu_item_id,
+                CompanyBranchMenu.price,
+                CompanyBranchMenu.available,
+                CompanyBranchMenu.version,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        updated = [BranchMenuRow.model_validate(row) for row in result.all()]
+
+        affected = await self._apply(updated)
+        return BranchMenuBulkUpdateResponse(
+            updated=updated, conflicts=[], affected_branch_ids=affected
+        )
+
+    async def _get_conflicts(
+        self, company_id: int, pairs: List[Tuple[int, int]]
+    ) -> List[BranchMenuConflict]:
+        """Определить причину по непримененным изменениям одним запросом"""
+        if not pairs:
+            return []
+
+        result = await self.session.execute(
+            select(
+                CompanyBranchMenu.company_branch_id,
+                CompanyBranchMenu.menu_item_id,
+                func.max(CompanyBranchMenu.version),
+            )
+            .join(CompanyBranch, CompanyBranch.id == CompanyBranchMenu.company_branch_id)
+            .where(
+                CompanyBranch.company_id == company_id,
+                tuple_(
+                    CompanyBranchMenu.company_branch_id, CompanyBranchMenu.menu_item_id
+                ).in_(pairs),
+            )
+            .group_by(CompanyBranchMenu.company_branch_id, CompanyBranchMenu.menu_item_id)
+        )
+        versions = {(row[0], row[1]): row[2] for row in result.all()}
+
+        return [
+            BranchMenuConflict(
+                company_branch_id=branch_id,
+                menu_item_id=menu_item_id,
+                reason=(
+                    BranchMenuConflictReason.VERSION_MISMATCH
+                    if (branch_id, menu_item_id) in versions
+                    else BranchMenuConflictReason.NOT_FOUND
+                ),
+                current_version=versions.get((branch_id, menu_item_id)),
+            )
+            for branch_id, menu_item_id in pairs
+        ]
+
+    async def _apply(self, updated: List[BranchMenuRow]) -> List[int]:
+        """Сбросить снимки затронутых филиалов, зафиксировать и разослать события"""
+        items_by_branch: Dict[int, Set[int]] = defaultdict(set)
+        for row in updated:
+            items_by_branch[row.company_branch_id].add(row.menu_item_id)
+        affected = sorted(items_by_branch)
+
+        await BranchMenuSnapshotService(self.session).invalidate_branches(affected)
+        await self.session.commit()
+
+        await self._publish(items_by_branch)
+        return affected
+
+    async def _publish(self, items_by_branch: Dict[int, Set[int]]) -> None:
+        """Одно событие на филиал; без брокеров Kafka события не отправляются"""
+        if not items_by_branch or not kafka_settings.get_bootstrap_servers():
+            return
+
+        # Локальный импорт: aiokafka нужен, только если Kafka настроена
+        from src.backoffice.core.services.kafka_client import kafka_client
+
+        changed_at = datetime.now(timezone.utc).isoformat()
+        branch_ids = list(items_by_branch)
+        messages = [
+            (
+                str(branch_id).encode("utf-8"),
+                json.dumps(
+                    {
+                        "company_branch_id": branch_id,
+                        "menu_item_ids": sorted(items_by_branch[branch_id]),
+                        "changed_at": changed_at,
+                    }
+                ).encode("utf-8"),
+            )
+            for branch_id in branch_ids
+        ]
+        try:
+            errors = await kafka_client.send_many(BRANCH_MENU_CHANGED_TOPIC, messages)
+        except Exception as e:
+            errors = [e] * len(branch_ids)
+
+        for branch_id, error in zip(branch_ids, errors):
+            if error is not None:
+                logger.warning(
+                    "branch_menu_event_failed",
+                    extra={"company_branch_id": branch_id, "error": str(error)},
+                )
@@ -0,0 +1,327 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.company.models import CompanyBranch
+from src.backoffice.apps.menu.models import (BranchMenuSnapshot,
+                                             CompanyBranchMenu, MenuImage,
+                                             MenuItem)
+from src.backoffice.apps.menu.schemas.branch_menu_snapshot import (
+    BranchMenuSnapshotCategory, BranchMenuSnapshotImage,
+    BranchMenuSnapshotItem, BranchMenuSnapshotResponse)
+from src.backoffice.apps.menu.services.category_service import CategoryService
+from src.backoffice.core.config import menu_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.s3_client import s3_client
+
+logger = get_logger("menu.snapshot")
+
+
+@dataclass(frozen=True)
+class CachedSnapshot:
+    """Готовый к отдаче снимок меню"""
+
+    content: bytes
+    etag: str
+
+
+class BranchMenuSnapshotCache:
+    """In-process кэш снимков меню с коротким TTL.
+
+    TTL ограничивает рассинхронизацию между воркерами: инвалидация чистит
+    только память текущего процесса, остальные перечитают снимок из БД
+    после истечения TTL.
+    """
+
+    def __init__(self, ttl: int, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[float, CachedSnapshot]]" = OrderedDict()
+
+    def get(self, company_branch_id: int) -> Optional[CachedSnapshot]:
+        entry = self._entries.get(company_branch_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(company_branch_id, None)
+            return None
+        self._entries.move_to_end(company_branch_id)
+        return snapshot
+
+    def set(self, company_branch_id: int, snapshot: CachedSnapshot) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[company_branch_id] = (time.monotonic() + self.ttl, snapshot)
+        self._entries.move_to_end(company_branch_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def evict(self, company_branch_ids: Iterable[int]) -> None:
+        for company_branch_id in company_branch_ids:
+            self._entries.pop(company_branch_id, None)
+
+
+branch_menu_snapshot_cache = BranchMenuSnapshotCache(
+    ttl=menu_settings.snapshot_local_ttl,
+    max_size=menu_settings.snapshot_local_max_size,
+)
+
+
+class BranchMenuSnapshotService:
+    """Сборка, хранение и инвалидация снимков меню филиалов"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_snapshot(self, company_branch_id: int) -> Optional[CachedSnapshot]:
+        """
+        Получить снимок меню филиала: память воркера -> таблица снимков -> сборка.
+
+        Args:
+            company_branch_id: ID филиала
+
+        Returns:
+            CachedSnapshot или None, если филиал не найден или неактивен
+        """
+        snapshot = branch_menu_snapshot_cache.get(company_branch_id)
+        if snapshot is not None:
+            return snapshot
+
+        stored = await self.session.scalar(
+            select(BranchMenuSnapshot).where(
+                BranchMenuSnapshot.company_branch_id == company_branch_id
+            )
+        )
+        if stored is not None and stored.payload is not None:
+            snapshot = CachedSnapshot(
+                content=stored.payload.encode("utf-8"), etag=stored.etag
+            )
+            branch_menu_snapshot_cache.set(company_branch_id, snapshot)
+            return snapshot
+
+        return await self.rebuild(company_branch_id)
+
+    async def rebuild(self, company_branch_id: int) -> Optional[CachedSnapshot]:
+        """
+        Пересобрать и сохранить снимок меню филиала.
+
+        Поколение снимка читается до сборки. Если за время сборки снимок
+        сбросили (в том числе транзакцией, которая еще не закоммичена —
+        upsert дождется ее блокировки), собранный по старым данным снимок
+        не сохраняется, а только отдается текущему запросу.
+
+        Args:
+            company_branch_id: ID филиала
+
+        Returns:
+            CachedSnapshot или None, если филиал не найден или неактивен
+        """
+        generation = (
+            await self.session.scalar(
+                select(BranchMenuSnapshot.generation).where(
+                    BranchMenuSnapshot.company_branch_id == company_branch_id
+                )
+            )
+            or 0
+        )
+
+        branch_exists = await self.session.scalar(
+            select(CompanyBranch.id).where(
+                CompanyBranch.id == company_branch_id,
+                CompanyBranch.is_active == True,
+            )
+        )
+        if not branch_exists:
+            return None
+
+        response = await self._build(company_branch_id)
+        payload = response.model_dump_json()
+        # built_at не входит в ETag: пересборка без изменений меню дает тот же ETag
+        etag = hashlib.sha256(
+            response.model_dump_json(exclude={"built_at"}).encode("utf-8")
+        ).hexdigest()
+
+        stmt = insert(BranchMenuSnapshot).values(
+            company_branch_id=company_branch_id,
+            payload=payload,
+            etag=etag,
+            generation=generation,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BranchMenuSnapshot.company_branch_id],
+            set_={
+                "payload": stmt.excluded.payload,
+                "etag": stmt.excluded.etag,
+                "updated_at": datetime.now(timezone.utc),
+            },
+            where=BranchMenuSnapshot.generation == generation,
+        ).returning(BranchMenuSnapshot.id)
+        saved = await self.session.scalar(stmt)
+        await self.session.commit()
+
+        snapshot = CachedSnapshot(content=payload.encode("utf-8"), etag=etag)
+        if saved is None:
+            logger.info(
+                "branch_menu_snapshot_outdated",
+                extra={"company_branch_id": company_branch_id},
+            )
+            return snapshot
+
+        branch_menu_snapshot_cache.set(company_branch_id, snapshot)
+        logger.info(
+            "branch_menu_snapshot_rebuilt",
+            extra={"company_branch_id": company_branch_id, "etag": etag},
+        )
+        return snapshot
+
+    async def invalidate_for_menu_items(self, menu_item_ids: Iterable[int]) -> List[int]:
+        """
+        Сбросить снимки всех филиалов, в меню которых есть указанные позиции.
+        Выполняется в транзакции вызывающего кода, commit не делает.
+
+        Args:
+            menu_item_ids: ID позиций меню
+
+        Returns:
+            List[int]: ID затронутых филиалов
+        """
+        ids = list(set(menu_item_ids))
+        if not ids:
+            return []
+
+        result = await self.session.scalars(
+            select(CompanyBranchMenu.company_branch_id)
+            .where(CompanyBranchMenu.menu_item_id.in_(ids))
+            .distinct()
+        )
+        company_branch_ids = list(result.all())
+        await self.invalidate_branches(company_branch_ids)
+        return company_branch_ids
+
+    async def invalidate_branches(self, company_branch_ids: Sequence[int]) -> None:
+        """
+        Сбросить снимки указанных филиалов. Commit не делает.
+
+        Строка снимка не удаляется: payload очищается, а поколение растет.
+        Блокировка строки держится до commit вызывающего кода, поэтому
+        параллельная пересборка по старым данным не перезапишет сброс.
+
+        Args:
+            company_branch_ids: ID филиалов
+        """
+        if not company_branch_ids:
+            return
+
+        stmt = insert(BranchMenuSnapshot).values(
+            [
+                {"company_branch_id": company_branch_id, "generation": 1}
+                for company_branch_id in sorted(set(company_branch_ids))
+            ]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[BranchMenuSnapshot.company_branch_id],
+                set_={
+                    "payload": None,
+                    "etag": None,
+                    "generation": BranchMenuSnapshot.generation + 1,
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+        )
+        branch_menu_snapshot_cache.evict(company_branch_ids)
+
+    async def _build(self, company_branch_id: int) -> BranchMenuSnapshotResponse:
+        """Собрать меню филиала тремя запросами: позиции, изображения, категории"""
+        rows = (
+            await self.session.execute(
+                select(MenuItem, CompanyBranchMenu.price, CompanyBranchMenu.available)
+                .join(CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id)
+                .where(CompanyBranchMenu.company_branch_id == company_branch_id)
+                .order_by(MenuItem.name, MenuItem.id)
+            )
+        ).all()
+
+        images = await self._get_primary_images([row[0].id for row in rows])
+        categories = await CategoryService(self.session).get_with_ancestors(
+            row[0].category_id for row in rows
+        )
+
+        nodes: Dict[int, BranchMenuSnapshotCategory] = {
+            category.id: BranchMenuSnapshotCategory(
+                id=category.id, name=category.name, slug=category.slug
+            )
+            for category in categories
+        }
+        roots: List[BranchMenuSnapshotCategory] = []
+        for category in sorted(categories, key=lambda c: (c.name, c.id)):
+            node = nodes[category.id]
+            parent = nodes.get(category.parent_id) if category.parent_id else None
+            if parent is not None:
+                parent.children.append(node)
+            else:
+                roots.append(node)
+
+        for menu_item, price, available in rows:
+            image = images.get(menu_item.id)
+            nodes[menu_item.category_id].items.append(
+                BranchMenuSnapshotItem(
+                    id=menu_item.id,
+                    slug=menu_item.slug,
+                    name=menu_item.name,
+                    description=menu_item.description,
+                    grams=menu_item.grams,
+                    kilocalories=menu_item.kilocalories,
+                    proteins=menu_item.proteins,
+                    fats=menu_item.fats,
+                    carbohydrated=menu_item.carbohydrated,
+                    price=price,
+                    available=available,
+                    image=(
+                        BranchMenuSnapshotImage(
+                            url=s3_client.get_public_url(image.file_path),
+                            alt_text=image.alt_text,
+                            width=image.width,
+                            height=image.height,
+                        )
+                        if image is not None
+                        else None
+                    ),
+                )
+            )
+
+        return BranchMenuSnapshotResponse(
+            company_branch_id=company_branch_id,
+            built_at=datetime.now(timezone.utc),
+            categories=roots,
+        )
+
+    async def _get_primary_images(self, menu_item_ids: List[int]) -> Dict[int, MenuImage]:
+        """Одно изображение на позицию: основное, иначе первое по порядку"""
+        if not menu_item_ids:
+            return {}
+
+        stmt = (
+            select(MenuImage)
+            .where(
+                MenuImage.menu_item_id.in_(menu_item_ids),
+                MenuImage.is_active == True,
+            )
+            .distinct(MenuImage.menu_item_id)
+            .order_by(
+                MenuImage.menu_item_id,
+                MenuImage.is_primary.desc(),
+                MenuImage.display_order,
+                MenuImage.id,
+            )
+        )
+        result = await self.session.scalars(stmt)
+        return {image.menu_item_id: image for image in result.all()}
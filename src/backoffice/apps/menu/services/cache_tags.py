@@ -0,0 +1,8 @@
+# Теги кэша ответов меню (см. core.routing.cache_response)
+
+# Списки, поиск и карточки позиций меню
+MENU_ITEMS_CACHE_TAG = "menu_items"
+# Ответы по ID изображения
+MENU_IMAGES_CACHE_TAG = "menu_images"
+# Изображения одного элемента меню
+MENU_ITEM_IMAGES_CACHE_TAG = "menu_images:{menu_item_id}"
@@ -0,0 +1,291 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import Row, Select, delete, func, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.backoffice.apps.menu.models.category import Category
+from src.backoffice.apps.menu.models.menu_item import MenuItem
+from src.backoffice.apps.menu.services.cache_tags import MENU_ITEMS_CACHE_TAG
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services import SearchIndexer
+from src.backoffice.core.services import SlugService
+from src.backoffice.core.services.response_cache import response_cache
+
+# Сколько раз перечитывать пути, если дерево изменилось до блокировки
+_LOCK_ATTEMPTS = 3
+
+
+class CategoryService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, name: str, parent_id: Optional[int] = None) -> Category:
+        """
+        Create new Category and fill its materialized path.
+
+        Args:
+            name: Category name
+            parent_id: Parent category id, None for a root category
+
+        Returns:
+            Created Category
+        """
+        locked = await self._lock_with_ancestors({parent_id} - {None})
+        parent = self._check_parent(locked, parent_id)
+
+        category = Category(
+            name=name,
+            parent_id=parent_id,
+            slug="",
+            depth=parent.depth + 1 if parent else 0,
+        )
+        self.session.add(category)
+        await self.session.flush()
+
+        SlugService.set_slug(instance=category, name=category.name)
+        category.path = f"{parent.path if parent else ''}{category.id}."
+        await self.session.commit()
+
+        await SearchIndexer(self.session).index(SearchEntity.CATEGORY, [category])
+
+        return category
+
+    async def move(
+        self, category_id: int, new_parent_id: Optional[int]
+    ) -> Optional[Category]:
+        """
+        Move Category with its whole subtree under another parent.
+
+        The category, the new parent and their ancestors are locked first,
+        so concurrent moves of the same branches run one after another.
+        Paths and depths of the subtree are rewritten with one UPDATE.
+
+        Args:
+            category_id: Category id
+            new_parent_id: New parent category id, None to make it a root
+
+        Returns:
+            Moved Category, None if not found
+        """
+        locked = await self._lock_with_ancestors({category_id, new_parent_id} - {None})
+        category = locked.get(category_id)
+        if category is None:
+            return None
+
+        parent = self._check_parent(locked, new_parent_id)
+        if parent is not None and parent.path.startswith(category.path):
+            raise ValueError("Category cannot be moved into its own subtree")
+
+        old_path = category.path
+        new_path = f"{parent.path if parent else ''}{category.id}."
+        depth_delta = (parent.depth + 1 if parent else 0) - category.depth
+
+        await self.session.execute(
+            update(Category)
+            .where(Category.path.like(f"{old_path}%"))
+            .values(
+                path=literal(new_path) + func.substr(Category.path, len(old_path) + 1),
+                depth=Category.depth + depth_delta,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        category.parent_id = new_parent_id
+
+        await self._invalidate_snapshots(new_path)
+        await self.session.commit()
+
+        await SearchIndexer(self.session).index(SearchEntity.CATEGORY, [category])
+        # Хлебные крошки позиций поддерева изменились
+        await response_cache.invalidate_tags(MENU_ITEMS_CACHE_TAG)
+
+        return category
+
+    async def delete(self, category_id: int) -> bool:
+        """
+        Delete Category with its whole subtree.
+
+        Args:
+            category_id: Category id
+
+        Returns:
+            True if deleted, False if not found
+
+        Raises:
+            ValueError: If menu items still reference the subtree
+        """
+        path = await self._get_path(category_id)
+        if path is None:
+            return False
+
+        # Позиции меню ссылаются на категории с RESTRICT, поэтому снимки
+        # филиалов удаление категорий не затрагивает
+        try:
+            result = await self.session.execute(
+                delete(Category)
+                .where(Category.path.like(f"{path}%"))
+                .returning(Category.id)
+                .execution_options(synchronize_session="fetch")
+            )
+            deleted_ids = list(result.scalars().all())
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise ValueError("Category subtree still has menu items")
+
+        await SearchIndexer(self.session).delete(SearchEntity.CATEGORY, deleted_ids)
+        return True
+
+    async def get_subtree_ids_stmt(self, category_id: int) -> Select:
+        """
+        Build a subquery with ids of the category and all its descendants.
+
+        Args:
+            category_id: Category id
+
+        Returns:
+            Select of category ids (empty if the category does not exist)
+        """
+        path = await self._get_path(category_id)
+        if path is None:
+            return select(Category.id).where(Category.id == category_id)
+        return select(Category.id).where(Category.path.like(f"{path}%"))
+
+    async def get_with_ancestors(self, category_ids: Iterable[int]) -> List[Row]:
+        """
+        Get categories together with all their ancestors in one query.
+
+        Args:
+            category_ids: Category ids
+
+        Returns:
+            Rows (id, name, slug, parent_id) of the categories and their ancestors
+        """
+        ids = set(category_ids)
+        if not ids:
+            return []
+
+        ancestors = (
+            select(Category.id, Category.name, Category.slug, Category.parent_id)
+            .where(Category.id.in_(ids))
+            .cte("category_ancestors", recursive=True)
+        )
+        parent = aliased(Category)
+        ancestors = ancestors.union(
+            select(parent.id, parent.name, parent.slug, parent.parent_id).join(
+                ancestors, parent.id == ancestors.c.parent_id
+            )
+        )
+        result = await self.session.execute(select(ancestors))
+        return list(result.all())
+
+    async def get_breadcrumbs(
+        self, category_ids: Iterable[int]
+    ) -> Dict[int, List[Dict[str, str]]]:
+        """
+        Build breadcrumbs (root first) for each of the given categories.
+
+        Args:
+            category_ids: Category ids
+
+        Returns:
+            Breadcrumbs by category id
+        """
+        ids = set(category_ids)
+        nodes = {row.id: row for row in await self.get_with_ancestors(ids)}
+
+        breadcrumbs: Dict[int, List[Dict[str, str]]] = {}
+        for category_id in ids:
+            crumbs: List[Dict[str, str]] = []
+            node = nodes.get(category_id)
+            while node is not None:
+                crumbs.insert(0, {"name": str(node.name), "slug": str(node.slug)})
+                node = nodes.get(node.parent_id) if node.parent_id else None
+            breadcrumbs[category_id] = crumbs
+        return breadcrumbs
+
+    async def fill_breadcrumbs(self, menu_items: Sequence[MenuItem]) -> None:
+        """
+        Fill MenuItem.breadcrumbs for a page of items without lazy loads.
+
+        Args:
+            menu_items: MenuItem instances
+        """
+        if not menu_items:
+            return
+
+        breadcrumbs = await self.get_breadcrumbs(
+            menu_item.category_id for menu_item in menu_items
+        )
+        for menu_item in menu_items:
+            menu_item.breadcrumbs = breadcrumbs.get(menu_item.category_id, [])
+
+    async def _lock_with_ancestors(self, category_ids: Set[int]) -> Dict[int, Category]:
+        """
+        Lock categories and all their ancestors (SELECT ... FOR UPDATE in id
+        order) and return the given categories that exist.
+
+        Ancestors come from paths read before locking; if a path changed by
+        the time the lock is taken, the paths are read again.
+        """
+        for _ in range(_LOCK_ATTEMPTS):
+            result = await self.session.execute(
+                select(Category.id, Category.path).where(Category.id.in_(category_ids))
+            )
+            paths = dict(result.all())
+            lock_ids = set(paths)
+            for path in paths.values():
+                lock_ids.update(int(part) for part in path.split(".") if part)
+
+            # populate_existing: объекты в сессии получают значения,
+            # прочитанные под блокировкой
+            categories = await self.session.scalars(
+                select(Category)
+                .where(Category.id.in_(lock_ids))
+                .order_by(Category.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            locked = {category.id: category for category in categories.all()}
+            if all(
+                category_id in locked and locked[category_id].path == path
+                for category_id, path in paths.items()
+            ):
+                return {
+                    category_id: locked[category_id]
+                    for category_id in category_ids
+                    if category_id in locked
+                }
+        raise ValueError("Category tree is being changed concurrently, try again")
+
+    @staticmethod
+    def _check_parent(
+        locked: Dict[int, Category], parent_id: Optional[int]
+    ) -> Optional[Category]:
+        if parent_id is None:
+            return None
+        parent = locked.get(parent_id)
+        if parent is None:
+            raise ValueError(f"Parent category {parent_id} not found")
+        return parent
+
+    async def _get_path(self, category_id: int) -> Optional[str]:
+        return await self.session.scalar(
+            select(Category.path).where(Category.id == category_id)
+        )
+
+    async def _invalidate_snapshots(self, path: str) -> None:
+        """Сбросить снимки филиалов, где продаются позиции из поддерева"""
+        # Локальный импорт: сервис снимков сам зависит от CategoryService
+        from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+            BranchMenuSnapshotService
+
+        result = await self.session.scalars(
+            select(MenuItem.id)
+            .join(Category, Category.id == MenuItem.category_id)
+            .where(Category.path.like(f"{path}%"))
+        )
+        await BranchMenuSnapshotService(self.session).invalidate_for_menu_items(
+            result.all()
+        )
@@ -6,7 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.menu.models.menu_image import MenuImage
 from src.backoffice.apps.menu.models.menu_item import MenuItem
+from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+    BranchMenuSnapshotService
+from src.backoffice.apps.menu.services.cache_tags import (
+    MENU_IMAGES_CACHE_TAG, MENU_ITEM_IMAGES_CACHE_TAG)
 from src.backoffice.core.dependencies import SessionDep
+from src.backoffice.core.services.response_cache import response_cache
 from src.backoffice.core.services.s3_client import s3_client
 
 
@@ -64,7 +69,9 @@ class MenuImageService:
         )
 
         self.session.add(menu_image)
+        await self._invalidate_snapshots(menu_item_id)
         await self.session.commit()
+        await self._invalidate_cache(menu_item_id)
         await self.session.refresh(menu_image)
 
         return menu_image
@@ -146,7 +153,9 @@ class MenuImageService:
 
         # updated_at автоматически обновится благодаря CreatedUpdatedMixin
 
+        await self._invalidate_snapshots(image.menu_item_id)
         await self.session.commit()
+        await self._invalidate_cache(image.menu_item_id)
         await self.session.refresh(image)
 
         return image
@@ -176,7 +185,9 @@ class MenuImageService:
 
         # Удаление записи из БД
         await self.session.delete(image)
+        await self._invalidate_snapshots(image.menu_item_id)
         await self.session.commit()
+        await self._invalidate_cache(image.menu_item_id)
 
         return True
 
@@ -199,7 +210,9 @@ class MenuImageService:
         image.is_primary = True
         # updated_at автоматически обновится благодаря CreatedUpdatedMixin
 
+        await self._invalidate_snapshots(image.menu_item_id)
         await self.session.commit()
+        await self._invalidate_cache(image.menu_item_id)
         await self.session.refresh(image)
 
         return image
@@ -254,6 +267,19 @@ class MenuImageService:
 
         await self.session.commit()
 
+    async def _invalidate_snapshots(self, menu_item_id: int) -> None:
+        """Сбросить снимки меню филиалов, где продается элемент меню"""
+        await BranchMenuSnapshotService(self.session).invalidate_for_menu_items(
+            [menu_item_id]
+        )
+
+    async def _invalidate_cache(self, menu_item_id: int) -> None:
+        """Сбросить закэшированные ответы с изображениями элемента меню"""
+        await response_cache.invalidate_tags(
+            MENU_IMAGES_CACHE_TAG,
+            MENU_ITEM_IMAGES_CACHE_TAG.format(menu_item_id=menu_item_id),
+        )
+
 
 # Фабрика для создания сервиса
 async def get_menu_image_service(session: SessionDep) -> MenuImageService:
@@ -0,0 +1,470 @@
+import codecs
+import csv
+import io
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.backoffice.apps.account.schemas import UserProfile
+from src.backoffice.apps.company.models import CompanyBranch, CompanyRole
+from src.backoffice.apps.company.services import CompanyMembershipService
+from src.backoffice.apps.menu.models import CompanyBranchMenu, MenuItem
+from src.backoffice.apps.menu.schemas.menu_import import (MENU_FILE_COLUMNS,
+                                                          MenuFileFormat,
+                                                          MenuImportResponse,
+                                                          MenuImportRow,
+                                                          MenuImportRowError)
+from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+    BranchMenuSnapshotService
+from src.backoffice.apps.menu.services.cache_tags import MENU_ITEMS_CACHE_TAG
+from src.backoffice.apps.menu.services.menu_item_service import MenuItemService
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services import SearchIndexer
+from src.backoffice.core.config import menu_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services import SlugService
+from src.backoffice.core.services.response_cache import response_cache
+
+logger = get_logger("menu.import")
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Поля строки импорта, которые пишутся в menu_items
+MENU_ITEM_FIELDS = {
+    "name",
+    "description",
+    "category_id",
+    "grams",
+    "kilocalories",
+    "proteins",
+    "fats",
+    "carbohydrated",
+    "is_template",
+    "owner_company_id",
+}
+
+
+async def iter_lines(file: UploadFile) -> AsyncIterator[str]:
+    """Читать файл кусками и отдавать строки по мере поступления"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    while True:
+        chunk = await file.read(READ_CHUNK_SIZE)
+        buffer += decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            break
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+async def iter_csv_rows(file: UploadFile) -> AsyncIterator[Any]:
+    """
+    Потоковый разбор CSV с заголовком. Пустые ячейки пропускаются,
+    чтобы сработали значения по умолчанию схемы.
+    """
+    header: Optional[List[str]] = None
+    pending = ""
+    async for line in iter_lines(file):
+        pending += line
+        # Нечетное число кавычек — перевод строки внутри значения, запись не закончилась
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+
+        values = next(csv.reader([record]), [])
+        if not values:
+            continue
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+        yield {
+            column: value
+            for column, value in zip(header, values)
+            if value.strip() != ""
+        }
+
+    if pending.strip():
+        yield ValueError("Unterminated quoted value at end of file")
+
+
+async def iter_ndjson_rows(file: UploadFile) -> AsyncIterator[Any]:
+    """Потоковый разбор NDJSON: один JSON-объект на строку"""
+    async for line in iter_lines(file):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+def _format_db_error(error: DBAPIError) -> str:
+    message = str(error.orig) if error.orig is not None else str(error)
+    return message.strip().splitlines()[0]
+
+
+class MenuImportService:
+    """Массовый импорт и потоковый экспорт позиций меню"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._errors: List[MenuImportRowError] = []
+        self._failed_rows = 0
+        self._user: Optional[UserProfile] = None
+        # Компании филиалов и права пользователя, уже проверенные при импорте
+        self._branch_companies: Dict[int, int] = {}
+        self._editor_of: Dict[int, bool] = {}
+
+    async def import_file(
+        self, file: UploadFile, file_format: MenuFileFormat, user: UserProfile
+    ) -> MenuImportResponse:
+        """
+        Импортировать позиции меню из CSV или NDJSON файла.
+
+        Args:
+            file: Загруженный файл
+            file_format: Формат файла
+            user: Пользователь, от имени которого выполняется импорт
+
+        Returns:
+            MenuImportResponse: Итоги импорта и ошибки по строкам
+        """
+        rows = (
+            iter_csv_rows(file)
+            if file_format == MenuFileFormat.CSV
+            else iter_ndjson_rows(file)
+        )
+        return await self.import_rows(rows, user)
+
+    async def import_rows(
+        self, rows: AsyncIterator[Any], user: UserProfile
+    ) -> MenuImportResponse:
+        """
+        Импортировать строки пачками по MENU_IMPORT_BATCH_SIZE.
+
+        Каждая пачка валидируется, вставляется одним INSERT ... RETURNING
+        и фиксируется отдельной транзакцией. Ошибочные строки попадают
+        в отчет и не прерывают импорт.
+
+        Строку можно импортировать, только имея роль не ниже EDITOR в компании
+        владельца позиции (owner_company_id) и в компании филиала
+        (company_branch_id). Общие шаблоны без владельца импортируют только
+        администраторы.
+
+        Args:
+            rows: Словари строк; исключение вместо словаря — ошибка разбора строки
+            user: Пользователь, от имени которого выполняется импорт
+
+        Returns:
+            MenuImportResponse: Итоги импорта и ошибки по строкам
+        """
+        self._errors = []
+        self._failed_rows = 0
+        self._user = user
+        self._branch_companies = {}
+        self._editor_of = {}
+        total_rows = 0
+        created_items = 0
+        created_branch_menus = 0
+
+        batch: List[Tuple[int, MenuImportRow]] = []
+        async for raw in rows:
+            total_rows += 1
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                batch.append((total_rows, MenuImportRow.model_validate(raw)))
+            except ValidationError as e:
+                self._add_error(
+                    total_rows,
+                    [
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ],
+                )
+            except ValueError as e:
+                self._add_error(total_rows, [str(e)])
+
+            if len(batch) >= menu_settings.import_batch_size:
+                items, branch_menus = await self._import_batch(batch)
+                created_items += items
+                created_branch_menus += branch_menus
+                batch = []
+
+        if batch:
+            items, branch_menus = await self._import_batch(batch)
+            created_items += items
+            created_branch_menus += branch_menus
+
+        logger.info(
+            "menu_import_completed",
+            extra={
+                "total_rows": total_rows,
+                "created_items": created_items,
+                "failed_rows": self._failed_rows,
+            },
+        )
+        return MenuImportResponse(
+            total_rows=total_rows,
+            created_items=created_items,
+            created_branch_menus=created_branch_menus,
+            failed_rows=self._failed_rows,
+            errors=self._errors,
+        )
+
+    async def iter_export(
+        self,
+        file_format: MenuFileFormat,
+        company_branch_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        include_descendants: bool = False,
+        is_template: Optional[bool] = None,
+        visible_for_company_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Потоковый экспорт позиций меню в формате, который принимает импорт.
+
+        Строки читаются из БД потоком пачками по MENU_EXPORT_BATCH_SIZE.
+
+        Args:
+            file_format: Формат файла
+            company_branch_id: Экспортировать меню филиала вместе с ценами
+            category_id: Фильтр по категории
+            include_descendants: Включить позиции подкатегорий
+            is_template: Фильтр по is_template
+            visible_for_company_id: Шаблоны и позиции этой компании
+
+        Yields:
+            str: Фрагменты файла
+        """
+        filters = await MenuItemService(self.session).build_filters(
+            category_id=category_id,
+            include_descendants=include_descendants,
+            is_template=is_template,
+            visible_for_company_id=visible_for_company_id,
+        )
+
+        if company_branch_id is not None:
+            stmt = (
+                select(
+                    MenuItem,
+                    CompanyBranchMenu.company_branch_id,
+                    CompanyBranchMenu.price,
+                    CompanyBranchMenu.available,
+                )
+                .join(CompanyBranchMenu, CompanyBranchMenu.menu_item_id == MenuItem.id)
+                .where(CompanyBranchMenu.company_branch_id == company_branch_id)
+            )
+        else:
+            stmt = select(MenuItem)
+        stmt = (
+            stmt.where(*filters)
+            .order_by(MenuItem.id)
+            .execution_options(yield_per=menu_settings.export_batch_size)
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if file_format == MenuFileFormat.CSV:
+            writer.writerow(MENU_FILE_COLUMNS)
+            yield buffer.getvalue()
+
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for row in partition:
+                record = self._export_record(row)
+                if file_format == MenuFileFormat.CSV:
+                    writer.writerow(
+                        "" if record[column] is None else record[column]
+                        for column in MENU_FILE_COLUMNS
+                    )
+                else:
+                    buffer.write(json.dumps(record, ensure_ascii=False, default=str))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+    async def _import_batch(
+        self, batch: List[Tuple[int, MenuImportRow]]
+    ) -> Tuple[int, int]:
+        """Вставить пачку целиком, при ошибке БД — построчно, чтобы найти плохие строки"""
+        items: List[MenuItem] = []
+        branch_ids: Set[int] = set()
+        branch_menus = 0
+
+        batch = await self._check_access(batch)
+        if not batch:
+            return 0, 0
+
+        try:
+            async with self.session.begin_nested():
+                items, branch_menus = await self._insert_rows(
+                    [row for _, row in batch], branch_ids
+                )
+        except DBAPIError:
+            items, branch_menus = [], 0
+            branch_ids.clear()
+            for row_number, row in batch:
+                try:
+                    async with self.session.begin_nested():
+                        row_items, row_branch_menus = await self._insert_rows(
+                            [row], branch_ids
+                        )
+                    items.extend(row_items)
+                    branch_menus += row_branch_menus
+                except DBAPIError as e:
+                    self._add_error(row_number, [_format_db_error(e)])
+
+        await BranchMenuSnapshotService(self.session).invalidate_branches(
+            list(branch_ids)
+        )
+        await self.session.commit()
+
+        await SearchIndexer(self.session).index(SearchEntity.MENU_ITEM, items)
+        if items:
+            await response_cache.invalidate_tags(MENU_ITEMS_CACHE_TAG)
+        # Пачка зафиксирована, объекты больше не нужны сессии
+        for item in items:
+            self.session.expunge(item)
+
+        return len(items), branch_menus
+
+    async def _insert_rows(
+        self, rows: List[MenuImportRow], branch_ids: Set[int]
+    ) -> Tuple[List[MenuItem], int]:
+        # slug зависит от id, поэтому вставляем с временным уникальным slug
+        # и затем обновляем все slug одним пакетным UPDATE по первичному ключу
+        result = await self.session.scalars(
+            insert(MenuItem).returning(MenuItem, sort_by_parameter_order=True),
+            [
+                {
+                    **row.model_dump(include=MENU_ITEM_FIELDS),
+                    "slug": f"import-{uuid.uuid4().hex}",
+                }
+                for row in rows
+            ],
+        )
+        items = list(result.all())
+
+        slugs = [
+            {"id": item.id, "slug": SlugService.build_slug(item.name, item.id)}
+            for item in items
+        ]
+        await self.session.execute(update(MenuItem), slugs)
+        for item, slug in zip(items, slugs):
+            set_committed_value(item, "slug", slug["slug"])
+
+        branch_menus = [
+            {
+                "company_branch_id": row.company_branch_id,
+                "menu_item_id": item.id,
+                "price": row.price,
+                "available": row.available,
+            }
+            for row, item in zip(rows, items)
+            if row.company_branch_id is not None
+        ]
+        if branch_menus:
+            await self.session.execute(insert(CompanyBranchMenu), branch_menus)
+            branch_ids.update(menu["company_branch_id"] for menu in branch_menus)
+
+        return items, len(branch_menus)
+
+    async def _check_access(
+        self, batch: List[Tuple[int, MenuImportRow]]
+    ) -> List[Tuple[int, MenuImportRow]]:
+        """Строки пачки, которые пользователь вправе импортировать; остальные — в отчет"""
+        if self._user.is_superuser:
+            return batch
+
+        branch_ids = {
+            row.company_branch_id
+            for _, row in batch
+            if row.company_branch_id is not None
+            and row.company_branch_id not in self._branch_companies
+        }
+        if branch_ids:
+            result = await self.session.execute(
+                select(CompanyBranch.id, CompanyBranch.company_id).where(
+                    CompanyBranch.id.in_(branch_ids)
+                )
+            )
+            self._branch_companies.update(result.all())
+
+        allowed = []
+        for row_number, row in batch:
+            errors = []
+            company_ids = set()
+            if row.owner_company_id is None:
+                errors.append("Only administrators can import shared templates")
+            else:
+                company_ids.add(row.owner_company_id)
+            if row.company_branch_id is not None:
+                company_id = self._branch_companies.get(row.company_branch_id)
+                if company_id is None:
+                    errors.append(f"Company branch {row.company_branch_id} not found")
+                else:
+                    company_ids.add(company_id)
+            for company_id in sorted(company_ids):
+                if not await self._is_editor(company_id):
+                    errors.append(f"Insufficient permissions for company {company_id}")
+
+            if errors:
+                self._add_error(row_number, errors)
+            else:
+                allowed.append((row_number, row))
+        return allowed
+
+    async def _is_editor(self, company_id: int) -> bool:
+        if company_id not in self._editor_of:
+            role = await CompanyMembershipService(self.session).get_role(
+                company_id, self._user.id
+            )
+            self._editor_of[company_id] = (
+                role is not None
+                and CompanyMembershipService.has_required_role(role, CompanyRole.EDITOR)
+            )
+        return self._editor_of[company_id]
+
+    @staticmethod
+    def _export_record(row: Any) -> Dict[str, Any]:
+        menu_item: MenuItem = row[0]
+        record: Dict[str, Any] = {
+            "name": menu_item.name,
+            "description": menu_item.description,
+            "category_id": menu_item.category_id,
+            "grams": menu_item.grams,
+            "kilocalories": menu_item.kilocalories,
+            "proteins": menu_item.proteins,
+            "fats": menu_item.fats,
+            "carbohydrated": menu_item.carbohydrated,
+            "is_template": menu_item.is_template,
+            "owner_company_id": menu_item.owner_company_id,
+            "company_branch_id": None,
+            "price": None,
+            "available": None,
+        }
+        if len(row) > 1:
+            price: Decimal = row[2]
+            record.update(
+                company_branch_id=row[1], price=str(price), available=row[3]
+            )
+        return record
+
+    def _add_error(self, row_number: int, errors: List[str]) -> None:
+        self._failed_rows += 1
+        if len(self._errors) < menu_settings.import_max_errors:
+            self._errors.append(MenuImportRowError(row=row_number, errors=errors))
@@ -1,13 +1,92 @@
-from typing import List, Optional
-
-from sqlalchemy import and_, func, or_, select
+import base64
+import json
+import re
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import (ColumnElement, and_, func, literal, literal_column, or_,
+                        select, tuple_)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backoffice.apps.menu.models.menu_item import MenuItem
-from src.backoffice.apps.menu.schemas.menu_item import (MenuItemCreate,
-                                                        MenuItemListResponse,
-                                                        MenuItemUpdate)
+from src.backoffice.apps.menu.services.branch_menu_snapshot_service import \
+    BranchMenuSnapshotService
+from src.backoffice.apps.menu.services.cache_tags import (
+    MENU_ITEM_IMAGES_CACHE_TAG, MENU_ITEMS_CACHE_TAG)
+from src.backoffice.apps.menu.services.category_service import CategoryService
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services import SearchIndexer
+from src.backoffice.apps.menu.schemas.menu_item import (
+    MenuItemCreate, MenuItemCursorResponse, MenuItemListResponse,
+    MenuItemResponse, MenuItemSearchResponse, MenuItemSearchResult,
+    MenuItemTotalMode, MenuItemUpdate)
 from src.backoffice.core.services import SlugService
+from src.backoffice.core.services.response_cache import response_cache
+
+# Поля, по которым разрешена курсорная пагинация; "-" перед полем — по убыванию
+CURSOR_SORT_FIELDS = {
+    "id": MenuItem.id,
+    "name": MenuItem.name,
+    "created_at": MenuItem.created_at,
+    "updated_at": MenuItem.updated_at,
+}
+
+
+# Конфигурации полнотекстового поиска, совпадают с MenuItem.search_vector
+SEARCH_CONFIGS = ("russian", "english")
+HIGHLIGHT_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+DESCRIPTION_HIGHLIGHT_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5"
+)
+
+
+def build_search_query(search: str) -> Optional[ColumnElement]:
+    """
+    Build a prefix tsquery: every word must match in any of SEARCH_CONFIGS.
+
+    Args:
+        search: Raw user input
+
+    Returns:
+        tsquery expression or None if the input has no words
+    """
+    words = re.findall(r"\w+", search.lower())
+    if not words:
+        return None
+
+    query = None
+    for word in words:
+        word_query = None
+        for config in SEARCH_CONFIGS:
+            # Конфигурация подставляется литералом: это имя regconfig, а не строка
+            part = func.to_tsquery(
+                literal_column(f"'{config}'"), literal(f"{word}:*")
+            )
+            word_query = part if word_query is None else word_query.op("||")(part)
+        query = word_query if query is None else query.op("&&")(word_query)
+    return query
+
+
+def _encode_cursor(sort: str, key: Any, item_id: int) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps({"s": sort, "k": key, "i": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, item_id = data["k"], int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if data.get("s") != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    if sort.lstrip("-") in ("created_at", "updated_at"):
+        key = datetime.fromisoformat(key)
+    return key, item_id
 
 
 class MenuItemService:
@@ -42,6 +121,10 @@ class MenuItemService:
         await self.session.flush()
 
         SlugService.set_slug(instance=menu_item, name=menu_item.name)
+        await self.session.commit()
+
+        await SearchIndexer(self.session).index(SearchEntity.MENU_ITEM, [menu_item])
+        await response_cache.invalidate_tags(MENU_ITEMS_CACHE_TAG)
 
         return menu_item
 
@@ -75,6 +158,7 @@ class MenuItemService:
         page: int = 1,
         size: int = 20,
         category_id: Optional[int] = None,
+        include_descendants: bool = False,
         is_template: Optional[bool] = None,
         search: Optional[str] = None,
         visible_for_company_id: Optional[int] = None,  # TODO изменить, мы должны компанию получать иным способом, что просто ее передавать
@@ -87,6 +171,7 @@ class MenuItemService:
             page: Page number (starts from 1)
             size: Pase size
             category_id: Filter by category id
+            include_descendants: Also include items of all subcategories
             is_template: Filter by is_template
             search: Search by title and description
 
@@ -103,14 +188,245 @@ class MenuItemService:
         stmt = select(MenuItem)
         count_stmt = select(func.count(MenuItem.id))
 
+        filters = await self.build_filters(
+            category_id=category_id,
+            include_descendants=include_descendants,
+            is_template=is_template,
+            search=search,
+            visible_for_company_id=visible_for_company_id,
+        )
+
+        if filters:
+            stmt = stmt.where(and_(*filters))
+            count_stmt = count_stmt.where(and_(*filters))
+
+        total = await self.session.scalar(count_stmt)
+
+        offset = (page - 1) * size
+        stmt = stmt.offset(offset).limit(size)
+
+        result = await self.session.execute(stmt)
+        items = result.scalars().all()
+        await CategoryService(self.session).fill_breadcrumbs(items)
+
+        pages = (total + size - 1) // size
+
+        return MenuItemListResponse(
+            items=items, total=total, page=page, size=size, pages=pages
+        )
+
+    async def get_cursor_page(
+        self,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        total_mode: MenuItemTotalMode = MenuItemTotalMode.NONE,
+        category_id: Optional[int] = None,
+        include_descendants: bool = False,
+        is_template: Optional[bool] = None,
+        search: Optional[str] = None,
+        visible_for_company_id: Optional[int] = None,
+    ) -> MenuItemCursorResponse:
+        """
+        Get list MenuItem with keyset pagination over (sort_key, id).
+
+        Cost of a page does not depend on how deep the cursor is.
+
+        Args:
+            size: Page size
+            cursor: Opaque cursor from the previous page
+            sort: Sort field, "-" prefix for descending order
+            total_mode: How to compute total: exact, estimate or none
+            category_id: Filter by category id
+            include_descendants: Also include items of all subcategories
+            is_template: Filter by is_template
+            search: Search by title and description
+            visible_for_company_id: Show templates and items of this company
+
+        Returns:
+            Page of MenuItem with next cursor
+
+        Raises:
+            ValueError: Unknown sort field or invalid cursor
+        """
+        descending = sort.startswith("-")
+        sort_column = CURSOR_SORT_FIELDS.get(sort.lstrip("-"))
+        if sort_column is None:
+            raise ValueError(f"Unsupported sort field: {sort}")
+
+        filters = await self.build_filters(
+            category_id=category_id,
+            include_descendants=include_descendants,
+            is_template=is_template,
+            search=search,
+            visible_for_company_id=visible_for_company_id,
+        )
+
+        total: Optional[int] = None
+        if total_mode == MenuItemTotalMode.EXACT:
+            total = await self.session.scalar(
+                select(func.count(MenuItem.id)).where(*filters)
+            )
+        elif total_mode == MenuItemTotalMode.ESTIMATE:
+            total = await self._estimate_count(filters)
+
+        stmt = select(MenuItem).where(*filters)
+
+        if sort_column is MenuItem.id:
+            order_by = [MenuItem.id.desc() if descending else MenuItem.id]
+        else:
+            order_by = (
+                [sort_column.desc(), MenuItem.id.desc()]
+                if descending
+                else [sort_column, MenuItem.id]
+            )
+
+        if cursor:
+            key, last_id = _decode_cursor(cursor, sort)
+            if sort_column is MenuItem.id:
+                position = MenuItem.id < last_id if descending else MenuItem.id > last_id
+            else:
+                row = tuple_(sort_column, MenuItem.id)
+                position = (
+                    row < tuple_(key, last_id) if descending else row > tuple_(key, last_id)
+                )
+            stmt = stmt.where(position)
+
+        # Лишняя строка показывает, есть ли следующая страница
+        stmt = stmt.order_by(*order_by).limit(size + 1)
+
+        result = await self.session.execute(stmt)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            last = items[-1]
+            next_cursor = _encode_cursor(sort, getattr(last, sort_column.key), last.id)
+
+        await CategoryService(self.session).fill_breadcrumbs(items)
+
+        return MenuItemCursorResponse(
+            items=items,
+            size=size,
+            next_cursor=next_cursor,
+            total=total,
+            total_is_estimate=total_mode == MenuItemTotalMode.ESTIMATE,
+        )
+
+    async def search(
+        self,
+        query: str,
+        page: int = 1,
+        size: int = 20,
+        category_id: Optional[int] = None,
+        include_descendants: bool = False,
+        is_template: Optional[bool] = None,
+        visible_for_company_id: Optional[int] = None,
+    ) -> MenuItemSearchResponse:
+        """
+        Full-text search of MenuItem ranked by relevance.
+
+        Args:
+            query: Search query, the last words may be incomplete
+            page: Page number (starts from 1)
+            size: Page size
+            category_id: Filter by category id
+            include_descendants: Also include items of all subcategories
+            is_template: Filter by is_template
+            visible_for_company_id: Show templates and items of this company
+
+        Returns:
+            Ranked MenuItem with highlighted name and description
+        """
+        search_query = build_search_query(query)
+        if search_query is None:
+            return MenuItemSearchResponse(
+                query=query, items=[], total=0, page=page, size=size
+            )
+
+        filters = await self.build_filters(
+            category_id=category_id,
+            include_descendants=include_descendants,
+            is_template=is_template,
+            visible_for_company_id=visible_for_company_id,
+        )
+        filters.append(MenuItem.search_vector.op("@@")(search_query))
+
+        total = await self.session.scalar(
+            select(func.count(MenuItem.id)).where(*filters)
+        )
+
+        # Ранжирование и подсветка в подзапросе, чтобы ts_headline считался
+        # только для строк текущей страницы
+        rank = func.ts_rank_cd(MenuItem.search_vector, search_query).label("rank")
+        page_stmt = (
+            select(MenuItem.id, rank)
+            .where(*filters)
+            .order_by(rank.desc(), MenuItem.id)
+            .offset((page - 1) * size)
+            .limit(size)
+            .subquery()
+        )
+        stmt = (
+            select(
+                MenuItem,
+                page_stmt.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIGS[0], MenuItem.name, search_query, HIGHLIGHT_OPTIONS
+                ),
+                func.ts_headline(
+                    SEARCH_CONFIGS[0],
+                    MenuItem.description,
+                    search_query,
+                    DESCRIPTION_HIGHLIGHT_OPTIONS,
+                ),
+            )
+            .join(page_stmt, page_stmt.c.id == MenuItem.id)
+            .order_by(page_stmt.c.rank.desc(), MenuItem.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        items = [row[0] for row in rows]
+        await CategoryService(self.session).fill_breadcrumbs(items)
+
+        results = [
+            MenuItemSearchResult(
+                **MenuItemResponse.model_validate(item).model_dump(),
+                rank=item_rank,
+                name_highlight=name_highlight,
+                description_highlight=description_highlight,
+            )
+            for item, item_rank, name_highlight, description_highlight in rows
+        ]
+
+        return MenuItemSearchResponse(
+            query=query, items=results, total=total, page=page, size=size
+        )
+
+    async def build_filters(
+        self,
+        category_id: Optional[int] = None,
+        include_descendants: bool = False,
+        is_template: Optional[bool] = None,
+        search: Optional[str] = None,
+        visible_for_company_id: Optional[int] = None,
+    ) -> list:
+        """Собрать условия фильтрации списка MenuItem"""
         filters = []
 
-        if category_id is not None:
+        if category_id is not None and include_descendants:
+            subtree_ids = await CategoryService(self.session).get_subtree_ids_stmt(
+                category_id
+            )
+            filters.append(MenuItem.category_id.in_(subtree_ids))
+        elif category_id is not None:
             filters.append(MenuItem.category_id == category_id)
 
         if is_template is not None:
             filters.append(MenuItem.is_template == is_template)
 
+        # Поиск по подстроке; полнотекстовый поиск — через search()
         if search:
             search_filter = and_(
                 MenuItem.name.ilike(f"%{search}%"),
@@ -126,23 +442,30 @@ class MenuItemService:
             )
             filters.append(visibility_filter)
 
-        if filters:
-            stmt = stmt.where(and_(*filters))
-            count_stmt = count_stmt.where(and_(*filters))
-
-        total = await self.session.scalar(count_stmt)
-
-        offset = (page - 1) * size
-        stmt = stmt.offset(offset).limit(size)
-
-        result = await self.session.execute(stmt)
-        items = result.scalars().all()
-
-        pages = (total + size - 1) // size
+        return filters
 
-        return MenuItemListResponse(
-            items=items, total=total, page=page, size=size, pages=pages
+    async def _estimate_count(self, filters: list) -> int:
+        """
+        Оценка количества строк по плану запроса без полного сканирования.
+        """
+        connection = await self.session.connection()
+        # Запрос компилируется диалектом драйвера, значения фильтров уходят
+        # отдельными параметрами, а не подставляются в текст EXPLAIN
+        compiled = select(MenuItem.id).where(*filters).compile(
+            dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        params = (
+            tuple(compiled.params[name] for name in compiled.positiontup)
+            if compiled.positional
+            else compiled.params
         )
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", params
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     async def update_by_slug(
         self, menu_item_slug: str, update_data: MenuItemUpdate
@@ -169,6 +492,14 @@ class MenuItemService:
         if "name" in update_dict:
             SlugService.set_slug(instance=menu_item, name=menu_item.name)
 
+        await BranchMenuSnapshotService(self.session).invalidate_for_menu_items(
+            [menu_item.id]
+        )
+        await self.session.commit()
+
+        await SearchIndexer(self.session).index(SearchEntity.MENU_ITEM, [menu_item])
+        await response_cache.invalidate_tags(MENU_ITEMS_CACHE_TAG)
+
         return menu_item
 
     async def delete_by_slug(self, menu_item_slug: str) -> bool:
@@ -185,7 +516,18 @@ class MenuItemService:
         if not menu_item:
             return False
 
+        # Филиалы ищем до удаления: строки company_branch_menu уйдут каскадом
+        await BranchMenuSnapshotService(self.session).invalidate_for_menu_items(
+            [menu_item.id]
+        )
         await self.session.delete(menu_item)
+        await self.session.commit()
+
+        await SearchIndexer(self.session).delete(SearchEntity.MENU_ITEM, [menu_item.id])
+        await response_cache.invalidate_tags(
+            MENU_ITEMS_CACHE_TAG,
+            MENU_ITEM_IMAGES_CACHE_TAG.format(menu_item_id=menu_item.id),
+        )
         return True
 
     async def get_templates(self) -> List[MenuItem]:
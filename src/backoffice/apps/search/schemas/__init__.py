@@ -0,0 +1,8 @@
+from .search import ReindexResponse, SearchEntity, SearchHit, SearchResponse
+
+__all__ = [
+    "SearchEntity",
+    "SearchHit",
+    "SearchResponse",
+    "ReindexResponse",
+]
@@ -0,0 +1,41 @@
+from enum import Enum
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class SearchEntity(str, Enum):
+    """Типы индексируемых сущностей"""
+
+    MENU_ITEM = "menu_item"
+    CATEGORY = "category"
+    COMPANY = "company"
+    CITY = "city"
+    STREET = "street"
+
+
+class SearchHit(BaseModel):
+    """Найденный документ"""
+
+    entity: SearchEntity = Field(..., description="Тип сущности")
+    id: int = Field(..., description="ID сущности")
+    name: str = Field(..., description="Название")
+    score: float = Field(..., description="Релевантность")
+    data: Dict[str, Any] = Field(
+        default_factory=dict, description="Остальные поля документа"
+    )
+
+
+class SearchResponse(BaseModel):
+    """Результаты автодополнения"""
+
+    query: str
+    hits: List[SearchHit]
+
+
+class ReindexResponse(BaseModel):
+    """Результат переиндексации"""
+
+    indexed: Dict[SearchEntity, int] = Field(
+        ..., description="Количество проиндексированных документов по типам"
+    )
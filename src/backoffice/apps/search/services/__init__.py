@@ -0,0 +1,13 @@
+from .search_backend import (ElasticsearchBackend, InMemorySearchBackend,
+                             SearchBackend, SearchUnavailableError,
+                             search_backend)
+from .search_indexer import SearchIndexer
+
+__all__ = [
+    "SearchBackend",
+    "ElasticsearchBackend",
+    "InMemorySearchBackend",
+    "SearchUnavailableError",
+    "SearchIndexer",
+    "search_backend",
+]
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from elasticsearch import (ApiError, AsyncElasticsearch, NotFoundError,
+                           TransportError)
+from elasticsearch.helpers import async_bulk
+
+from src.backoffice.apps.search.schemas import SearchEntity, SearchHit
+from src.backoffice.core.config import search_settings
+from src.backoffice.core.logging import get_logger
+
+# Настройки индекса: name индексируется edge-ngram'ами для автодополнения,
+# а запрос разбирается обычным анализатором, чтобы "пиц" находил "пицца"
+INDEX_SETTINGS: Dict[str, Any] = {
+    "analysis": {
+        "filter": {
+            "autocomplete_filter": {
+                "type": "edge_ngram",
+                "min_gram": 1,
+                "max_gram": 20,
+            }
+        },
+        "analyzer": {
+            "autocomplete": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": ["lowercase", "asciifolding", "autocomplete_filter"],
+            },
+            "autocomplete_search": {
+                "type": "custom",
+                "tokenizer": "standard",
+                "filter": ["lowercase", "asciifolding"],
+            },
+        },
+    }
+}
+
+INDEX_MAPPINGS: Dict[str, Any] = {
+    "dynamic": True,
+    "properties": {
+        "entity": {"type": "keyword"},
+        "name": {
+            "type": "text",
+            "analyzer": "autocomplete",
+            "search_analyzer": "autocomplete_search",
+            "fields": {"raw": {"type": "keyword"}},
+        },
+        "name_en": {
+            "type": "text",
+            "analyzer": "autocomplete",
+            "search_analyzer": "autocomplete_search",
+        },
+        "description": {"type": "text"},
+    },
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(value: Any) -> List[str]:
+    return _TOKEN_RE.findall(str(value).lower()) if value else []
+
+
+class SearchUnavailableError(Exception):
+    """Поисковый индекс недоступен (нет соединения, таймаут, ошибка кластера)"""
+
+
+class SearchBackend(ABC):
+    """Хранилище поисковых документов"""
+
+    @abstractmethod
+    async def ensure_index(self, entity: SearchEntity) -> None:
+        """Создать индекс сущности, если его нет"""
+
+    @abstractmethod
+    async def bulk_index(
+        self, entity: SearchEntity, documents: Iterable[Dict[str, Any]]
+    ) -> int:
+        """Проиндексировать документы (upsert по id), вернуть количество"""
+
+    @abstractmethod
+    async def delete(self, entity: SearchEntity, ids: Sequence[int]) -> None:
+        """Удалить документы по id"""
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        entities: Sequence[SearchEntity],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        """Автодополнение по названию"""
+
+    async def close(self) -> None:
+        """Освободить соединения"""
+
+
+class ElasticsearchBackend(SearchBackend):
+    """Поиск в Elasticsearch, запись через bulk API"""
+
+    def __init__(self) -> None:
+        self._client: Optional[AsyncElasticsearch] = None
+        self._ready: set[SearchEntity] = set()
+        self._lock = asyncio.Lock()
+        self._logger = get_logger("search.elasticsearch")
+
+    @property
+    def client(self) -> AsyncElasticsearch:
+        if self._client is None:
+            basic_auth = None
+            if search_settings.elasticsearch_username:
+                basic_auth = (
+                    search_settings.elasticsearch_username,
+                    search_settings.elasticsearch_password or "",
+                )
+            self._client = AsyncElasticsearch(
+                search_settings.elasticsearch_url,
+                basic_auth=basic_auth,
+                request_timeout=search_settings.request_timeout,
+            )
+        return self._client
+
+    @staticmethod
+    def index_name(entity: SearchEntity) -> str:
+        return f"{search_settings.index_prefix}{entity.value}"
+
+    async def ensure_index(self, entity: SearchEntity) -> None:
+        if entity in self._ready:
+            return
+        async with self._lock:
+            if entity in self._ready:
+                return
+            index = self.index_name(entity)
+            if not await self.client.indices.exists(index=index):
+                await self.client.indices.create(
+                    index=index, settings=INDEX_SETTINGS, mappings=INDEX_MAPPINGS
+                )
+                self._logger.info("search_index_created", extra={"index": index})
+            self._ready.add(entity)
+
+    async def bulk_index(
+        self, entity: SearchEntity, documents: Iterable[Dict[str, Any]]
+    ) -> int:
+        await self.ensure_index(entity)
+        index = self.index_name(entity)
+        actions = (
+            {"_op_type": "index", "_index": index, "_id": doc["id"], "_source": doc}
+            for doc in documents
+        )
+        success, _ = await async_bulk(
+            self.client,
+            actions,
+            chunk_size=search_settings.bulk_chunk_size,
+            raise_on_error=True,
+        )
+        return success
+
+    async def delete(self, entity: SearchEntity, ids: Sequence[int]) -> None:
+        if not ids:
+            return
+        await self.ensure_index(entity)
+        index = self.index_name(entity)
+        actions = ({"_op_type": "delete", "_index": index, "_id": i} for i in ids)
+        # Отсутствующие документы не считаем ошибкой
+        await async_bulk(self.client, actions, raise_on_error=False)
+
+    async def search(
+        self,
+        query: str,
+        entities: Sequence[SearchEntity],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        indices = ",".join(self.index_name(entity) for entity in entities)
+        # Фильтр применяется только к документам, у которых есть такое поле:
+        # так company_id отсекает чужие позиции, но оставляет шаблоны
+        filter_clauses = [
+            {
+                "bool": {
+                    "should": [
+                        {"term": {field: value}},
+                        {"bool": {"must_not": {"exists": {"field": field}}}},
+                    ]
+                }
+            }
+            for field, value in (filters or {}).items()
+        ]
+        body = {
+            "bool": {
+                "must": {
+                    "multi_match": {
+                        "query": query,
+                        "fields": ["name^3", "name_en^2"],
+                        "operator": "and",
+                    }
+                },
+                "filter": filter_clauses,
+            }
+        }
+        try:
+            response = await self.client.search(
+                index=indices,
+                query=body,
+                size=limit,
+                ignore_unavailable=True,
+            )
+        except NotFoundError:
+            return []
+        except (ApiError, TransportError) as e:
+            self._logger.error(
+                "search_failed", extra={"index": indices, "error": str(e)}
+            )
+            raise SearchUnavailableError(str(e)) from e
+
+        return [
+            SearchHit(
+                entity=hit["_source"]["entity"],
+                id=hit["_source"]["id"],
+                name=hit["_source"]["name"],
+                score=hit["_score"] or 0.0,
+                data=hit["_source"],
+            )
+            for hit in response["hits"]["hits"]
+        ]
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+class InMemorySearchBackend(SearchBackend):
+    """In-process поиск для тестов и локальной разработки.
+
+    Повторяет семантику индекса Elasticsearch: каждое слово запроса
+    должно быть префиксом какого-либо слова в name или name_en.
+    """
+
+    def __init__(self) -> None:
+        self._documents: Dict[SearchEntity, Dict[int, Dict[str, Any]]] = {}
+
+    async def ensure_index(self, entity: SearchEntity) -> None:
+        self._documents.setdefault(entity, {})
+
+    async def bulk_index(
+        self, entity: SearchEntity, documents: Iterable[Dict[str, Any]]
+    ) -> int:
+        await self.ensure_index(entity)
+        count = 0
+        for doc in documents:
+            self._documents[entity][doc["id"]] = dict(doc)
+            count += 1
+        return count
+
+    async def delete(self, entity: SearchEntity, ids: Sequence[int]) -> None:
+        index = self._documents.get(entity, {})
+        for doc_id in ids:
+            index.pop(doc_id, None)
+
+    async def search(
+        self,
+        query: str,
+        entities: Sequence[SearchEntity],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+    ) -> List[SearchHit]:
+        query_tokens = _tokens(query)
+        if not query_tokens:
+            return []
+
+        hits: List[SearchHit] = []
+        for entity in entities:
+            for doc in self._documents.get(entity, {}).values():
+                # Как и в Elasticsearch, null равнозначен отсутствию поля
+                if any(
+                    doc.get(field) is not None and doc[field] != value
+                    for field, value in (filters or {}).items()
+                ):
+                    continue
+                score = self._score(query_tokens, doc)
+                if score:
+                    hits.append(
+                        SearchHit(
+                            entity=entity,
+                            id=doc["id"],
+                            name=doc["name"],
+                            score=score,
+                            data=doc,
+                        )
+                    )
+
+        hits.sort(key=lambda hit: (-hit.score, hit.name))
+        return hits[:limit]
+
+    @staticmethod
+    def _score(query_tokens: List[str], doc: Dict[str, Any]) -> float:
+        score = 0.0
+        for field, weight in (("name", 3.0), ("name_en", 2.0)):
+            doc_tokens = _tokens(doc.get(field))
+            matched = [
+                token
+                for token in query_tokens
+                if any(doc_token.startswith(token) for doc_token in doc_tokens)
+            ]
+            if len(matched) == len(query_tokens):
+                # Полные совпадения слов ценнее префиксных
+                exact = sum(1 for token in matched if token in doc_tokens)
+                score = max(score, weight * (len(matched) + exact))
+        return score
+
+    def clear(self) -> None:
+        self._documents.clear()
+
+
+def create_search_backend() -> SearchBackend:
+    if search_settings.is_elasticsearch:
+        return ElasticsearchBackend()
+    return InMemorySearchBackend()
+
+
+search_backend = create_search_backend()
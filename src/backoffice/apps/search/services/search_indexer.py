@@ -0,0 +1,162 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backoffice.apps.company.models import Company
+from src.backoffice.apps.location.models import City, Street
+from src.backoffice.apps.menu.models import Category, MenuItem
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services.search_backend import (SearchBackend,
+                                                                search_backend)
+from src.backoffice.core.config import search_settings
+from src.backoffice.core.logging import get_logger
+
+logger = get_logger("search.indexer")
+
+
+def menu_item_document(menu_item: MenuItem) -> Dict[str, Any]:
+    return {
+        "entity": SearchEntity.MENU_ITEM.value,
+        "id": menu_item.id,
+        "name": menu_item.name,
+        "slug": menu_item.slug,
+        "description": menu_item.description,
+        "category_id": menu_item.category_id,
+        "is_template": menu_item.is_template,
+        "company_id": menu_item.owner_company_id,
+    }
+
+
+def category_document(category: Category) -> Dict[str, Any]:
+    return {
+        "entity": SearchEntity.CATEGORY.value,
+        "id": category.id,
+        "name": category.name,
+        "slug": category.slug,
+        "parent_id": category.parent_id,
+    }
+
+
+def company_document(company: Company) -> Dict[str, Any]:
+    return {
+        "entity": SearchEntity.COMPANY.value,
+        "id": company.id,
+        "name": company.name,
+        "subdomain": company.subdomain,
+        "description": company.description,
+    }
+
+
+def city_document(city: City) -> Dict[str, Any]:
+    return {
+        "entity": SearchEntity.CITY.value,
+        "id": city.id,
+        "name": city.name,
+        "name_en": city.name_en,
+        "country_id": city.country_id,
+        "region_id": city.region_id,
+        "is_active": city.is_active,
+    }
+
+
+def street_document(street: Street) -> Dict[str, Any]:
+    return {
+        "entity": SearchEntity.STREET.value,
+        "id": street.id,
+        "name": street.name,
+        "name_en": street.name_en,
+        "city_id": street.city_id,
+        "street_type": street.street_type,
+        "is_active": street.is_active,
+    }
+
+
+# Модель и сборщик документа для каждого типа сущности
+ENTITY_SOURCES: Dict[SearchEntity, Tuple[Type[Any], Callable[[Any], Dict[str, Any]]]] = {
+    SearchEntity.MENU_ITEM: (MenuItem, menu_item_document),
+    SearchEntity.CATEGORY: (Category, category_document),
+    SearchEntity.COMPANY: (Company, company_document),
+    SearchEntity.CITY: (City, city_document),
+    SearchEntity.STREET: (Street, street_document),
+}
+
+
+class SearchIndexer:
+    """Синхронизация поискового индекса с БД"""
+
+    def __init__(
+        self, session: AsyncSession, backend: Optional[SearchBackend] = None
+    ) -> None:
+        self.session = session
+        self.backend = backend or search_backend
+
+    async def reindex(
+        self, entities: Optional[Sequence[SearchEntity]] = None
+    ) -> Dict[SearchEntity, int]:
+        """
+        Полная переиндексация. Строки читаются из БД потоком пачками
+        по bulk_chunk_size и сразу отправляются в индекс bulk-запросами,
+        без загрузки всей таблицы в память.
+
+        Args:
+            entities: Типы сущностей, по умолчанию все
+
+        Returns:
+            Dict[SearchEntity, int]: Количество документов по типам
+        """
+        indexed: Dict[SearchEntity, int] = {}
+        for entity in entities or list(SearchEntity):
+            model, build_document = ENTITY_SOURCES[entity]
+            await self.backend.ensure_index(entity)
+
+            stmt = (
+                select(model)
+                .order_by(model.id)
+                .execution_options(yield_per=search_settings.bulk_chunk_size)
+            )
+            result = await self.session.stream_scalars(stmt)
+
+            count = 0
+            async for partition in result.partitions():
+                count += await self.backend.bulk_index(
+                    entity, (build_document(row) for row in partition)
+                )
+            indexed[entity] = count
+            logger.info(
+                "search_reindex_completed",
+                extra={"entity": entity.value, "count": count},
+            )
+        return indexed
+
+    async def index(self, entity: SearchEntity, instances: Iterable[Any]) -> None:
+        """
+        Проиндексировать измененные объекты.
+        Ошибки индекса логируются и не прерывают запись в БД.
+        """
+        _, build_document = ENTITY_SOURCES[entity]
+        documents = [build_document(instance) for instance in instances]
+        if not documents:
+            return
+        try:
+            await self.backend.bulk_index(entity, documents)
+        except Exception as e:
+            logger.warning(
+                "search_index_failed",
+                extra={"entity": entity.value, "count": len(documents), "error": str(e)},
+            )
+
+    async def delete(self, entity: SearchEntity, ids: Sequence[int]) -> None:
+        """
+        Удалить документы удаленных объектов.
+        Ошибки индекса логируются и не прерывают запись в БД.
+        """
+        if not ids:
+            return
+        try:
+            await self.backend.delete(entity, ids)
+        except Exception as e:
+            logger.warning(
+                "search_delete_failed",
+                extra={"entity": entity.value, "count": len(ids), "error": str(e)},
+            )
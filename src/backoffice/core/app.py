@@ -2,9 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.backoffice.api.v1 import api_router
+from src.backoffice.api.well_known import router as well_known_router
 from src.backoffice.core.config import (auth_settings, cors_settings,
                                         logging_settings)
 from src.backoffice.core.exceptions import register_exception_handlers
+from src.backoffice.core.lifespan import lifespan
 from src.backoffice.core.logging import configure_logging
 from src.backoffice.core.middleware import (AuthMiddleware,
                                             RequestContextMiddleware)
@@ -18,6 +20,7 @@ def create_app() -> FastAPI:
         title="Backoffice API",
         description="API для управления backoffice с поддержкой авторизации и геокодирования",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     # Request context and auth middleware
@@ -36,6 +39,7 @@ def create_app() -> FastAPI:
 
     # Routers
     app.include_router(api_router, prefix="/api/v1")
+    app.include_router(well_known_router)
 
     # Exceptions
     register_exception_handlers(app)
@@ -62,6 +62,135 @@ class GeocodingSettings:
         )  # 1 час
         self.timeout = int(os.environ.get("GEOCODING_TIMEOUT", "10"))  # 10 секунд
         self.max_retries = int(os.environ.get("GEOCODING_MAX_RETRIES", "3"))
+        # Пул соединений к провайдерам: соединений на провайдера по умолчанию,
+        # время жизни записи кэша DNS и простаивающего keep-alive соединения (с)
+        self.max_connections = int(os.environ.get("GEOCODING_MAX_CONNECTIONS", "10"))
+        self.dns_cache_ttl = int(os.environ.get("GEOCODING_DNS_CACHE_TTL", "300"))
+        self.keepalive_timeout = float(
+            os.environ.get("GEOCODING_KEEPALIVE_TIMEOUT", "30")
+        )
+        # Ограничение запросов к провайдерам (token bucket): memory — на каждый
+        # воркер отдельно, redis — общий лимит для всех воркеров
+        self.rate_limit_backend = os.environ.get(
+            "GEOCODING_RATE_LIMIT_BACKEND", "memory"
+        ).lower()
+        self.rate_limit_key_prefix = os.environ.get(
+            "GEOCODING_RATE_LIMIT_KEY_PREFIX", "backoffice:geocoding:rate:"
+        )
+        # Сколько секунд запрос может ждать в очереди, прежде чем получить отказ
+        self.rate_limit_max_wait = float(
+            os.environ.get("GEOCODING_RATE_LIMIT_MAX_WAIT", "2")
+        )
+
+        # Маршрутизация по провайдерам: порядок перебора при отказах и стратегия
+        # failover (первый успешный ответ) или merge (все провайдеры сразу,
+        # результаты объединяются по координатам)
+        self.provider_order = [
+            provider.strip()
+            for provider in os.environ.get(
+                "GEOCODING_PROVIDER_ORDER", "google,yandex,nominatim"
+            ).split(",")
+            if provider.strip()
+        ]
+        self.strategy = os.environ.get("GEOCODING_STRATEGY", "failover").lower()
+        # Hedged-запрос: если провайдер отвечает дольше p95 своих последних
+        # ответов, параллельно спрашиваем следующего
+        self.hedge_enabled = (
+            os.environ.get("GEOCODING_HEDGE_ENABLED", "false").lower() == "true"
+        )
+        self.hedge_quantile = float(os.environ.get("GEOCODING_HEDGE_QUANTILE", "0.95"))
+        self.hedge_min_delay = float(
+            os.environ.get("GEOCODING_HEDGE_MIN_DELAY", "0.2")
+        )
+        self.hedge_max_delay = float(os.environ.get("GEOCODING_HEDGE_MAX_DELAY", "2"))
+        # Circuit breaker провайдера: ошибок подряд до размыкания и пауза (с)
+        self.breaker_failures = int(os.environ.get("GEOCODING_BREAKER_FAILURES", "5"))
+        self.breaker_reset_timeout = float(
+            os.environ.get("GEOCODING_BREAKER_RESET_TIMEOUT", "30")
+        )
+        # Результаты ближе этого расстояния (м) считаются одним местом
+        self.merge_distance = float(os.environ.get("GEOCODING_MERGE_DISTANCE", "25"))
+
+        # Пакетное геокодирование: максимум запросов в синхронном пакете и
+        # одновременных запросов к провайдерам на пакет
+        self.batch_max_size = int(os.environ.get("GEOCODING_BATCH_MAX_SIZE", "100"))
+        self.batch_concurrency = int(
+            os.environ.get("GEOCODING_BATCH_CONCURRENCY", "5")
+        )
+        # Сколько раз запрос пакета ждет освобождения лимита провайдера
+        self.batch_rate_limit_retries = int(
+            os.environ.get("GEOCODING_BATCH_RATE_LIMIT_RETRIES", "3")
+        )
+        # Фоновые задания для больших пакетов: размер, порция запросов на
+        # один проход и время хранения состояния в Redis (с)
+        self.batch_job_max_size = int(
+            os.environ.get("GEOCODING_BATCH_JOB_MAX_SIZE", "10000")
+        )
+        self.batch_job_chunk_size = int(
+            os.environ.get("GEOCODING_BATCH_JOB_CHUNK_SIZE", "100")
+        )
+        self.batch_job_ttl = int(os.environ.get("GEOCODING_BATCH_JOB_TTL", "86400"))
+        self.batch_job_key_prefix = os.environ.get(
+            "GEOCODING_BATCH_JOB_KEY_PREFIX", "backoffice:geocoding:batch:"
+        )
+        # Отложенная запись результатов: ответ не ждет БД, строки пишутся
+        # фоновой задачей пачками (очередь — в вызовах, пачка — в строках)
+        self.deferred_writes = (
+            os.environ.get("GEOCODING_DEFERRED_WRITES", "false").lower() == "true"
+        )
+        self.write_queue_size = int(
+            os.environ.get("GEOCODING_WRITE_QUEUE_SIZE", "1000")
+        )
+        self.write_batch_size = int(
+            os.environ.get("GEOCODING_WRITE_BATCH_SIZE", "500")
+        )
+        self.write_flush_interval = float(
+            os.environ.get("GEOCODING_WRITE_FLUSH_INTERVAL", "0.5")
+        )
+        # Кэш ответов перед таблицей geocoding_results: LRU воркера, затем Redis.
+        # Пустые ответы и ошибки провайдеров кэшируются на меньшее время (с)
+        self.response_cache_enabled = (
+            os.environ.get("GEOCODING_RESPONSE_CACHE_ENABLED", "true").lower()
+            == "true"
+        )
+        self.response_cache_local_ttl = int(
+            os.environ.get("GEOCODING_RESPONSE_CACHE_LOCAL_TTL", "60")
+        )
+        self.response_cache_local_max_size = int(
+            os.environ.get("GEOCODING_RESPONSE_CACHE_LOCAL_MAX_SIZE", "10000")
+        )
+        self.response_cache_redis = (
+            os.environ.get("GEOCODING_RESPONSE_CACHE_REDIS", "true").lower() == "true"
+        )
+        self.response_cache_redis_ttl = int(
+            os.environ.get("GEOCODING_RESPONSE_CACHE_REDIS_TTL", "3600")
+        )
+        self.response_cache_negative_ttl = int(
+            os.environ.get("GEOCODING_RESPONSE_CACHE_NEGATIVE_TTL", "300")
+        )
+        self.response_cache_error_ttl = int(
+            os.environ.get("GEOCODING_RESPONSE_CACHE_ERROR_TTL", "30")
+        )
+        self.response_cache_key_prefix = os.environ.get(
+            "GEOCODING_RESPONSE_CACHE_KEY_PREFIX", "backoffice:geocoding:"
+        )
+        # Кэш обратного геокодирования: для точки берется сохраненный ответ
+        # (того же языка и типа результата) ближайшей точки не дальше
+        # GEOCODING_REVERSE_CACHE_DISTANCE метров. В geocoding_results хранится
+        # полный geohash точки запроса, а кандидаты ищутся по префиксу в ее
+        # ячейке и соседних, поэтому смена точности не отключает кэш. Ячейка
+        # должна быть больше этого расстояния (точность 7 — около 150 м)
+        self.reverse_cache_enabled = (
+            os.environ.get("GEOCODING_REVERSE_CACHE_ENABLED", "true").lower()
+            == "true"
+        )
+        self.reverse_geohash_precision = min(
+            max(int(os.environ.get("GEOCODING_REVERSE_GEOHASH_PRECISION", "7")), 1),
+            12,
+        )
+        self.reverse_cache_distance = float(
+            os.environ.get("GEOCODING_REVERSE_CACHE_DISTANCE", "30")
+        )
 
         # Настройки для разных провайдеров
         self.providers_config = {
@@ -70,28 +199,54 @@ class GeocodingSettings:
                 "api_key": self.google_api_key,
                 "base_url": self.google_base_url,
                 "rate_limit": 2500,  # запросов в день
+                "rate_period": 86400,
+                "burst": 50,
                 "timeout": self.timeout,
+                "max_connections": int(
+                    os.environ.get(
+                        "GEOCODING_GOOGLE_MAX_CONNECTIONS", str(self.max_connections)
+                    )
+                ),
             },
             "yandex": {
                 "enabled": bool(self.yandex_api_key),
                 "api_key": self.yandex_api_key,
                 "base_url": self.yandex_base_url,
                 "rate_limit": 1000,  # запросов в день
+                "rate_period": 86400,
+                "burst": 10,
                 "timeout": self.timeout,
+                "max_connections": int(
+                    os.environ.get(
+                        "GEOCODING_YANDEX_MAX_CONNECTIONS", str(self.max_connections)
+                    )
+                ),
             },
             "nominatim": {
                 "enabled": True,  # бесплатный
                 "base_url": self.nominatim_base_url,
                 "user_agent": self.nominatim_user_agent,
                 "rate_limit": 1,  # запрос в секунду
+                "rate_period": 1,
+                "burst": 1,
                 "timeout": self.timeout,
+                "max_connections": int(
+                    os.environ.get("GEOCODING_NOMINATIM_MAX_CONNECTIONS", "2")
+                ),
             },
             "mapbox": {
                 "enabled": bool(self.mapbox_api_key),
                 "api_key": self.mapbox_api_key,
                 "base_url": self.mapbox_base_url,
                 "rate_limit": 100000,  # запросов в месяц
+                "rate_period": 30 * 86400,
+                "burst": 50,
                 "timeout": self.timeout,
+                "max_connections": int(
+                    os.environ.get(
+                        "GEOCODING_MAPBOX_MAX_CONNECTIONS", str(self.max_connections)
+                    )
+                ),
             },
         }
 
@@ -118,6 +273,32 @@ class AuthSettings:
         self.refresh_token_expire_days = int(
             os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "7")
         )
+        # Сколько проверенных токенов держать в памяти воркера (0 — без кэша)
+        self.verified_token_cache_size = int(
+            os.environ.get("JWT_VERIFIED_CACHE_SIZE", "10000")
+        )
+        # Связка асимметричных ключей (RS256/ES256); без нее токены подписываются
+        # SECRET_KEY по JWT_ALGORITHM
+        self.keyring_file = os.environ.get("JWT_KEYRING_FILE") or None
+        self.keyring_reload_interval = int(
+            os.environ.get("JWT_KEYRING_RELOAD_INTERVAL", "60")
+        )
+        # Принимать токены без kid, подписанные SECRET_KEY (на время перехода)
+        self.allow_symmetric_tokens = (
+            os.environ.get("JWT_ALLOW_SYMMETRIC", "true").lower() == "true"
+        )
+        self.jwks_max_age = int(os.environ.get("JWKS_MAX_AGE", "300"))
+        # Фоновая очистка истекших и отозванных refresh токенов (0 — выключена)
+        self.refresh_token_purge_interval = int(
+            os.environ.get("REFRESH_TOKEN_PURGE_INTERVAL", "3600")
+        )
+        # Сколько дней хранить токен после истечения или отзыва
+        self.refresh_token_purge_grace_days = int(
+            os.environ.get("REFRESH_TOKEN_PURGE_GRACE_DAYS", "1")
+        )
+        self.refresh_token_purge_batch_size = int(
+            os.environ.get("REFRESH_TOKEN_PURGE_BATCH_SIZE", "5000")
+        )
 
         # Google OAuth
         self.google_client_id = os.environ.get("GOOGLE_CLIENT_ID")
@@ -146,7 +327,7 @@ class AuthSettings:
         # Пути, исключенные из авторизации (comma-separated)
         self.auth_excluded_paths = os.environ.get(
             "AUTH_EXCLUDED_PATHS",
-            "/docs,/redoc,/openapi.json,/api/v1/auth/,/api/v1/location/geocoding/,/api/v1/location/locations/,/api/v1/health/",
+            "/docs,/redoc,/openapi.json,/.well-known/,/api/v1/auth/,/api/v1/location/geocoding/,/api/v1/location/locations/,/api/v1/health/,/api/v1/menu/public/",
         ).split(",")
 
 
@@ -258,3 +439,158 @@ class CorsSettings:
 
 
 cors_settings = CorsSettings()
+
+
+class MenuSettings:
+    """Настройки меню: публичные снимки филиалов, импорт и экспорт"""
+
+    def __init__(self):
+        # Сколько секунд воркер отдает снимок меню из памяти без обращения к БД
+        self.snapshot_local_ttl = int(os.environ.get("MENU_SNAPSHOT_LOCAL_TTL", "5"))
+        # Максимальное количество снимков в памяти одного воркера
+        self.snapshot_local_max_size = int(
+            os.environ.get("MENU_SNAPSHOT_LOCAL_MAX_SIZE", "1000")
+        )
+        # Размер пачки строк при массовом импорте меню
+        self.import_batch_size = int(os.environ.get("MENU_IMPORT_BATCH_SIZE", "500"))
+        # Сколько ошибок по строкам возвращать в ответе импорта
+        self.import_max_errors = int(os.environ.get("MENU_IMPORT_MAX_ERRORS", "1000"))
+        # Размер пачки строк при потоковом экспорте меню
+        self.export_batch_size = int(os.environ.get("MENU_EXPORT_BATCH_SIZE", "1000"))
+
+
+menu_settings = MenuSettings()
+
+
+class SearchSettings:
+    """Настройки поискового индекса"""
+
+    def __init__(self):
+        # Бэкенд поиска: elasticsearch; memory — индекс в памяти процесса,
+        # только для тестов и локальной разработки (не общий для воркеров)
+        self.backend = os.environ.get("SEARCH_BACKEND", "elasticsearch").lower()
+        self.elasticsearch_url = os.environ.get(
+            "ELASTICSEARCH_URL", "http://localhost:9200"
+        )
+        self.elasticsearch_username = os.environ.get("ELASTICSEARCH_USERNAME")
+        self.elasticsearch_password = os.environ.get("ELASTICSEARCH_PASSWORD")
+        self.request_timeout = int(os.environ.get("ELASTICSEARCH_TIMEOUT", "10"))
+        # Префикс имен индексов, напр. backoffice_menu_items
+        self.index_prefix = os.environ.get("SEARCH_INDEX_PREFIX", "backoffice_")
+        # Размер пачки при переиндексации (строк из БД и документов в bulk)
+        self.bulk_chunk_size = int(os.environ.get("SEARCH_BULK_CHUNK_SIZE", "500"))
+
+    @property
+    def is_elasticsearch(self) -> bool:
+        return self.backend == "elasticsearch"
+
+
+search_settings = SearchSettings()
+
+
+class RedisSettings:
+    """Настройки подключения к Redis"""
+
+    def __init__(self):
+        self.url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+        self.max_connections = int(os.environ.get("REDIS_MAX_CONNECTIONS", "50"))
+        # Таймауты в секундах
+        self.socket_timeout = float(os.environ.get("REDIS_SOCKET_TIMEOUT", "1.0"))
+        self.connect_timeout = float(os.environ.get("REDIS_CONNECT_TIMEOUT", "1.0"))
+
+
+redis_settings = RedisSettings()
+
+
+class HttpClientSettings:
+    """Настройки исходящих HTTP-клиентов (OAuth провайдеры)"""
+
+    def __init__(self):
+        # HTTP/2 по умолчанию выключен; для включения нужен пакет h2 (httpx[http2])
+        self.http2 = os.environ.get("HTTP_CLIENT_HTTP2", "false").lower() == "true"
+        self.max_connections_per_host = int(
+            os.environ.get("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", "20")
+        )
+        self.max_keepalive_connections = int(
+            os.environ.get("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "10")
+        )
+        # Таймауты в секундах
+        self.keepalive_expiry = float(
+            os.environ.get("HTTP_CLIENT_KEEPALIVE_EXPIRY", "60")
+        )
+        self.connect_timeout = float(os.environ.get("HTTP_CLIENT_CONNECT_TIMEOUT", "3"))
+        self.read_timeout = float(os.environ.get("HTTP_CLIENT_READ_TIMEOUT", "10"))
+        self.pool_timeout = float(os.environ.get("HTTP_CLIENT_POOL_TIMEOUT", "5"))
+        # Повторы: число повторов и базовая задержка экспоненциального backoff
+        self.retries = int(os.environ.get("HTTP_CLIENT_RETRIES", "2"))
+        self.retry_backoff = float(os.environ.get("HTTP_CLIENT_RETRY_BACKOFF", "0.2"))
+
+
+http_client_settings = HttpClientSettings()
+
+
+class CacheSettings:
+    """Настройки кэша ответов GET-эндпоинтов"""
+
+    def __init__(self):
+        self.enabled = os.environ.get("CACHE_ENABLED", "true").lower() == "true"
+        # Бэкенд кэша: redis; memory — LRU в памяти процесса, только для тестов
+        # (инвалидация по тегам не видна другим воркерам)
+        self.backend = os.environ.get("CACHE_BACKEND", "redis").lower()
+        self.key_prefix = os.environ.get("CACHE_KEY_PREFIX", "backoffice:cache:")
+        # Максимальное количество ответов в памяти для memory бэкенда
+        self.local_max_size = int(os.environ.get("CACHE_LOCAL_MAX_SIZE", "10000"))
+        # Защита от stampede: сколько секунд держится блокировка на пересчет ключа
+        # и сколько ждут остальные запросы, прежде чем считать ответ сами
+        self.lock_ttl = float(os.environ.get("CACHE_LOCK_TTL", "10"))
+        self.lock_wait = float(os.environ.get("CACHE_LOCK_WAIT", "2"))
+        # TTL ответов по группам эндпоинтов, в секундах
+        self.location_ttl = int(os.environ.get("CACHE_LOCATION_TTL", "3600"))
+        self.menu_item_ttl = int(os.environ.get("CACHE_MENU_ITEM_TTL", "60"))
+        self.menu_image_ttl = int(os.environ.get("CACHE_MENU_IMAGE_TTL", "300"))
+
+    @property
+    def is_redis(self) -> bool:
+        return self.backend == "redis"
+
+
+cache_settings = CacheSettings()
+
+
+class AuthCacheSettings:
+    """Настройки кэша пользователей и ролей в компаниях для проверок доступа"""
+
+    def __init__(self):
+        self.enabled = os.environ.get("AUTH_CACHE_ENABLED", "true").lower() == "true"
+        # TTL в памяти воркера: до стольких секунд другие воркеры могут видеть
+        # старые данные после изменения
+        self.local_ttl = int(os.environ.get("AUTH_CACHE_LOCAL_TTL", "5"))
+        self.local_max_size = int(os.environ.get("AUTH_CACHE_LOCAL_MAX_SIZE", "10000"))
+        # Второй уровень в Redis, общий для воркеров
+        self.use_redis = os.environ.get("AUTH_CACHE_REDIS", "false").lower() == "true"
+        self.redis_ttl = int(os.environ.get("AUTH_CACHE_REDIS_TTL", "60"))
+        self.key_prefix = os.environ.get("AUTH_CACHE_KEY_PREFIX", "backoffice:auth:")
+
+
+auth_cache_settings = AuthCacheSettings()
+
+
+class TokenDenylistSettings:
+    """Настройки списка отозванных access токенов"""
+
+    def __init__(self):
+        self.enabled = (
+            os.environ.get("TOKEN_DENYLIST_ENABLED", "true").lower() == "true"
+        )
+        self.key_prefix = os.environ.get(
+            "TOKEN_DENYLIST_KEY_PREFIX", "backoffice:denylist:"
+        )
+        # Размер Bloom-фильтра воркера: ожидаемое число отозванных токенов
+        # и допустимая доля ложных срабатываний (они проверяются в Redis)
+        self.capacity = int(os.environ.get("TOKEN_DENYLIST_CAPACITY", "100000"))
+        self.error_rate = float(os.environ.get("TOKEN_DENYLIST_ERROR_RATE", "0.001"))
+        # Как часто пересобирать фильтр из Redis, в секундах
+        self.sync_interval = int(os.environ.get("TOKEN_DENYLIST_SYNC_INTERVAL", "60"))
+
+
+token_denylist_settings = TokenDenylistSettings()
@@ -1,12 +1,14 @@
 from typing import Annotated, TypeAlias
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
                                     create_async_engine)
 
 from src.backoffice.apps.account.schemas import UserProfile
 from src.backoffice.apps.account.services.jwt_service import jwt_service
+from src.backoffice.apps.account.services.token_denylist import token_denylist
+from src.backoffice.apps.account.services.user_cache import user_profile_cache
 from src.backoffice.apps.account.services.user_service import UserService
 from src.backoffice.apps.company.models import CompanyRole
 from src.backoffice.apps.company.services import CompanyMembershipService
@@ -38,52 +40,80 @@ security = HTTPBearer()
 TokenDep: TypeAlias = Annotated[HTTPAuthorizationCredentials, Depends(security)]
 
 
-async def get_current_user(
-    token: TokenDep,
-    session: AsyncSession,
-) -> UserProfile:
-    """Извлечь и проверить текущего пользователя из bearer-токена.
-    Локальная реализация для избежания циклического импорта с роутером аутентификации.
+async def get_token_claims(request: Request, token: TokenDep) -> dict:
+    """Проверенные claims access-токена.
+
+    Если токен уже проверил AuthMiddleware, claims берутся из request state.
     """
-    payload = jwt_service.verify_access_token(token.credentials)
-    if not payload:
+    claims = getattr(request.state, "token_claims", None)
+    if claims is not None:
+        return claims
+
+    claims = jwt_service.verify_access_token(token.credentials)
+    if not claims or await token_denylist.is_revoked(claims):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return claims
+
 
-    user_id = payload.get("user_id")
+TokenClaimsDep: TypeAlias = Annotated[dict, Depends(get_token_claims)]
+
+
+async def get_current_user(
+    claims: TokenClaimsDep,
+    session: SessionDep,
+) -> UserProfile:
+    """Извлечь и проверить текущего пользователя из claims bearer-токена."""
+    user_id = claims.get("user_id")
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
-    user_service = UserService(session)
-    user = await user_service.get_user_by_id(user_id)
-    if not user or not user.is_active:
+    profile = await user_profile_cache.get(user_id)
+    if profile is None:
+        user = await UserService(session).get_user_by_id(user_id)
+        if user is not None:
+            profile = UserProfile.model_validate(user)
+            await user_profile_cache.set(profile)
+
+    if profile is None or not profile.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    return UserProfile.model_validate(user)
+    return profile
+
+
+async def get_current_superuser(
+    current_user: UserProfile = Depends(get_current_user),
+) -> UserProfile:
+    """Текущий пользователь, если он администратор (is_superuser)."""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions"
+        )
+    return current_user
 
 
 async def require_company_role(
     company_id: int,
     required_role: CompanyRole,
-    token: TokenDep,
+    claims: TokenClaimsDep,
     session: SessionDep,
 ) -> UserProfile:
     """Ensure current user has at least required_role in the company.
     Returns current user profile on success.
     """
-    current_user = await get_current_user(token, session)
+    current_user = await get_current_user(claims, session)
     membership_service = CompanyMembershipService(session)
-    member = await membership_service.get_member(company_id, current_user.id)
-    if not member or not CompanyMembershipService.has_required_role(
-        member.role, required_role
+    role = await membership_service.get_role(company_id, current_user.id)
+    if role is None or not CompanyMembershipService.has_required_role(
+        role, required_role
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions"
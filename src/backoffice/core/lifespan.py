@@ -0,0 +1,50 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from src.backoffice.apps.account.services.token_denylist import token_denylist
+from src.backoffice.apps.account.services.token_purge import \
+    refresh_token_purger
+from src.backoffice.apps.location.services.geocoding_batch import \
+    geocoding_batch_jobs
+from src.backoffice.apps.location.services.geocoding_transport import \
+    geocoding_transports
+from src.backoffice.apps.location.services.geocoding_writer import \
+    geocoding_result_writer
+from src.backoffice.apps.search.services import search_backend
+from src.backoffice.core.config import kafka_settings
+from src.backoffice.core.logging import get_logger
+from src.backoffice.core.services.http_client import http_client_pool
+from src.backoffice.core.services.redis_client import redis_client
+
+logger = get_logger("lifespan")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Запуск и остановка долгоживущих клиентов приложения."""
+    logger.info("app_startup")
+    refresh_token_purger.start()
+    await token_denylist.start()
+    geocoding_result_writer.start()
+    try:
+        yield
+    finally:
+        await token_denylist.stop()
+        await refresh_token_purger.stop()
+        await geocoding_batch_jobs.stop()
+        await geocoding_result_writer.stop()
+        await search_backend.close()
+        if kafka_settings.get_bootstrap_servers():
+            # Локальный импорт: aiokafka нужен, только если Kafka настроена
+            from src.backoffice.core.services.kafka_client import kafka_client
+
+            await kafka_client.stop()
+        await http_client_pool.close()
+        await geocoding_transports.close()
+        await redis_client.close()
+        logger.info("app_shutdown")
+
+
+__all__ = ("lifespan",)
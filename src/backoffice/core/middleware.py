@@ -3,140 +3,190 @@ import time
 import uuid
 from typing import Optional
 
-from fastapi import HTTPException, Request, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import Message
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.backoffice.apps.account.services.jwt_service import jwt_service
+from src.backoffice.apps.account.services.token_denylist import token_denylist
 from src.backoffice.core.config import logging_settings
 from src.backoffice.core.context import request_id_ctx_var, user_id_ctx_var
 from src.backoffice.core.logging import get_logger
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware для проверки авторизации"""
-
-    def __init__(self, app, excluded_paths: Optional[list] = None):
-        super().__init__(app)
-        self.excluded_paths = excluded_paths or [
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/v1/auth/",
-            "/api/v1/location/geocoding/",
-            "/api/v1/location/locations/",
-            "/api/v1/health/",
-        ]
-        self.security = HTTPBearer(auto_error=False)
+class AuthMiddleware:
+    """ASGI middleware для проверки авторизации"""
+
+    def __init__(self, app: ASGIApp, excluded_paths: Optional[list] = None):
+        self.app = app
+        self.excluded_paths = tuple(
+            excluded_paths
+            or [
+                "/docs",
+                "/redoc",
+                "/openapi.json",
+                "/.well-known/",
+                "/api/v1/auth/",
+                "/api/v1/location/geocoding/",
+                "/api/v1/location/locations/",
+                "/api/v1/health/",
+                "/api/v1/menu/public/",
+            ]
+        )
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Проверяем, нужно ли проверять авторизацию для этого пути
-        if self._is_excluded_path(request.url.path):
-            return await call_next(request)
+        if scope["type"] != "http" or self._is_excluded_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
         # Проверяем наличие токена
-        authorization: Optional[HTTPAuthorizationCredentials] = await self.security(
-            request
-        )
-
-        if not authorization:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authorization header missing",
-                headers={"WWW-Authenticate": "Bearer"},
+        token = self._get_bearer_token(Headers(scope=scope))
+        if not token:
+            await self._unauthorized("Authorization header missing")(
+                scope, receive, send
             )
+            return
 
         # Проверяем токен
-        payload = jwt_service.verify_access_token(authorization.credentials)
+        payload = jwt_service.verify_access_token(token)
         if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            await self._unauthorized("Invalid token")(scope, receive, send)
+            return
+        if await token_denylist.is_revoked(payload):
+            await self._unauthorized("Token revoked")(scope, receive, send)
+            return
 
-        # Добавляем информацию о пользователе в request state
-        request.state.user_id = payload.get("user_id")
-        request.state.user_email = payload.get("email")
+        # Добавляем информацию о пользователе в request state;
+        # token_claims переиспользуют зависимости, чтобы не проверять токен повторно
+        state = scope.setdefault("state", {})
+        state["token_claims"] = payload
+        state["user_id"] = payload.get("user_id")
+        state["user_email"] = payload.get("email")
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
     def _is_excluded_path(self, path: str) -> bool:
         """Проверить, исключен ли путь из проверки авторизации"""
-        for excluded_path in self.excluded_paths:
-            if path.startswith(excluded_path):
-                return True
-        return False
+        return path.startswith(self.excluded_paths)
+
+    @staticmethod
+    def _get_bearer_token(headers: Headers) -> Optional[str]:
+        """Токен из заголовка Authorization: Bearer <token>"""
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not credentials.strip():
+            return None
+        return credentials.strip()
+
+    @staticmethod
+    def _unauthorized(detail: str) -> JSONResponse:
+        return JSONResponse(
+            {"detail": detail},
+            status_code=401,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Присваивает request_id, захватывает user_id из state, логирует запрос/ответ."""
+class RequestContextMiddleware:
+    """
+    ASGI middleware: присваивает request_id, захватывает user_id из state,
+    логирует запрос/ответ.
 
-    def __init__(self, app):
-        super().__init__(app)
-        self.logger = get_logger("http")
+    Тело запроса не буферизуется: из потока receive копируются только первые
+    LOG_BODY_LIMIT байт для лога.
+    """
 
-    async def dispatch(self, request: Request, call_next):
-        started_at = time.time()
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        token = request_id_ctx_var.set(request_id)
-        user_token = user_id_ctx_var.set("-")
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = get_logger("http")
 
-        # Read request body carefully for logging, without consuming stream for downstream
-        body_bytes: bytes = b""
-        if logging_settings.log_requests:
-            body_bytes = await request.body()
-            if len(body_bytes) > logging_settings.body_limit:
-                body_preview = body_bytes[: logging_settings.body_limit] + b"..."
-            else:
-                body_preview = body_bytes
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            async def receive() -> Message:
-                return {"type": "http.request", "body": body_bytes, "more_body": False}
+        started_at = time.perf_counter()
+        headers = Headers(scope=scope)
+        request_id = headers.get("x-request-id") or str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        user_id = state.get("user_id")
 
-            request._receive = receive  # type: ignore[attr-defined]
+        token = request_id_ctx_var.set(request_id)
+        user_token = user_id_ctx_var.set(str(user_id) if user_id is not None else "-")
 
         self.logger.info(
             "request",
             extra={
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "user_id": getattr(getattr(request.state, "user_id", None), "", None)
-                or "-",
+                "method": scope["method"],
+                "path": scope["path"],
+                "user_id": user_id or "-",
             },
         )
 
+        log_body = logging_settings.log_requests
+        body_limit = logging_settings.body_limit
+        body_sample = bytearray()
+        body_truncated = False
+        status_code = 0
+        response_length = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal body_truncated
+            message = await receive()
+            if log_body and message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                free = body_limit - len(body_sample)
+                if free > 0:
+                    body_sample.extend(chunk[:free])
+                if len(chunk) > free:
+                    body_truncated = True
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_length
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_length += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(
+                scope, receive_wrapper if log_body else receive, send_wrapper
+            )
         finally:
-            # restore context vars
-            request_id_ctx_var.reset(token)
-            user_id_ctx_var.reset(user_token)
-
-        process_time_ms = int((time.time() - started_at) * 1000)
-
-        # capture user_id if set by AuthMiddleware
-        user_id = getattr(request.state, "user_id", "-")
+            process_time_ms = int((time.perf_counter() - started_at) * 1000)
 
-        # Log response
-        extra = {
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "user_id": user_id or "-",
-            "status_code": getattr(response, "status_code", 0),
-            "process_time_ms": process_time_ms,
-        }
+            # capture user_id if set by AuthMiddleware
+            user_id = state.get("user_id")
 
-        if logging_settings.log_requests and hasattr(response, "body_iterator"):
-            # Best-effort: avoid consuming the stream; only log known content-length
-            content_length = response.headers.get("content-length")
-            if content_length is not None:
-                extra["response_length"] = int(content_length)
-
-        level = logging.INFO if extra["status_code"] < 500 else logging.ERROR
-        self.logger.log(level, "response", extra=extra)
+            # Log response
+            extra = {
+                "request_id": request_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "user_id": user_id or "-",
+                "status_code": status_code,
+                "process_time_ms": process_time_ms,
+            }
+            if log_body:
+                extra["response_length"] = response_length
+
+            level = logging.INFO if 0 < status_code < 500 else logging.ERROR
+            self.logger.log(level, "response", extra=extra)
+
+            # Тело запроса может содержать пароли и токены — только на уровне DEBUG
+            if body_sample and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "request_body",
+                    extra={
+                        "request_id": request_id,
+                        "body": body_sample.decode("utf-8", "replace")
+                        + ("..." if body_truncated else ""),
+                    },
+                )
 
-        return response
+            # restore context vars
+            request_id_ctx_var.reset(token)
+            user_id_ctx_var.reset(user_token)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from src.backoffice.core.config import cache_settings
+from src.backoffice.core.services.response_cache import response_cache
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Параметры кэширования ответа эндпоинта"""
+
+    ttl: int
+    # Теги для инвалидации; могут ссылаться на path-параметры: "menu_images:{menu_item_id}"
+    tags: Tuple[str, ...] = ()
+
+
+def cache_response(ttl: int, tags: Sequence[str] = ()) -> Callable[[Any], Any]:
+    """
+    Включить кэширование ответа GET-эндпоинта.
+
+    Действует в роутерах с route_class=CachedRoute; декоратор ставится
+    под декоратором роутера.
+    """
+
+    def decorator(endpoint: Any) -> Any:
+        endpoint.__cache_policy__ = CachePolicy(ttl=ttl, tags=tuple(tags))
+        return endpoint
+
+    return decorator
+
+
+class CachedRoute(APIRoute):
+    """
+    Маршрут, отдающий успешные JSON-ответы из кэша.
+
+    Ключ включает путь, query-параметры и пользователя из AuthMiddleware.
+    Заголовок Cache-Control: no-cache в запросе обходит кэш.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        policy: Optional[CachePolicy] = getattr(self.endpoint, "__cache_policy__", None)
+        if policy is None:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            if (
+                not cache_settings.enabled
+                or request.method != "GET"
+                or "no-cache" in request.headers.get("cache-control", "")
+            ):
+                return await handler(request)
+
+            user_id = getattr(request.state, "user_id", None)
+            key = response_cache.build_key(
+                self.name,
+                request.url.path,
+                request.query_params.multi_items(),
+                tenant=str(user_id) if user_id is not None else None,
+            )
+            tags = [tag.format(**request.path_params) for tag in policy.tags]
+
+            # Ответ, который нельзя кэшировать, возвращается как есть
+            uncached: dict = {}
+
+            async def load() -> Optional[bytes]:
+                response = await handler(request)
+                if (
+                    response.status_code == 200
+                    and response.media_type == "application/json"
+                    and response.background is None
+                ):
+                    return bytes(response.body)
+                uncached["response"] = response
+                return None
+
+            body, hit = await response_cache.get_or_set(key, load, policy.ttl, tags)
+            if body is None:
+                return uncached.get("response") or await handler(request)
+            return Response(
+                content=body,
+                media_type="application/json",
+                headers={"X-Cache": "HIT" if hit else "MISS"},
+            )
+
+        return cached_handler
+
+
+__all__ = ("CachePolicy", "CachedRoute", "cache_response")
@@ -0,0 +1,68 @@
+import time
+from enum import Enum
+
+from ..logging import get_logger
+
+logger = get_logger("circuit_breaker")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker внешней зависимости.
+
+    После failure_threshold ошибок подряд цепь размыкается, и вызовы не
+    выполняются reset_timeout секунд. Затем пропускается один пробный вызов:
+    успех замыкает цепь, ошибка снова размыкает.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Можно ли сейчас выполнить вызов"""
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            return True
+        # HALF_OPEN: пробный вызов уже выполняется
+        return False
+
+    def record_success(self) -> None:
+        if self.state != CircuitState.CLOSED:
+            logger.info("circuit_closed", extra={"circuit": self.name})
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED
+            and self.failures >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            logger.warning(
+                "circuit_opened",
+                extra={"circuit": self.name, "failures": self.failures},
+            )
+
+    def release(self) -> None:
+        """Вызов не состоялся (отменен) — вернуть пробный слот"""
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.OPEN
+            # Следующий вызов снова будет пробным, без ожидания
+            self._opened_at = time.monotonic() - self.reset_timeout
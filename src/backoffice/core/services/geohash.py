@@ -0,0 +1,90 @@
+import math
+from typing import List, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+EARTH_RADIUS_M = 6_371_000
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    """Geohash точки длиной precision символов"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        # Биты чередуются: четные — долгота, нечетные — широта
+        coord, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coord >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def bounds(cell: str) -> Tuple[float, float, float, float]:
+    """Границы ячейки: (min_lat, min_lon, max_lat, max_lon)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            middle = (target[0] + target[1]) / 2
+            if value >> shift & 1:
+                target[0] = middle
+            else:
+                target[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def decode(cell: str) -> Tuple[float, float]:
+    """Центр ячейки: (latitude, longitude)"""
+    min_lat, min_lon, max_lat, max_lon = bounds(cell)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+def neighbors(cell: str) -> List[str]:
+    """Ячейка и ее соседи той же точности (до 9 штук, без повторов у полюсов)"""
+    min_lat, min_lon, max_lat, max_lon = bounds(cell)
+    height = max_lat - min_lat
+    width = max_lon - min_lon
+    center_lat = (min_lat + max_lat) / 2
+    center_lon = (min_lon + max_lon) / 2
+
+    cells = []
+    for d_lat in (-height, 0.0, height):
+        latitude = center_lat + d_lat
+        if not -90 <= latitude <= 90:
+            continue
+        for d_lon in (-width, 0.0, width):
+            # Переход через антимеридиан
+            longitude = (center_lon + d_lon + 180) % 360 - 180
+            neighbor = encode(latitude, longitude, len(cell))
+            if neighbor not in cells:
+                cells.append(neighbor)
+    return cells
+
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние между точками по поверхности Земли (haversine), в метрах"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
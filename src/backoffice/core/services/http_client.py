@@ -0,0 +1,136 @@
+import asyncio
+import importlib.util
+import random
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import http_client_settings
+from ..logging import get_logger
+
+# Статусы, после которых идемпотентный запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Ошибки, при которых запрос гарантированно не дошел до сервера
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class HttpClientPool:
+    """Пул исходящих HTTP-клиентов на время жизни приложения.
+
+    На каждый хост — свой httpx.AsyncClient со своими лимитами соединений,
+    keep-alive и HTTP/2, если он включен (HTTP_CLIENT_HTTP2) и установлен
+    пакет h2. Клиенты создаются лениво и закрываются в lifespan.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._logger = get_logger("http.outbound")
+        self._http2 = http_client_settings.http2 and bool(
+            importlib.util.find_spec("h2")
+        )
+        if http_client_settings.http2 and not self._http2:
+            self._logger.warning("http2_disabled_h2_not_installed")
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Клиент для хоста из url"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=http_client_settings.max_connections_per_host,
+                    max_keepalive_connections=http_client_settings.max_keepalive_connections,
+                    keepalive_expiry=http_client_settings.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(
+                    http_client_settings.read_timeout,
+                    connect=http_client_settings.connect_timeout,
+                    pool=http_client_settings.pool_timeout,
+                ),
+            )
+            self._clients[origin] = client
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        operation: str,
+        idempotent: bool = True,
+        retries: Optional[int] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Выполнить запрос с повторами и записать метрики в лог.
+
+        Неидемпотентные запросы (например, обмен одноразового OAuth-кода)
+        повторяются только если не дошли до сервера.
+        """
+        client = self.client_for(url)
+        retries = http_client_settings.retries if retries is None else retries
+        attempt = 0
+        while True:
+            attempt += 1
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                retryable = isinstance(e, NOT_SENT_ERRORS) or (
+                    idempotent and isinstance(e, httpx.TransportError)
+                )
+                self._log(operation, url, attempt, started_at, error=type(e).__name__)
+                if not retryable or attempt > retries:
+                    raise
+            else:
+                self._log(operation, url, attempt, started_at, response=response)
+                if not (
+                    idempotent
+                    and response.status_code in RETRY_STATUSES
+                    and attempt <= retries
+                ):
+                    return response
+            await asyncio.sleep(self._backoff(attempt))
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        # Экспоненциальная задержка с полным джиттером
+        return random.uniform(0, http_client_settings.retry_backoff * 2 ** (attempt - 1))
+
+    def _log(
+        self,
+        operation: str,
+        url: str,
+        attempt: int,
+        started_at: float,
+        response: Optional[httpx.Response] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        extra = {
+            "operation": operation,
+            "host": urlsplit(url).netloc,
+            "attempt": attempt,
+            "duration_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        }
+        if response is not None:
+            extra["status_code"] = response.status_code
+            extra["http_version"] = response.http_version
+            self._logger.info("http_outbound_request", extra=extra)
+        else:
+            extra["error"] = error
+            self._logger.warning("http_outbound_request_failed", extra=extra)
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        if clients:
+            self._logger.info("http_clients_closed", extra={"hosts": len(clients)})
+
+
+http_client_pool = HttpClientPool()
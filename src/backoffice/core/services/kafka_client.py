@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from typing import Any, AsyncIterator, Callable, Optional
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
 
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
@@ -63,6 +63,35 @@ class KafkaClient:
             },
         )
 
+    async def send_many(
+        self, topic: str, messages: Sequence[Tuple[Optional[bytes], bytes]]
+    ) -> List[Optional[BaseException]]:
+        """Отправить сообщения (key, value) пачкой.
+
+        Все сообщения сразу ставятся в буфер producer, подтверждения брокера
+        ожидаются параллельно, а не по одному. Возвращает ошибку доставки
+        для каждого сообщения (None — доставлено).
+        """
+        topic_name = f"{kafka_settings.topic_prefix}{topic}"
+        producer = await self.get_producer()
+        deliveries = [
+            await producer.send(topic_name, value=value, key=key)
+            for key, value in messages
+        ]
+        results = await asyncio.gather(*deliveries, return_exceptions=True)
+        errors = [
+            result if isinstance(result, BaseException) else None for result in results
+        ]
+        self._logger.info(
+            "kafka_messages_sent",
+            extra={
+                "topic": topic_name,
+                "count": len(errors),
+                "failed": sum(error is not None for error in errors),
+            },
+        )
+        return errors
+
     async def consume(
         self,
         topic: str,
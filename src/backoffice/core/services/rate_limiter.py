@@ -0,0 +1,140 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+from ..logging import get_logger
+from .redis_client import redis_client
+
+logger = get_logger("rate_limiter")
+
+
+class RateLimitExceeded(Exception):
+    """Лимит исчерпан, и ждать освобождения дольше допустимого"""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(
+            f"Rate limit exceeded for {name}, retry after {retry_after:.1f}s"
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+class TokenBucket(ABC):
+    """
+    Token bucket: rate токенов в секунду, не больше capacity в запасе.
+
+    Токены резервируются заранее: если запаса нет, запрос получает место в
+    очереди и ждет своей очереди, но не дольше max_wait — иначе отклоняется
+    с RateLimitExceeded.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float) -> None:
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+    async def acquire(self, max_wait: float = 0.0) -> None:
+        allowed, wait, _ = await self._reserve(1, max_wait)
+        if not allowed:
+            raise RateLimitExceeded(self.name, wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def release(self, tokens: int = 1) -> None:
+        """Вернуть зарезервированные токены, если запрос так и не был отправлен"""
+        # Отрицательный запрос всегда проходит: ожидание ограничено очередью
+        await self._reserve(-tokens, float(2**31))
+
+    async def remaining(self) -> float:
+        """Сколько токенов доступно сейчас (отрицательно, если есть очередь)"""
+        _, _, tokens = await self._reserve(0, 0.0)
+        return tokens
+
+    @abstractmethod
+    async def _reserve(self, tokens: int, max_wait: float) -> Tuple[bool, float, float]:
+        """Зарезервировать токены: (успех, ожидание в секундах, остаток)"""
+        pass
+
+
+class InMemoryTokenBucket(TokenBucket):
+    """Token bucket в памяти процесса: лимит действует на каждый воркер отдельно"""
+
+    def __init__(self, name: str, rate: float, capacity: float) -> None:
+        super().__init__(name, rate, capacity)
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    async def _reserve(self, tokens: int, max_wait: float) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        wait = max(0.0, (tokens - self._tokens) / self.rate)
+        if wait > max_wait:
+            return False, wait, self._tokens
+        self._tokens -= tokens
+        return True, wait, self._tokens
+
+
+# Пополнение и резервирование атомарно в Redis; время берется из Redis,
+# чтобы часы воркеров не влияли на результат
+_RESERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < requested then
+    wait = (requested - tokens) / rate
+end
+local allowed = 0
+if wait <= max_wait then
+    allowed = 1
+    tokens = tokens - requested
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+return {allowed, tostring(wait), tostring(tokens)}
+"""
+
+
+class RedisTokenBucket(TokenBucket):
+    """
+    Token bucket в Redis, общий для всех воркеров. Если Redis недоступен,
+    временно работает локальный bucket с теми же параметрами.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, key: str) -> None:
+        super().__init__(name, rate, capacity)
+        self.key = key
+        self._fallback = InMemoryTokenBucket(name, rate, capacity)
+
+    async def _reserve(self, tokens: int, max_wait: float) -> Tuple[bool, float, float]:
+        try:
+            allowed, wait, remaining = await redis_client.client.eval(
+                _RESERVE_SCRIPT,
+                1,
+                self.key,
+                repr(self.rate),
+                repr(self.capacity),
+                tokens,
+                repr(max_wait),
+            )
+        except Exception as e:
+            logger.warning(
+                "rate_limiter_redis_failed",
+                extra={"limiter": self.name, "error": str(e)},
+            )
+            return await self._fallback._reserve(tokens, max_wait)
+        return bool(allowed), float(wait), float(remaining)
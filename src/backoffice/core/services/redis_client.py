@@ -0,0 +1,39 @@
+from typing import Optional
+
+from redis.asyncio import ConnectionPool, Redis
+
+from ..config import redis_settings
+from ..logging import get_logger
+
+
+class RedisClient:
+    """Общий пул соединений с Redis для приложения.
+
+    Клиент создается лениво при первом обращении и закрывается в lifespan.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[Redis] = None
+        self._logger = get_logger("redis")
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            pool = ConnectionPool.from_url(
+                redis_settings.url,
+                max_connections=redis_settings.max_connections,
+                socket_timeout=redis_settings.socket_timeout,
+                socket_connect_timeout=redis_settings.connect_timeout,
+            )
+            self._client = Redis(connection_pool=pool)
+            self._logger.info("redis_client_initialized")
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._logger.info("redis_client_closed")
+            self._client = None
+
+
+redis_client = RedisClient()
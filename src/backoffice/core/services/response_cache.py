@@ -0,0 +1,383 @@
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import (Awaitable, Callable, Dict, Iterable, List, Optional,
+                    Sequence, Set, Tuple)
+
+from ..config import cache_settings
+from ..logging import get_logger
+from .redis_client import redis_client
+
+logger = get_logger("cache")
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+class CacheBackend(ABC):
+    """Хранилище закэшированных ответов с инвалидацией по тегам"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Получить значение или None, если ключа нет или он истек"""
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, ttl: int, tags: Sequence[str] = ()
+    ) -> None:
+        """Сохранить значение на ttl секунд и привязать ключ к тегам"""
+
+    @abstractmethod
+    async def delete(self, keys: Sequence[str]) -> None:
+        """Удалить ключи"""
+
+    @abstractmethod
+    async def invalidate_tags(self, tags: Sequence[str]) -> int:
+        """
+        Увеличить версии тегов и удалить все привязанные к ним ключи;
+        вернуть количество ключей
+        """
+
+    @abstractmethod
+    async def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        """Текущие версии тегов (0 — тег еще не инвалидировался)"""
+
+    @abstractmethod
+    async def acquire_lock(self, key: str, ttl: float) -> bool:
+        """Захватить блокировку на пересчет ключа, не дожидаясь ее освобождения"""
+
+    @abstractmethod
+    async def release_lock(self, key: str) -> None:
+        """Освободить блокировку на пересчет ключа"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """Кэш в Redis: ключи со сроком жизни, теги — множества ключей"""
+
+    def __init__(self, prefix: Optional[str] = None) -> None:
+        self.prefix = prefix if prefix is not None else cache_settings.key_prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}lock:{key}"
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}tagver:{tag}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await redis_client.client.get(self._key(key))
+
+    async def set(
+        self, key: str, value: bytes, ttl: int, tags: Sequence[str] = ()
+    ) -> None:
+        full_key = self._key(key)
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            pipe.set(full_key, value, ex=ttl)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, full_key)
+                # Множество тега живет не меньше самого долгоживущего ключа в нем
+                pipe.expire(tag_key, ttl, nx=True)
+                pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        if keys:
+            await redis_client.client.unlink(*(self._key(key) for key in keys))
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> int:
+        if not tags:
+            return 0
+        client = redis_client.client
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        async with client.pipeline(transaction=False) as pipe:
+            # Версия растет до чтения ключей тега: загрузка, начавшаяся раньше,
+            # увидит новую версию и не сохранит устаревший ответ
+            for tag in tags:
+                pipe.incr(self._version_key(tag))
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            results = await pipe.execute()
+
+        keys: Set[bytes] = set()
+        for tag_members in results[len(tags) :]:
+            keys.update(tag_members)
+        await client.unlink(*keys, *tag_keys)
+        return len(keys)
+
+    async def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        if not tags:
+            return []
+        values = await redis_client.client.mget(
+            [self._version_key(tag) for tag in tags]
+        )
+        return [int(value or 0) for value in values]
+
+    async def acquire_lock(self, key: str, ttl: float) -> bool:
+        return bool(
+            await redis_client.client.set(
+                self._lock_key(key), b"1", nx=True, px=int(ttl * 1000)
+            )
+        )
+
+    async def release_lock(self, key: str) -> None:
+        await redis_client.client.delete(self._lock_key(key))
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    LRU-кэш в памяти процесса. Используется в тестах и локальной разработке:
+    не разделяется между воркерами.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self.max_size = max_size or cache_settings.local_max_size
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._locks: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(
+        self, key: str, value: bytes, ttl: int, tags: Sequence[str] = ()
+    ) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: Sequence[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def invalidate_tags(self, tags: Sequence[str]) -> int:
+        removed = 0
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+            for key in self._tags.pop(tag, set()):
+                if self._entries.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    async def tag_versions(self, tags: Sequence[str]) -> List[int]:
+        return [self._versions.get(tag, 0) for tag in tags]
+
+    async def acquire_lock(self, key: str, ttl: float) -> bool:
+        now = time.monotonic()
+        if self._locks.get(key, 0) > now:
+            return False
+        self._locks[key] = now + ttl
+        return True
+
+    async def release_lock(self, key: str) -> None:
+        self._locks.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._versions.clear()
+        self._locks.clear()
+
+
+class ResponseCache:
+    """
+    Кэш ответов read-эндпоинтов.
+
+    Защита от stampede в два уровня: внутри процесса одновременные промахи
+    по одному ключу ждут единственный пересчет, между процессами пересчет
+    выполняет владелец блокировки в бэкенде, остальные ждут появления значения
+    не дольше CACHE_LOCK_WAIT секунд. Ошибки бэкенда не ломают запрос:
+    ответ просто считается без кэша.
+
+    Ответ не сохраняется, если за время загрузки изменилась версия
+    какого-либо из его тегов: иначе загрузка, прочитавшая БД до записи,
+    закэшировала бы устаревшие данные уже после invalidate_tags.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._inflight: Dict[str, "asyncio.Future[Optional[bytes]]"] = {}
+
+    @staticmethod
+    def build_key(
+        namespace: str,
+        path: str,
+        query: Iterable[Tuple[str, str]],
+        tenant: Optional[str] = None,
+    ) -> str:
+        """Ключ из пути, отсортированных query-параметров и тенанта"""
+        raw = "\n".join(
+            [path, tenant or "-", *(f"{name}={value}" for name, value in sorted(query))]
+        )
+        return f"{namespace}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[bytes]]],
+        ttl: int,
+        tags: Sequence[str] = (),
+    ) -> Tuple[Optional[bytes], bool]:
+        """
+        Вернуть значение из кэша или посчитать его через loader.
+
+        Args:
+            key: Ключ кэша
+            loader: Считает значение; None — результат не кэшируется
+            ttl: Время жизни значения в секундах
+            tags: Теги для инвалидации
+
+        Returns:
+            Tuple[Optional[bytes], bool]: Значение и признак попадания в кэш
+        """
+        value = await self._get(key)
+        if value is not None:
+            return value, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            value = await asyncio.shield(inflight)
+            if value is not None:
+                return value, True
+            return await loader(), False
+
+        future: "asyncio.Future[Optional[bytes]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = future
+        value = None
+        try:
+            value, hit = await self._load(key, loader, ttl, tags)
+            return value, hit
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(value)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Удалить закэшированные ответы по тегам; ошибки только логируются"""
+        if not tags:
+            return
+        try:
+            removed = await self.backend.invalidate_tags(list(tags))
+        except Exception as e:
+            logger.warning(
+                "cache_invalidate_failed", extra={"tags": list(tags), "error": str(e)}
+            )
+            return
+        logger.debug("cache_invalidated", extra={"tags": list(tags), "keys": removed})
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[bytes]]],
+        ttl: int,
+        tags: Sequence[str],
+    ) -> Tuple[Optional[bytes], bool]:
+        locked = await self._acquire_lock(key)
+        try:
+            if not locked:
+                # Пересчитывает другой процесс — ждем его результат
+                deadline = time.monotonic() + cache_settings.lock_wait
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+                    value = await self._get(key)
+                    if value is not None:
+                        return value, True
+
+            versions = await self._tag_versions(tags)
+            value = await loader()
+            if value is not None and versions is not None:
+                await self._set_if_current(key, value, ttl, tags, versions)
+            return value, False
+        finally:
+            if locked:
+                await self._release_lock(key)
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning("cache_get_failed", extra={"key": key, "error": str(e)})
+            return None
+
+    async def _set(
+        self, key: str, value: bytes, ttl: int, tags: Sequence[str]
+    ) -> None:
+        try:
+            await self.backend.set(key, value, ttl, tags)
+        except Exception as e:
+            logger.warning("cache_set_failed", extra={"key": key, "error": str(e)})
+
+    async def _set_if_current(
+        self,
+        key: str,
+        value: bytes,
+        ttl: int,
+        tags: Sequence[str],
+        versions: List[int],
+    ) -> None:
+        """Сохранить значение, если версии тегов не изменились с начала загрузки"""
+        if tags and await self._tag_versions(tags) != versions:
+            logger.debug("cache_set_outdated", extra={"key": key})
+            return
+        await self._set(key, value, ttl, tags)
+        # Инвалидация между проверкой и записью могла не застать ключ
+        if tags and await self._tag_versions(tags) != versions:
+            await self._delete(key)
+
+    async def _tag_versions(self, tags: Sequence[str]) -> Optional[List[int]]:
+        """Версии тегов; None — бэкенд недоступен, и значение не кэшируется"""
+        try:
+            return await self.backend.tag_versions(tags)
+        except Exception as e:
+            logger.warning(
+                "cache_tag_versions_failed", extra={"tags": list(tags), "error": str(e)}
+            )
+            return None
+
+    async def _delete(self, key: str) -> None:
+        try:
+            await self.backend.delete([key])
+        except Exception as e:
+            logger.warning("cache_delete_failed", extra={"key": key, "error": str(e)})
+
+    async def _acquire_lock(self, key: str) -> bool:
+        try:
+            return await self.backend.acquire_lock(key, cache_settings.lock_ttl)
+        except Exception as e:
+            logger.warning("cache_lock_failed", extra={"key": key, "error": str(e)})
+            # Без блокировки считаем сами, не ожидая
+            return True
+
+    async def _release_lock(self, key: str) -> None:
+        try:
+            await self.backend.release_lock(key)
+        except Exception as e:
+            logger.warning("cache_unlock_failed", extra={"key": key, "error": str(e)})
+
+
+def create_cache_backend() -> CacheBackend:
+    if cache_settings.is_redis:
+        return RedisCacheBackend()
+    return InMemoryCacheBackend()
+
+
+response_cache = ResponseCache(create_cache_backend())
@@ -132,6 +132,18 @@ class S3Client:
                 status_code=400, detail=f"Ошибка при генерации URL: {str(e)}"
             )
 
+    def get_public_url(self, file_path: str) -> str:
+        """
+        Получить публичный URL файла (bucket открыт на чтение)
+
+        Args:
+            file_path: Путь к файлу в S3
+
+        Returns:
+            str: Публичный URL
+        """
+        return f"{s3_settings.endpoint_url}/{self.bucket_name}/{file_path}"
+
     async def file_exists(self, file_path: str) -> bool:
         """
         Проверить существование файла
@@ -199,7 +211,7 @@ class S3Client:
             )
 
             # Формирование URL
-            url = f"{s3_settings.endpoint_url}/{self.bucket_name}/{file_path}"
+            url = self.get_public_url(file_path)
 
             return {"url": url, "file_path": file_path}
         except NoCredentialsError:
@@ -257,7 +269,7 @@ class S3Client:
                             "width": thumbnail.width,
                             "height": thumbnail.height,
                             "file_path": thumbnail_path,
-                            "url": f"{s3_settings.endpoint_url}/{self.bucket_name}/{thumbnail_path}",
+                            "url": self.get_public_url(thumbnail_path),
                         }
                     )
 
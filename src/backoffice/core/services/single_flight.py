@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Объединение одновременных одинаковых вызовов внутри процесса: первый
+    вызов по ключу выполняет работу, остальные ждут и получают его результат
+    или исключение.
+
+    Работа выполняется в контексте первого вызова (его сессии БД и т.п.).
+    Если первый вызов отменен, ожидающие не падают, а повторяют попытку —
+    один из них становится новым ведущим.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+
+        future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        # Исключение могут не забрать, если ожидающих не было
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._calls)
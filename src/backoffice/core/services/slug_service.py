@@ -19,12 +19,26 @@ class SlugService:
         Returns:
             Установленный slug
         """
-        base_slug = slugify(name)
         object_id = getattr(instance, "id", None)
 
         if object_id is None:
             raise ValueError("Объект должен иметь ID для генерации slug")
 
-        slug = f"{base_slug}-{object_id}"
+        slug = SlugService.build_slug(name, object_id)
         setattr(instance, slug_field, slug)
         return slug
+
+    @staticmethod
+    def build_slug(name: str, object_id: int) -> str:
+        """
+        Строит slug в формате {base_slug}-{id} без привязки к объекту,
+        напр. для пакетного обновления по id из INSERT ... RETURNING.
+
+        Args:
+            name: Имя для генерации slug
+            object_id: ID объекта
+
+        Returns:
+            slug
+        """
+        return f"{slugify(name)}-{object_id}"
@@ -0,0 +1,105 @@
+from typing import Optional
+
+from ..config import auth_cache_settings
+from ..logging import get_logger
+from .response_cache import InMemoryCacheBackend, RedisCacheBackend
+
+logger = get_logger("cache")
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш: LRU в памяти воркера с коротким TTL и, опционально,
+    общий для воркеров Redis. Ошибки Redis не ломают запрос — значение
+    просто читается из источника.
+
+    Попадания и промахи считаются по уровням, см. stats().
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        local_ttl: int,
+        local_max_size: int,
+        redis_ttl: Optional[int] = None,
+        redis_prefix: str = "",
+    ) -> None:
+        self.namespace = namespace
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self._local = InMemoryCacheBackend(max_size=local_max_size)
+        self._redis = (
+            RedisCacheBackend(prefix=f"{redis_prefix}{namespace}:")
+            if redis_ttl
+            else None
+        )
+        self._stats = {
+            "local": {"hits": 0, "misses": 0},
+            "redis": {"hits": 0, "misses": 0, "errors": 0},
+        }
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self._local.get(key)
+        self._stats["local"]["hits" if value is not None else "misses"] += 1
+        if value is not None or self._redis is None:
+            return value
+        try:
+            value = await self._redis.get(key)
+        except Exception as e:
+            self._stats["redis"]["errors"] += 1
+            logger.warning(
+                "tiered_cache_get_failed",
+                extra={"namespace": self.namespace, "error": str(e)},
+            )
+            return None
+        self._stats["redis"]["hits" if value is not None else "misses"] += 1
+        if value is not None:
+            await self._local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """ttl ограничивает время жизни записи на обоих уровнях"""
+        await self._local.set(key, value, min(self.local_ttl, ttl or self.local_ttl))
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                key, value, min(self.redis_ttl, ttl or self.redis_ttl)
+            )
+        except Exception as e:
+            logger.warning(
+                "tiered_cache_set_failed",
+                extra={"namespace": self.namespace, "error": str(e)},
+            )
+
+    async def delete(self, *keys: str) -> None:
+        await self._local.delete(keys)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(keys)
+        except Exception as e:
+            logger.warning(
+                "tiered_cache_delete_failed",
+                extra={"namespace": self.namespace, "error": str(e)},
+            )
+
+    def stats(self) -> dict:
+        """Попадания и промахи по уровням кэша"""
+        stats = {"local": dict(self._stats["local"])}
+        if self._redis is not None:
+            stats["redis"] = dict(self._stats["redis"])
+        return stats
+
+
+def create_auth_cache(namespace: str) -> Optional[TieredCache]:
+    """Кэш для проверок доступа по настройкам AUTH_CACHE_*; None, если выключен"""
+    if not auth_cache_settings.enabled:
+        return None
+    return TieredCache(
+        namespace,
+        local_ttl=auth_cache_settings.local_ttl,
+        local_max_size=auth_cache_settings.local_max_size,
+        redis_ttl=auth_cache_settings.redis_ttl if auth_cache_settings.use_redis else None,
+        redis_prefix=auth_cache_settings.key_prefix,
+    )
@@ -1,7 +1,7 @@
 from src.backoffice.apps.account.models import OAuthAccount, RefreshToken, User
 from src.backoffice.apps.company.models import Company, CompanyBranch, CompanyMember, CompanyRole
 from src.backoffice.apps.location.models import Address, City, Country, GeocodingResult, Region, Street
-from src.backoffice.apps.menu.models import Category, CompanyBranchMenu, MenuImage, MenuItem
+from src.backoffice.apps.menu.models import BranchMenuSnapshot, Category, CompanyBranchMenu, MenuImage, MenuItem
 from src.backoffice.apps.site.models import Site
 from src.backoffice.apps.site_configuration.models import SiteConfiguration
 from src.backoffice.apps.qr_manager.models import QRCode
@@ -31,6 +31,7 @@ __all__ = (
     "Street",
     
     # Menu
+    "BranchMenuSnapshot",
     "Category",
     "CompanyBranchMenu",
     "MenuImage",
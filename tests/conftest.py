@@ -0,0 +1,8 @@
+import os
+
+# Настройки БД обязательны при импорте core.config; тестам сама БД не нужна
+os.environ.setdefault("SQL_HOST", "localhost")
+os.environ.setdefault("SQL_PORT", "5432")
+os.environ.setdefault("SQL_DATABASE", "backoffice_test")
+os.environ.setdefault("SQL_USER", "postgres")
+os.environ.setdefault("SQL_PASSWORD", "postgres")
@@ -0,0 +1,75 @@
+from src.backoffice.core.services.circuit_breaker import (CircuitBreaker,
+                                                          CircuitState)
+
+
+def open_breaker(reset_timeout: float) -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_trial_call():
+    breaker = open_breaker(reset_timeout=0)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes():
+    breaker = open_breaker(reset_timeout=0)
+    breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_half_open_failure_reopens():
+    breaker = open_breaker(reset_timeout=60)
+    breaker.reset_timeout = 0
+    breaker.allow()
+    breaker.reset_timeout = 60
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+
+def test_release_returns_trial_slot_without_waiting():
+    breaker = open_breaker(reset_timeout=0)
+    breaker.allow()
+    breaker.reset_timeout = 60
+
+    breaker.release()
+    assert breaker.state == CircuitState.OPEN
+    # Отмененный пробный вызов не должен заставлять ждать reset_timeout заново
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+
+def test_release_is_noop_when_closed():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    breaker.release()
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,24 @@
+from src.backoffice.apps.location.services.geocoding_query import (
+    normalize_query, query_hash)
+
+
+def test_normalize_query_ignores_case_punctuation_and_abbreviations():
+    assert normalize_query("ул. Ленина, 1") == "ул ленина 1"
+    assert normalize_query("Улица  Ленина 1") == "ул ленина 1"
+
+
+def test_query_hash_matches_equivalent_queries():
+    assert query_hash("ул. Ленина, 1", "ru") == query_hash("Улица Ленина 1", "ru")
+
+
+def test_query_hash_depends_on_request_options():
+    base = query_hash("Ленина 1", "ru", None, None, None)
+
+    assert query_hash("Ленина 1", "en", None, None, None) != base
+    assert query_hash("Ленина 1", "ru", "ru", None, None) != base
+    assert query_hash("Ленина 1", "ru", None, "55,37|56,38", None) != base
+    assert query_hash("Ленина 1", "ru", None, None, "country:RU") != base
+
+
+def test_query_hash_options_are_not_ambiguous():
+    assert query_hash("Ленина 1", "ru", None) != query_hash("Ленина 1", None, "ru")
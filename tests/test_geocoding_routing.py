@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from src.backoffice.apps.location.services import geocoding_routing
+from src.backoffice.apps.location.services.geocoding_routing import (
+    GeocodingProviderRouter, GeocodingUnavailable)
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.services.circuit_breaker import CircuitState
+from src.backoffice.core.services.rate_limiter import RateLimitExceeded
+
+
+class FakeProviders:
+    """Вызовы провайдеров: результат, ошибка или ответ после задержки"""
+
+    def __init__(self, **behaviour) -> None:
+        self.behaviour = behaviour
+        self.calls = []
+        self.cancelled = []
+
+    async def __call__(self, provider: str):
+        self.calls.append(provider)
+        delay, outcome = self.behaviour[provider]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(provider)
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return [dict(item) for item in outcome]
+
+
+def point(latitude: float, longitude: float) -> dict:
+    return {"latitude": latitude, "longitude": longitude, "confidence": 1.0}
+
+
+@pytest.fixture(autouse=True)
+def routing_settings(monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "strategy", "failover")
+    monkeypatch.setattr(geocoding_settings, "hedge_enabled", False)
+    monkeypatch.setattr(geocoding_settings, "hedge_min_delay", 0.0)
+    monkeypatch.setattr(geocoding_settings, "hedge_max_delay", 0.05)
+    monkeypatch.setattr(geocoding_settings, "breaker_failures", 2)
+    monkeypatch.setattr(geocoding_settings, "breaker_reset_timeout", 60.0)
+
+    async def acquire(provider: str) -> None:
+        return None
+
+    monkeypatch.setattr(geocoding_routing.geocoding_rate_limiters, "acquire", acquire)
+
+
+@pytest.fixture
+def router() -> GeocodingProviderRouter:
+    return GeocodingProviderRouter()
+
+
+async def test_failover_uses_next_provider_on_error(router):
+    call = FakeProviders(
+        first=(0, RuntimeError("boom")), second=(0, [point(55.75, 37.61)])
+    )
+
+    results = await router.execute(["first", "second"], call)
+
+    assert call.calls == ["first", "second"]
+    assert [result["provider"] for result in results] == ["second"]
+    assert router.breaker("first").failures == 1
+    assert router.breaker("second").state == CircuitState.CLOSED
+
+
+async def test_all_providers_failed(router):
+    call = FakeProviders(first=(0, RuntimeError("a")), second=(0, RuntimeError("b")))
+
+    with pytest.raises(GeocodingUnavailable) as exc_info:
+        await router.execute(["first", "second"], call)
+
+    assert set(exc_info.value.errors) == {"first", "second"}
+
+
+async def test_rate_limited_everywhere_raises_rate_limit(router, monkeypatch):
+    async def acquire(provider: str) -> None:
+        raise RateLimitExceeded(provider, 3.0 if provider == "first" else 1.0)
+
+    monkeypatch.setattr(geocoding_routing.geocoding_rate_limiters, "acquire", acquire)
+    call = FakeProviders(first=(0, []), second=(0, []))
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await router.execute(["first", "second"], call)
+
+    assert exc_info.value.retry_after == 1.0
+    assert call.calls == []
+    # Отказ лимита не считается ошибкой провайдера
+    assert router.breaker("first").failures == 0
+
+
+async def test_open_circuit_is_skipped(router):
+    router.breaker("first").record_failure()
+    router.breaker("first").record_failure()
+    call = FakeProviders(first=(0, [point(1, 1)]), second=(0, [point(2, 2)]))
+
+    results = await router.execute(["first", "second"], call)
+
+    assert call.calls == ["second"]
+    assert results[0]["provider"] == "second"
+
+
+async def test_hedged_request_cancels_slow_primary(router, monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "hedge_enabled", True)
+    call = FakeProviders(first=(10, [point(1, 1)]), second=(0, [point(2, 2)]))
+
+    results = await router.execute(["first", "second"], call)
+    await asyncio.sleep(0)
+
+    assert call.calls == ["first", "second"]
+    assert results[0]["provider"] == "second"
+    assert call.cancelled == ["first"]
+    # Отмененный запрос не ошибка провайдера
+    assert router.breaker("first").failures == 0
+    assert router.breaker("first").state == CircuitState.CLOSED
+
+
+async def test_cancelled_half_open_trial_releases_slot(router, monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "hedge_enabled", True)
+    breaker = router.breaker("first")
+    breaker.record_failure()
+    breaker.record_failure()
+    # reset_timeout прошел: следующий вызов будет пробным
+    breaker._opened_at -= breaker.reset_timeout
+    call = FakeProviders(first=(10, [point(1, 1)]), second=(0, [point(2, 2)]))
+
+    results = await router.execute(["first", "second"], call)
+    await asyncio.sleep(0)
+
+    assert results[0]["provider"] == "second"
+    assert call.cancelled == ["first"]
+    assert breaker.state == CircuitState.OPEN
+    # Пробный вызов не состоялся, следующий запрос снова может его сделать
+    assert breaker.allow()
+
+
+async def test_no_hedge_when_primary_is_fast(router, monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "hedge_enabled", True)
+    call = FakeProviders(first=(0, [point(1, 1)]), second=(0, [point(2, 2)]))
+
+    results = await router.execute(["first", "second"], call)
+
+    assert call.calls == ["first"]
+    assert results[0]["provider"] == "first"
+
+
+async def test_merge_strategy_deduplicates_close_results(router, monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "strategy", "merge")
+    monkeypatch.setattr(geocoding_settings, "merge_distance", 100)
+    call = FakeProviders(
+        first=(0, [point(55.7500, 37.6100)]),
+        second=(0, [point(55.7501, 37.6101), point(59.93, 30.31)]),
+        third=(0, RuntimeError("down")),
+    )
+
+    results = await router.execute(["first", "second", "third"], call)
+
+    assert len(results) == 2
+    assert router.breaker("third").failures == 1
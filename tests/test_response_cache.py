@@ -0,0 +1,80 @@
+import pytest
+
+from src.backoffice.core.services.response_cache import (InMemoryCacheBackend,
+                                                         ResponseCache)
+
+TAG = "menu-items"
+
+
+class SetHook(InMemoryCacheBackend):
+    """Бэкенд, вызывающий on_set сразу после записи значения"""
+
+    def __init__(self) -> None:
+        super().__init__(max_size=100)
+        self.on_set = None
+
+    async def set(self, key, value, ttl, tags=()):
+        await super().set(key, value, ttl, tags)
+        if self.on_set is not None:
+            await self.on_set()
+
+
+@pytest.fixture
+def backend():
+    return SetHook()
+
+
+@pytest.fixture
+def cache(backend):
+    return ResponseCache(backend)
+
+
+async def test_loaded_value_is_cached(cache, backend):
+    async def loader():
+        return b"fresh"
+
+    assert await cache.get_or_set("key", loader, ttl=60, tags=[TAG]) == (
+        b"fresh",
+        False,
+    )
+    assert await backend.get("key") == b"fresh"
+    assert await cache.get_or_set("key", loader, ttl=60, tags=[TAG]) == (
+        b"fresh",
+        True,
+    )
+
+
+async def test_value_is_not_cached_when_invalidated_during_load(cache, backend):
+    async def loader():
+        # Запись и инвалидация происходят, пока загрузка читает старые данные
+        await cache.invalidate_tags(TAG)
+        return b"stale"
+
+    value, hit = await cache.get_or_set("key", loader, ttl=60, tags=[TAG])
+
+    assert (value, hit) == (b"stale", False)
+    assert await backend.get("key") is None
+
+
+async def test_value_is_removed_when_invalidated_right_after_set(cache, backend):
+    async def invalidate():
+        # Инвалидация подняла версию и прочитала ключи тега до записи:
+        # сам ключ она уже не удалит
+        backend._versions[TAG] = backend._versions.get(TAG, 0) + 1
+
+    backend.on_set = invalidate
+
+    async def loader():
+        return b"stale"
+
+    await cache.get_or_set("key", loader, ttl=60, tags=[TAG])
+
+    assert await backend.get("key") is None
+
+
+async def test_invalidation_bumps_tag_versions(backend):
+    assert await backend.tag_versions([TAG, "other"]) == [0, 0]
+
+    await backend.invalidate_tags([TAG])
+
+    assert await backend.tag_versions([TAG, "other"]) == [1, 0]
@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.backoffice.apps.location.services.geocoder_service import (
+    GeocoderService, _result_row, _reverse_cache_cell, _reverse_key)
+from src.backoffice.core.config import geocoding_settings
+from src.backoffice.core.services import geohash
+
+KEY = _reverse_key("ru", None)
+LATITUDE, LONGITUDE = 55.7558, 37.6173
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Отдает заранее заданные строки на любой запрос"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return FakeResult(self.rows)
+
+
+def stored(row_id, latitude, longitude, provider="google", address="Тверская, 1"):
+    """Строка geocoding_results для ответа на обратный запрос в точке"""
+    point = geohash.encode(latitude, longitude, 12)
+    row = _result_row(
+        f"{latitude},{longitude}",
+        provider,
+        {"latitude": latitude, "longitude": longitude, "formatted_address": address},
+        KEY,
+        point,
+    )
+    return SimpleNamespace(id=row_id, **row)
+
+
+@pytest.fixture(autouse=True)
+def reverse_settings(monkeypatch):
+    monkeypatch.setattr(geocoding_settings, "reverse_geohash_precision", 7)
+    monkeypatch.setattr(geocoding_settings, "reverse_cache_distance", 30.0)
+
+
+async def nearby(rows, latitude=LATITUDE, longitude=LONGITUDE, providers=("google",)):
+    return await GeocoderService(FakeSession(rows))._get_nearby_results(
+        KEY, latitude, longitude, list(providers)
+    )
+
+
+async def test_returns_whole_response_of_nearest_point():
+    rows = [
+        stored(1, LATITUDE + 0.0002, LONGITUDE, address="Дальняя"),
+        stored(2, LATITUDE + 0.00005, LONGITUDE, address="Ближняя, 1"),
+        stored(3, LATITUDE + 0.00005, LONGITUDE, address="Ближняя, 2"),
+    ]
+
+    results = await nearby(rows)
+
+    assert [result.formatted_address for result in results] == [
+        "Ближняя, 1",
+        "Ближняя, 2",
+    ]
+
+
+async def test_ignores_points_beyond_distance():
+    results = await nearby([stored(1, LATITUDE + 0.001, LONGITUDE)])
+
+    assert results is None
+
+
+async def test_finds_point_across_cell_border():
+    _, _, max_lat, _ = geohash.bounds(geohash.encode(LATITUDE, LONGITUDE, 7))
+    request_lat, stored_lat = max_lat - 0.00001, max_lat + 0.00001
+    assert geohash.encode(request_lat, LONGITUDE, 7) != geohash.encode(
+        stored_lat, LONGITUDE, 7
+    )
+
+    results = await nearby([stored(1, stored_lat, LONGITUDE)], latitude=request_lat)
+
+    assert [result.latitude for result in results] == [stored_lat]
+
+
+async def test_prefers_provider_order_over_distance():
+    rows = [
+        stored(1, LATITUDE, LONGITUDE, provider="yandex", address="Яндекс"),
+        stored(2, LATITUDE + 0.0001, LONGITUDE, provider="google", address="Google"),
+    ]
+
+    results = await nearby(rows, providers=("google", "yandex"))
+
+    assert [result.formatted_address for result in results] == ["Google"]
+
+
+def test_cache_cell_fits_within_distance():
+    point = geohash.encode(LATITUDE, LONGITUDE, 12)
+
+    cell = _reverse_cache_cell(point)
+
+    min_lat, min_lon, max_lat, max_lon = geohash.bounds(cell)
+    assert point.startswith(cell)
+    assert geohash.distance_m(min_lat, min_lon, max_lat, max_lon) <= 30
+    # Ячейка на символ крупнее уже не укладывается в допуск
+    min_lat, min_lon, max_lat, max_lon = geohash.bounds(cell[:-1])
+    assert geohash.distance_m(min_lat, min_lon, max_lat, max_lon) > 30
+
+
+def test_decode_returns_cell_center():
+    latitude, longitude = geohash.decode(geohash.encode(LATITUDE, LONGITUDE, 12))
+
+    assert geohash.distance_m(LATITUDE, LONGITUDE, latitude, longitude) < 0.1
@@ -0,0 +1,185 @@
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from elastic_transport import ConnectionError as TransportConnectionError
+from fastapi import HTTPException
+
+from src.backoffice.apps.search.schemas import SearchEntity
+from src.backoffice.apps.search.services import (ElasticsearchBackend,
+                                                 InMemorySearchBackend,
+                                                 SearchIndexer,
+                                                 SearchUnavailableError)
+
+# Пакет api.v1.search экспортирует router под именем модуля search_router
+search_api = importlib.import_module("src.backoffice.api.v1.search.search_router")
+
+
+def menu_item(id, name, company_id=None, category_id=1):
+    return SimpleNamespace(
+        id=id,
+        name=name,
+        slug=f"item-{id}",
+        description=None,
+        category_id=category_id,
+        is_template=company_id is None,
+        owner_company_id=company_id,
+    )
+
+
+def street(id, name, city_id, name_en=None):
+    return SimpleNamespace(
+        id=id,
+        name=name,
+        name_en=name_en,
+        city_id=city_id,
+        street_type="street",
+        is_active=True,
+    )
+
+
+class FakeStreamResult:
+    def __init__(self, rows, size):
+        self._rows = rows
+        self._size = size
+
+    async def partitions(self):
+        for start in range(0, len(self._rows), self._size):
+            yield self._rows[start : start + self._size]
+
+
+class FakeSession:
+    """Сессия, отдающая строки reindex пачками, как stream_scalars"""
+
+    def __init__(self, rows, size=2):
+        self._rows = rows
+        self._size = size
+
+    async def stream_scalars(self, stmt):
+        return FakeStreamResult(self._rows, self._size)
+
+
+class FailingBackend(InMemorySearchBackend):
+    async def bulk_index(self, entity, documents):
+        raise RuntimeError("index is down")
+
+    async def delete(self, entity, ids):
+        raise RuntimeError("index is down")
+
+
+@pytest.fixture
+def backend():
+    return InMemorySearchBackend()
+
+
+def ids(hits):
+    return sorted(hit.id for hit in hits)
+
+
+async def test_index_upserts_changed_documents(backend):
+    indexer = SearchIndexer(None, backend)
+    await indexer.index(SearchEntity.MENU_ITEM, [menu_item(1, "Пицца Маргарита")])
+    await indexer.index(SearchEntity.MENU_ITEM, [menu_item(1, "Пицца Пепперони")])
+
+    assert await backend.search("марг", [SearchEntity.MENU_ITEM]) == []
+    hits = await backend.search("пепп", [SearchEntity.MENU_ITEM])
+    assert [(hit.id, hit.name) for hit in hits] == [(1, "Пицца Пепперони")]
+
+
+async def test_delete_removes_documents(backend):
+    indexer = SearchIndexer(None, backend)
+    await indexer.index(
+        SearchEntity.MENU_ITEM, [menu_item(1, "Пицца"), menu_item(2, "Пирог")]
+    )
+    await indexer.delete(SearchEntity.MENU_ITEM, [1])
+
+    assert ids(await backend.search("пи", [SearchEntity.MENU_ITEM])) == [2]
+
+
+async def test_reindex_streams_all_rows_in_partitions(backend):
+    rows = [menu_item(i, f"Блюдо {i}") for i in range(1, 6)]
+    indexer = SearchIndexer(FakeSession(rows, size=2), backend)
+
+    indexed = await indexer.reindex([SearchEntity.MENU_ITEM])
+
+    assert indexed == {SearchEntity.MENU_ITEM: 5}
+    hits = await backend.search("блюдо", [SearchEntity.MENU_ITEM], limit=10)
+    assert ids(hits) == [1, 2, 3, 4, 5]
+
+
+async def test_index_errors_do_not_propagate():
+    indexer = SearchIndexer(None, FailingBackend())
+
+    await indexer.index(SearchEntity.MENU_ITEM, [menu_item(1, "Пицца")])
+    await indexer.delete(SearchEntity.MENU_ITEM, [1])
+
+
+async def test_autocomplete_requires_every_word_as_prefix(backend):
+    await SearchIndexer(None, backend).index(
+        SearchEntity.MENU_ITEM,
+        [menu_item(1, "Пицца Маргарита"), menu_item(2, "Пицца Пепперони")],
+    )
+
+    assert ids(await backend.search("пиц марг", [SearchEntity.MENU_ITEM])) == [1]
+    assert ids(await backend.search("пиц", [SearchEntity.MENU_ITEM])) == [1, 2]
+
+
+async def test_company_filter_keeps_templates(backend):
+    await SearchIndexer(None, backend).index(
+        SearchEntity.MENU_ITEM,
+        [
+            menu_item(1, "Салат Цезарь", company_id=10),
+            menu_item(2, "Салат Греческий", company_id=20),
+            menu_item(3, "Салат Оливье"),
+        ],
+    )
+
+    hits = await backend.search(
+        "салат", [SearchEntity.MENU_ITEM], filters={"company_id": 10}
+    )
+    assert ids(hits) == [1, 3]
+
+
+async def test_city_filter_limits_streets(backend):
+    await SearchIndexer(None, backend).index(
+        SearchEntity.STREET,
+        [
+            street(1, "Ленина", city_id=1, name_en="Lenina"),
+            street(2, "Ленинградская", city_id=2),
+        ],
+    )
+
+    hits = await backend.search("лен", [SearchEntity.STREET], filters={"city_id": 1})
+    assert ids(hits) == [1]
+    assert ids(await backend.search("lenina", [SearchEntity.STREET])) == [1]
+
+
+async def test_elasticsearch_connection_error_is_unavailable():
+    class DownClient:
+        async def search(self, **kwargs):
+            raise TransportConnectionError("connection refused")
+
+    backend = ElasticsearchBackend()
+    backend._client = DownClient()
+
+    with pytest.raises(SearchUnavailableError):
+        await backend.search("пицца", [SearchEntity.MENU_ITEM])
+
+
+async def test_autocomplete_returns_503_when_search_is_down(monkeypatch):
+    class DownBackend(InMemorySearchBackend):
+        async def search(self, *args, **kwargs):
+            raise SearchUnavailableError("connection refused")
+
+    monkeypatch.setattr(search_api, "search_backend", DownBackend())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await search_api.autocomplete(
+            q="пицца",
+            entities=None,
+            company_id=None,
+            city_id=None,
+            country_id=None,
+            limit=10,
+        )
+    assert exc_info.value.status_code == 503